@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Time the scraper parsers on each available HTML backend.
+
+Usage:
+    python benchmarks/bench_parsers.py [--repeat N]
+
+Parses the sample pages in tests/fixtures with every backend that
+html_backend can use here and prints the median time per parse.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, os.path.join(ROOT, "scrapers"))
+
+import html_backend  # noqa: E402
+from challenge_scraper_core import (  # noqa: E402
+    parse_challenge_calendar_html,
+    parse_route_detail_page,
+)
+from guestworld_scraper_core import parse_calendar_html  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+CASES = [
+    ("guest world calendar", parse_calendar_html, "guestworld_calendar.html"),
+    ("challenge calendar", parse_challenge_calendar_html, "challenge_calendar.html"),
+    ("route detail", parse_route_detail_page, "route_detail.html"),
+]
+
+
+def median_ms(func, content, repeat):
+    """Return the median wall time of func(content) in milliseconds."""
+    func(content)  # warm up imports and caches
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(content)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    backends = html_backend.available_backends()
+    print("%-22s" % "page" + "".join("%14s" % b for b in backends) + "   speedup")
+    for label, func, fixture in CASES:
+        with open(os.path.join(FIXTURES, fixture), "rb") as f:
+            content = f.read()
+        timings = []
+        for backend in backends:
+            with patch.object(html_backend, "BACKEND", backend):
+                timings.append(median_ms(func, content, args.repeat))
+        speedup = timings[-1] / min(timings)
+        print(
+            "%-22s" % label
+            + "".join("%11.2f ms" % t for t in timings)
+            + "   %5.1fx" % speedup
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
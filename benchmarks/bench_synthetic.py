@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Benchmark the scraper parsers on synthetic pages of increasing size.
+
+Usage:
+    python benchmarks/bench_synthetic.py [--profile NAME ...] [--repeat N]
+                                         [--backend NAME] [--json]
+
+For each size profile and parser, generates a page with synthetic_pages,
+checks the parser returns the expected result, then reports the median
+parse time and the peak memory allocated during one parse (tracemalloc).
+--json prints one record per line so runs before and after a parser
+change can be diffed.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, os.path.join(ROOT, "scrapers"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import html_backend  # noqa: E402
+import synthetic_pages  # noqa: E402
+from challenge_scraper_core import (  # noqa: E402
+    parse_challenge_calendar_html,
+    parse_route_detail_page,
+)
+from guestworld_scraper_core import parse_calendar_html  # noqa: E402
+
+PROFILES = {
+    "small": {"chrome_kb": 10, "events_per_day": 1, "nesting": 0},
+    "realistic": {"chrome_kb": 120, "events_per_day": 4, "nesting": 3},
+    "bloated": {"chrome_kb": 600, "events_per_day": 12, "nesting": 12},
+}
+CASES = [
+    ("guest world calendar", parse_calendar_html, synthetic_pages.guestworld_calendar),
+    (
+        "challenge calendar",
+        parse_challenge_calendar_html,
+        synthetic_pages.challenge_calendar,
+    ),
+    ("route detail", parse_route_detail_page, synthetic_pages.route_detail),
+]
+
+
+def _generate(generator, profile):
+    """Call generator with the profile knobs it accepts."""
+    if generator is synthetic_pages.route_detail:
+        return generator(chrome_kb=profile["chrome_kb"])
+    return generator(**profile)
+
+
+def measure(func, content, repeat):
+    """Return (median milliseconds, peak KiB allocated) for func(content)."""
+    func(content)  # warm up imports and caches
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(content)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        func(content)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(samples), peak / 1024
+
+
+def run(profiles, repeat, backend):
+    """Yield one result dict per (profile, parser)."""
+    for profile_name in profiles:
+        profile = PROFILES[profile_name]
+        for label, func, generator in CASES:
+            page, expected = _generate(generator, profile)
+            content = page.encode("utf-8")
+            with patch.object(html_backend, "BACKEND", backend):
+                if func(content) != expected:
+                    raise AssertionError(
+                        "%s returned the wrong result for the %s page"
+                        % (func.__name__, profile_name)
+                    )
+                median_ms, peak_kb = measure(func, content, repeat)
+            yield {
+                "profile": profile_name,
+                "page": label,
+                "parser": func.__name__,
+                "backend": backend,
+                "page_kb": round(len(content) / 1024, 1),
+                "median_ms": round(median_ms, 3),
+                "peak_kb": round(peak_kb, 1),
+            }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--profile", action="append", choices=sorted(PROFILES), dest="profiles"
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--backend", choices=html_backend.available_backends(), default=None
+    )
+    parser.add_argument("--json", action="store_true", help="one JSON record per line")
+    args = parser.parse_args(argv)
+
+    profiles = args.profiles or list(PROFILES)
+    backend = args.backend or html_backend.BACKEND
+
+    if not args.json:
+        print("backend: %s" % backend)
+        print(
+            "%-10s %-22s %10s %12s %12s"
+            % ("profile", "page", "size", "median", "peak mem")
+        )
+    for result in run(profiles, args.repeat, backend):
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(
+                "%-10s %-22s %7.1f KB %9.2f ms %9.1f KB"
+                % (
+                    result["profile"],
+                    result["page"],
+                    result["page_kb"],
+                    result["median_ms"],
+                    result["peak_kb"],
+                )
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
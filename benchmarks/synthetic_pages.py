@@ -0,0 +1,298 @@
+"""Synthetic schedule pages for benchmarking the scraper parsers.
+
+Each generator returns (html, expected): a page shaped like the live
+WordPress calendar — navigation, inline scripts and styles, comments,
+sidebar widgets and decoy tables around the real calendar — and the value
+the matching parser should return for it.  Knobs control how big and how
+awkward the page is:
+
+    chrome_kb       approximate size of page chrome around the content
+    events_per_day  events in every calendar cell
+    nesting         wrapper elements around each event's title
+
+Output is deterministic for a given seed.  Pure functions, no I/O.
+"""
+
+import random
+
+WORLDS = [
+    "Watopia",
+    "London",
+    "New York",
+    "Yorkshire",
+    "Innsbruck",
+    "Richmond",
+    "Paris",
+    "Makuri Islands",
+    "France",
+    "Scotland",
+]
+ROUTE_NAMES = [
+    "Tick Tock",
+    "Legends and Lava",
+    "Road to Ruins",
+    "Waisted 8",
+    "Triple Flat Loops",
+    "Big Foot Hills",
+    "Astoria Line 8",
+    "Greatest London Flat",
+]
+CLIMB_NAMES = [
+    "Côte de Pike",
+    "Alpe du Zwift",
+    "Hardknott Pass",
+    "Box Hill",
+    "Bealach na Bà",
+    "Puy de Dôme",
+]
+
+# Ways the live page has marked an event's category, all of which the
+# challenge parser must resolve.
+_CATEGORY_CLASSES = {"route": "category_367", "climb": "category_370"}
+_DETAIL_PATHS = {"route": "/route/%s/", "climb": "/portal/%s/"}
+
+_HEAD = """<!DOCTYPE html>
+<html lang="en-US">
+<head>
+<meta charset="UTF-8">
+<title>%s</title>
+<script type="text/javascript">
+var siteConfig = {"table":"<table class=\\"calendar-table\\">"};
+</script>
+</head>
+<body class="page-template-default page">
+"""
+_FOOT = """<footer class="site-footer"><p>&copy; 2026 Example</p></footer>
+</body>
+</html>
+"""
+
+
+def _slug(name):
+    return "-".join(name.lower().split()).encode("ascii", "ignore").decode()
+
+
+def _nav(n, rng):
+    items = "".join(
+        '<li class="menu-item"><a href="/section-%d-%d/">Section %d</a></li>'
+        % (n, i, i)
+        for i in range(20)
+    )
+    return '<nav class="menu-%d"><ul>%s</ul></nav>\n' % (n, items)
+
+
+def _script(n, rng):
+    # Markup-like strings and fake distances that no parser should see.
+    strings = [
+        '<td class="day-with-date"><span class="day-number">%d</span>'
+        "99.9 km (62.1 miles) 9,999 m (32,805 ft)</td>" % rng.randint(1, 31)
+        for _ in range(8)
+    ]
+    return "<script>var w%d = %s;</script>\n" % (n, repr(strings))
+
+
+def _style(n, rng):
+    rules = "".join(
+        ".widget-%d-%d{margin:%dpx;color:#%06x}"
+        % (n, i, i, rng.randrange(1 << 24))
+        for i in range(30)
+    )
+    return "<style>%s</style>\n" % rules
+
+
+def _comment(n, rng):
+    return "<!-- cache block %d: %s -->\n" % (n, "x" * rng.randint(200, 800))
+
+
+def _mini_calendar(n, rng):
+    # A sidebar table whose class only shares a prefix with the real one.
+    rows = "".join(
+        '<tr><td class="day-with-date"><span class="day-number">%d</span>'
+        '<span class="spiffy-title">Decoy</span></td></tr>' % (i + 1)
+        for i in range(7)
+    )
+    filler = "Lorem ipsum dolor sit amet. " * rng.randint(5, 20)
+    return (
+        '<aside class="widget"><table class="calendar-table-mini">%s</table>'
+        "<p>%s</p></aside>\n" % (rows, filler)
+    )
+
+
+_CHROME_PARTS = (_nav, _script, _style, _comment, _mini_calendar)
+
+
+def _chrome(rng, kb):
+    """Return roughly kb KiB of navigation, scripts, styles and widgets."""
+    parts = []
+    size = 0
+    n = 0
+    while size < kb * 1024:
+        chunk = _CHROME_PARTS[n % len(_CHROME_PARTS)](n, rng)
+        parts.append(chunk)
+        size += len(chunk)
+        n += 1
+    return "".join(parts)
+
+
+def _wrap(inner, nesting):
+    """Nest inner inside `nesting` layers of presentational spans."""
+    for depth in range(nesting):
+        inner = '<span class="wrap wrap-%d">%s</span>' % (depth, inner)
+    return inner
+
+
+def _tooltip(rng):
+    return (
+        '<span class="event-desc"><span class="event-time">%d:00 ET</span>'
+        "<p>Ride %d km with the group &amp; earn a badge.</p></span>"
+        % (rng.randint(0, 23), rng.randint(10, 90))
+    )
+
+
+def _calendar_table(days_in_month, first_weekday, cell_html):
+    rows = [
+        '<table class="spiffy calendar-table bigcal">',
+        '<tr class="calendar-heading"><td colspan="7">'
+        '<a href="?month=jan&amp;yr=2026">&lsaquo;</a> February 2026 '
+        '<a href="?month=mar&amp;yr=2026">&rsaquo;</a></td></tr>',
+        '<tr class="calendar-dayname">%s</tr>'
+        % "".join(
+            '<td class="normal-day-heading">%s</td>' % d
+            for d in ("Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat")
+        ),
+    ]
+    cells = ['<td class="day-without-date">&nbsp;</td>'] * first_weekday
+    for day in range(1, days_in_month + 1):
+        cells.append(
+            '<td class="spiffy-day-%d day-with-date"><span class="day-number">%d</span>'
+            '<span class="spiffy-event-group">%s</span></td>'
+            % (day, day, cell_html(day))
+        )
+    while len(cells) % 7:
+        cells.append('<td class="day-without-date">&nbsp;</td>')
+    for i in range(0, len(cells), 7):
+        rows.append("<tr>%s</tr>" % "".join(cells[i : i + 7]))
+    rows.append("</table>")
+    return "\n".join(rows)
+
+
+def _page(title, rng, chrome_kb, content):
+    before = _chrome(rng, chrome_kb * 0.6)
+    after = _chrome(rng, chrome_kb * 0.4)
+    return (
+        _HEAD % title
+        + before
+        + '<main class="site-main"><div class="entry-content">'
+        + content
+        + "</div></main>\n"
+        + after
+        + _FOOT
+    )
+
+
+def guestworld_calendar(
+    days_in_month=28, events_per_day=3, nesting=2, chrome_kb=100, seed=0
+):
+    """Return (html, expected parse_calendar_html output)."""
+    rng = random.Random(seed)
+    expected = []
+
+    def cell(day):
+        worlds = [rng.choice(WORLDS) for _ in range(events_per_day)]
+        expected.append((day, worlds))
+        return "".join(
+            '<span class="calnk"><span class="calnk-link">%s%s</span></span>'
+            % (
+                _wrap(
+                    '<span class="calnk-box"><a href="#">'
+                    '<span class="spiffy-title">%s</span></a></span>' % world,
+                    nesting,
+                ),
+                _tooltip(rng),
+            )
+            for world in worlds
+        )
+
+    table = _calendar_table(days_in_month, 0, cell)
+    return _page("Guest World Schedule", rng, chrome_kb, table), expected
+
+
+def challenge_calendar(
+    days_in_month=28, events_per_day=4, nesting=2, chrome_kb=100, seed=0
+):
+    """Return (html, expected parse_challenge_calendar_html output).
+
+    Every day mixes routes, climbs and events that are not challenges,
+    with the category marked in several different places.
+    """
+    rng = random.Random(seed)
+    expected = []
+
+    def event(kind, style):
+        names = ROUTE_NAMES if kind == "route" else CLIMB_NAMES
+        name = "%s %d" % (rng.choice(names), rng.randint(1, 999))
+        xp = rng.choice([250, 300, 500, 600])
+        url = _DETAIL_PATHS[kind] % _slug(name)
+        category = _CATEGORY_CLASSES[kind]
+        title = '<span class="spiffy-title">%s (%dXP)</span>' % (name, xp)
+        if style == 0:  # class on the box inside the event
+            box = '<span class="calnk-box %s"><a href="%s">%s</a></span>' % (
+                category,
+                url,
+                title,
+            )
+            html = '<span class="calnk">%s</span>' % _wrap(box, nesting)
+        elif style == 1:  # class on the event itself
+            box = '<span class="calnk-box"><a href="%s">%s</a></span>' % (url, title)
+            html = '<span class="calnk %s">%s</span>' % (category, _wrap(box, nesting))
+        else:  # no class: the detail URL decides
+            box = '<span class="calnk-box"><a href="%s">%s</a></span>' % (url, title)
+            html = '<span class="calnk">%s</span>' % _wrap(box, nesting)
+        entry = {"name": name, "xp": xp, "detail_url": url}
+        return html + _tooltip(rng), entry
+
+    def cell(day):
+        parts = []
+        challenges = {}
+        for i in range(events_per_day):
+            if i % 3 == 2:
+                parts.append(
+                    '<span class="calnk"><span class="calnk-box category_999">'
+                    '<a href="/events/meetup-%d/"><span class="spiffy-title">'
+                    "Community meetup</span></a></span></span>" % day
+                )
+                continue
+            kind = "route" if i % 3 == 0 else "climb"
+            html, entry = event(kind, rng.randrange(3))
+            parts.append(html)
+            challenges[kind] = entry  # the parser keeps the last of each kind
+        if challenges:
+            expected.append((day, challenges))
+        return "".join(parts)
+
+    table = _calendar_table(days_in_month, 3, cell)
+    return _page("Weekly Challenges", rng, chrome_kb, table), expected
+
+
+def route_detail(chrome_kb=60, seed=0):
+    """Return (html, expected parse_route_detail_page output)."""
+    rng = random.Random(seed)
+    km = rng.randint(50, 900) / 10
+    mi = round(km * 0.621371, 1)
+    m = rng.randint(100, 2500)
+    ft = round(m * 3.28084)
+    content = (
+        '<article class="route"><h1>Route details</h1>'
+        '<table class="route-stats"><tr><th>Distance</th>'
+        "<td>%.1f km (%.1f miles)</td></tr>"
+        "<tr><th>Elevation</th><td>%s m (%s')</td></tr></table>"
+        "<p>%s</p></article>"
+        % (km, mi, "{:,}".format(m), "{:,}".format(ft), "Route notes. " * 50)
+    )
+    expected = {
+        "distance_km": km,
+        "distance_mi": mi,
+        "elevation_m": float(m),
+        "elevation_ft": float(ft),
+    }
+    return _page("Route", rng, chrome_kb, content), expected
@@ -0,0 +1,163 @@
+"""Eastern-time clock shared by the skill's intent handlers.
+
+The guest world calendar rolls over at midnight US Eastern, so every handler
+needs "now" in that zone plus a handful of values derived from the date.
+This module gives each request one immutable TimeContext.  The date-derived
+parts are cached per Eastern date, so a warm container only pays for
+``calendar.monthrange`` and midnight arithmetic once a day.
+
+Tests and benchmarks can pin time with ``set_clock(FixedClock(...))``.
+"""
+
+import calendar
+import contextlib
+import functools
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from dateutil import tz
+
+EASTERN = tz.gettz("America/New_York")
+
+TimeContext = namedtuple(
+    "TimeContext",
+    [
+        "now",  # aware datetime in Eastern time
+        "day",  # day of the month
+        "midnight",  # start of the next Eastern day
+        "last_day",  # number of days in the current month
+        "month_key",  # "YYYY-MM"
+        "next_year",
+        "next_month",
+        "next_month_key",
+        "weekday",  # Monday == 0 ... Sunday == 6
+        "is_weekend",
+        "this_weekend_days",  # frozenset of this weekend's days within the month
+    ],
+)
+
+_DateFacts = namedtuple(
+    "_DateFacts",
+    [
+        "midnight",
+        "last_day",
+        "month_key",
+        "next_year",
+        "next_month",
+        "next_month_key",
+        "weekday",
+        "is_weekend",
+        "this_weekend_days",
+    ],
+)
+
+
+class SystemClock:
+    """Reads the real wall clock in Eastern time."""
+
+    def now(self):
+        return datetime.now(EASTERN)
+
+
+class FixedClock:
+    """A clock pinned to one instant, for tests and benchmarks."""
+
+    def __init__(self, now):
+        self._now = now
+
+    def now(self):
+        return self._now
+
+    def advance(self, **kwargs):
+        """Move the pinned instant forward by timedelta(**kwargs)."""
+        self._now = self._now + timedelta(**kwargs)
+
+
+_clock = SystemClock()
+_request_context = None
+
+
+def set_clock(clock):
+    """Install a clock and return the previous one so callers can restore it."""
+    global _clock
+    previous = _clock
+    _clock = clock
+    return previous
+
+
+@functools.lru_cache(maxsize=32)
+def month_length(year, month):
+    """Return the number of days in the given month."""
+    return calendar.monthrange(year, month)[1]
+
+
+def next_month_year(year, month):
+    """Return (year, month) for the month immediately after inputs."""
+    if month == 12:
+        return year + 1, 1
+    return year, month + 1
+
+
+@functools.lru_cache(maxsize=8)
+def _date_facts(year, month, day):
+    """Compute everything that depends only on the Eastern date.
+
+    ``midnight`` is naive here; make_context attaches the caller's tzinfo
+    (dateutil zones are not hashable, so they cannot be part of the key).
+    """
+    last_day = month_length(year, month)
+    tomorrow = date(year, month, day) + timedelta(days=1)
+    midnight = datetime(tomorrow.year, tomorrow.month, tomorrow.day)
+    next_year, next_month = next_month_year(year, month)
+
+    weekday = date(year, month, day).weekday()
+    if weekday == 5:  # Saturday
+        weekend = {day, day + 1} if day + 1 <= last_day else {day}
+    elif weekday == 6:  # Sunday
+        weekend = {day - 1, day} if day - 1 >= 1 else {day}
+    else:
+        weekend = set()
+
+    return _DateFacts(
+        midnight=midnight,
+        last_day=last_day,
+        month_key="%04d-%02d" % (year, month),
+        next_year=next_year,
+        next_month=next_month,
+        next_month_key="%04d-%02d" % (next_year, next_month),
+        weekday=weekday,
+        is_weekend=weekday >= 5,
+        this_weekend_days=frozenset(weekend),
+    )
+
+
+def make_context(now):
+    """Build a TimeContext for an Eastern-time datetime."""
+    facts = _date_facts(now.year, now.month, now.day)
+    return TimeContext(
+        now=now,
+        day=now.day,
+        **dict(facts._asdict(), midnight=facts.midnight.replace(tzinfo=now.tzinfo)),
+    )
+
+
+def time_context():
+    """Return the current request's TimeContext.
+
+    Inside ``request_scope()`` every caller sees the same snapshot; outside
+    of one (direct handler calls, module init) each call reads the clock.
+    """
+    if _request_context is not None:
+        return _request_context
+    return make_context(_clock.now())
+
+
+@contextlib.contextmanager
+def request_scope():
+    """Pin one TimeContext for the duration of a skill invocation."""
+    global _request_context
+    _request_context = make_context(_clock.now())
+    try:
+        yield _request_context
+    finally:
+        _request_context = None
@@ -0,0 +1,169 @@
+"""Stale-while-revalidate refresh of the skill's in-memory S3 data.
+
+A warm Lambda container keeps worldList / challengeData in module globals.
+DataRefresher decides, once per invocation, whether that data is still
+fresh enough to serve:
+
+    age < soft_ttl            serve as-is
+    soft_ttl <= age < hard    serve as-is and revalidate on a background thread
+    age >= hard_ttl           refresh synchronously before answering
+
+Lambda freezes the process between invocations, so a background refresh
+may be suspended mid-request and resumed later.  To keep that safe:
+
+* at most one background thread exists at a time (no leaks across thaws);
+* fetch() builds a complete new snapshot without touching shared state and
+  apply() installs it under a lock, so readers never see a half-built value;
+* every attempt gets a sequence number and an older attempt can never
+  overwrite data installed by a newer one;
+* failures back off for retry_interval instead of retrying every request.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class DataRefresher:
+    """Coordinates conditional reloads of module-level skill data.
+
+    Args:
+        fetch: callable returning a snapshot of changed data.  Must not
+            mutate shared state; may raise.
+        apply: callable that installs a snapshot returned by fetch().
+        soft_ttl: seconds after which data is revalidated in the background.
+        hard_ttl: seconds after which a request blocks on a refresh.
+        retry_interval: seconds to wait after a failed attempt.
+        join_timeout: seconds a blocking request waits for an in-flight
+            background refresh before starting its own.
+        timer: wall-clock source (time.time).  Wall time is used on purpose:
+            the time a container spends frozen counts towards data age.
+    """
+
+    def __init__(
+        self,
+        fetch,
+        apply,
+        soft_ttl,
+        hard_ttl,
+        retry_interval=60,
+        join_timeout=5,
+        timer=time.time,
+    ):
+        self._fetch = fetch
+        self._apply = apply
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.retry_interval = retry_interval
+        self.join_timeout = join_timeout
+        self._timer = timer
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self._next_seq = 0
+        self._applied_seq = -1
+        self.loaded_at = timer()
+        self.last_attempt_at = None
+        self.last_error = None
+        self.stats = {
+            "fresh": 0,
+            "background_started": 0,
+            "blocking_refreshes": 0,
+            "refreshes_applied": 0,
+            "refresh_failures": 0,
+        }
+
+    def age(self):
+        """Seconds since the current data was loaded or last revalidated."""
+        return self._timer() - self.loaded_at
+
+    def mark_loaded(self):
+        """Record that data was (re)loaded outside the refresher."""
+        with self._lock:
+            self.loaded_at = self._timer()
+
+    def mark_stale(self):
+        """Force the next ensure_fresh() call to refresh synchronously."""
+        with self._lock:
+            self.loaded_at = float("-inf")
+
+    def ensure_fresh(self):
+        """Called at the start of each invocation; returns the action taken."""
+        age = self.age()
+        if age < self.soft_ttl:
+            self.stats["fresh"] += 1
+            return "fresh"
+        if self._in_backoff():
+            return "backoff"
+        if age >= self.hard_ttl:
+            self.stats["blocking_refreshes"] += 1
+            # A background attempt that is already running is the quickest
+            # route to fresh data; give it a moment before starting another.
+            thread = self._thread
+            if thread is not None and thread.is_alive():
+                thread.join(timeout=self.join_timeout)
+            if self.age() >= self.hard_ttl:
+                self._run_attempt(self._claim_seq())
+            return "blocked"
+        self._start_background()
+        return "revalidating"
+
+    def wait(self, timeout=None):
+        """Join the in-flight background refresh, if any (tests, shutdown)."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _in_backoff(self):
+        return (
+            self.last_error is not None
+            and self.last_attempt_at is not None
+            and self._timer() - self.last_attempt_at < self.retry_interval
+        )
+
+    def _claim_seq(self):
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self.last_attempt_at = self._timer()
+            return seq
+
+    def _start_background(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            seq = self._next_seq
+            self._next_seq += 1
+            self.last_attempt_at = self._timer()
+            self._thread = threading.Thread(
+                target=self._run_attempt,
+                args=(seq,),
+                name="skill-data-refresh",
+                daemon=True,
+            )
+            self.stats["background_started"] += 1
+            self._thread.start()
+
+    def _run_attempt(self, seq):
+        started = self._timer()
+        try:
+            snapshot = self._fetch()
+        except Exception as exc:
+            logger.warning("Skill data refresh failed", exc_info=True)
+            with self._lock:
+                self.last_error = repr(exc)
+                self.stats["refresh_failures"] += 1
+            return False
+
+        with self._lock:
+            if seq < self._applied_seq:
+                logger.info("Discarding refresh %d; newer data already applied", seq)
+                return False
+            self._apply(snapshot)
+            self._applied_seq = seq
+            self.loaded_at = started
+            self.last_error = None
+            self.stats["refreshes_applied"] += 1
+        return True
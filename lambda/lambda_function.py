@@ -4,15 +4,23 @@
 # Please visit https://alexa.design/cookbook for additional examples on implementing slots, dialog management,
 # session persistence, api calls, and more.
 # This sample is built using the handler classes approach in skill builder.
+import functools
+import hmac
 import json
 import logging
+import os
 import re
+import threading
+import time
 import ask_sdk_core.utils as ask_utils
 from datetime import datetime
 from datetime import timedelta
-from dateutil import tz
 import boto3
-import calendar
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+import clock
+from data_refresher import DataRefresher
 
 from ask_sdk_core.skill_builder import SkillBuilder
 from ask_sdk_core.dispatch_components import AbstractRequestHandler
@@ -41,12 +49,61 @@ HELP_SPEAK_OUTPUT = (
 
 
 def _get_time_state():
-    """Return fresh (now, day, midnight, last_day) for the current invocation."""
-    now = datetime.now(tz.gettz("America/New_York"))
-    day = now.day
-    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0)
-    last_day = calendar.monthrange(now.year, now.month)[1]
-    return now, day, midnight, last_day
+    """Return (now, day, midnight, last_day) for the current invocation."""
+    ctx = clock.time_context()
+    return ctx.now, ctx.day, ctx.midnight, ctx.last_day
+
+
+# ---------------------------------------------------------------------------
+# Slot value lookup
+# ---------------------------------------------------------------------------
+
+# Generated by models/build_models.py from the shared interaction model.
+_SLOT_VALUES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "slot_values.json"
+)
+_WORLD_SLOT_TYPE = "AMAZON.AT_CITY"
+
+
+def _load_slot_table():
+    """Read the slot lookup table that ships alongside this module."""
+    try:
+        with open(_SLOT_VALUES_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        logger.error("Failed to load slot lookup table", exc_info=True)
+        return {"slots": {}, "types": {}}
+
+
+_containerStartedAt = time.time()
+_slotTableStarted = time.perf_counter()
+slotTable = _load_slot_table()
+_slotTableLoadSeconds = time.perf_counter() - _slotTableStarted
+
+
+def _slot_lookup_key(text):
+    """Normalize a slot value the same way build_models.lookup_key does."""
+    return "".join(text.casefold().split())
+
+
+def _canonical_slot_id(slot_type, text):
+    """Return the slot value id for a spoken value or synonym, or None."""
+    lookup = slotTable["types"].get(slot_type, {}).get("lookup", {})
+    return lookup.get(_slot_lookup_key(text))
+
+
+@functools.lru_cache(maxsize=128)
+def _world_ids(day_entry):
+    """Return the world ids named by a worldList entry like 'London and Yorkshire'.
+
+    Names missing from the interaction model fall back to their lookup key so
+    a newly added world still matches itself.
+    """
+    ids = set()
+    for part in day_entry.split(" and "):
+        key = _slot_lookup_key(part)
+        ids.add(_canonical_slot_id(_WORLD_SLOT_TYPE, part) or key)
+    return frozenset(ids)
 
 
 def _data_unavailable_response(handler_input):
@@ -94,7 +151,7 @@ def _parse_amazon_date(date_str, now):
     if not date_str:
         return []
 
-    last_day = calendar.monthrange(now.year, now.month)[1]
+    last_day = clock.month_length(now.year, now.month)
 
     # Weekend format: YYYY-Www-WE → Saturday + Sunday of that ISO week
     m = re.match(r"^(\d{4})-W(\d{1,2})-WE$", date_str)
@@ -134,8 +191,28 @@ def _parse_amazon_date(date_str, now):
 # S3 data loading
 # ---------------------------------------------------------------------------
 
+S3_BUCKET = "guestworldskill"
+WORLD_LIST_KEY = "GuestWorlds.csv"
+CHALLENGE_DATA_KEY = "WeeklyChallenges.json"
+# Written by the scrapers: {"objects": {key: {"etag", "sha256", ...}}} for
+# every dataset they publish, so a refresh can check one small object.
+MANIFEST_KEY = "manifest.json"
+
+# Short timeouts: a refresh must never hang a request (or a thawed thread)
+# for botocore's default 60 seconds.
+_S3_CONFIG = Config(connect_timeout=3, read_timeout=5, retries={"max_attempts": 2})
+# One client for the container: clients, unlike resources, are thread-safe,
+# so request threads and the background refresh thread can share it.
+_s3_client = boto3.client("s3", config=_S3_CONFIG)
+
 worldList = None
 nextMonthWorldList = None
+challengeData = None
+dataManifest = None
+
+# Dataset name -> {"key", "etag", "loaded_at", "checked_at"} for the data
+# currently held in memory.  Used for conditional refreshes.
+dataVersions = {}
 
 
 def _build_world_list_from_csv(csv_text):
@@ -150,20 +227,53 @@ def _build_world_list_from_csv(csv_text):
 
 def _get_next_month_year(year, month):
     """Return (year, month) for the month immediately after inputs."""
-    if month == 12:
-        return year + 1, 1
-    return year, month + 1
+    return clock.next_month_year(year, month)
+
+
+def _next_month_world_list_key():
+    """Return the S3 key of next month's archived calendar."""
+    ctx = clock.time_context()
+    return "GuestWorlds%04d%02d.csv" % (ctx.next_year, ctx.next_month)
+
+
+def _get_s3_object(key, etag=None):
+    """GET an object from the skill bucket and return (body_bytes, etag).
+
+    When etag is given the request is conditional and (None, etag) is
+    returned if the object has not changed.
+    """
+    conditions = {"IfNoneMatch": etag} if etag else {}
+    try:
+        response = _s3_client.get_object(Bucket=S3_BUCKET, Key=key, **conditions)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+            return None, etag
+        raise
+    return response["Body"].read(), response.get("ETag")
+
+
+def _record_version(name, key, etag, load_seconds=None):
+    """Remember which S3 object version backs an in-memory dataset."""
+    now = time.time()
+    dataVersions[name] = {
+        "key": key,
+        "etag": etag,
+        "loaded_at": now,
+        "checked_at": now,
+        "load_seconds": load_seconds,
+    }
 
 
 def _load_world_list():
     """Read the processed calendar from S3 into worldList for quick lookups."""
     global worldList
+    started = time.perf_counter()
     try:
-        s3 = boto3.resource("s3")
-        bucket = s3.Bucket("guestworldskill")
-        obj = bucket.Object("GuestWorlds.csv")
-        response = obj.get()
-        worldList = _build_world_list_from_csv(response["Body"].read().decode("utf-8"))
+        body, etag = _get_s3_object(WORLD_LIST_KEY)
+        worldList = _build_world_list_from_csv(body.decode("utf-8"))
+        _record_version(
+            "worldList", WORLD_LIST_KEY, etag, time.perf_counter() - started
+        )
         logger.info("Loaded %d days of calendar data from S3", len(worldList) - 1)
     except Exception:
         logger.error("Failed to load calendar data from S3", exc_info=True)
@@ -176,18 +286,13 @@ _load_world_list()
 def _load_next_month_world_list():
     """Optionally load next month's archived calendar from S3."""
     global nextMonthWorldList
+    started = time.perf_counter()
     try:
-        now = datetime.now(tz.gettz("America/New_York"))
-        next_year, next_month = _get_next_month_year(now.year, now.month)
-        key = "GuestWorlds%04d%02d.csv" % (next_year, next_month)
-
-        s3 = boto3.resource("s3")
-        bucket = s3.Bucket("guestworldskill")
-        obj = bucket.Object(key)
-        response = obj.get()
-
-        nextMonthWorldList = _build_world_list_from_csv(
-            response["Body"].read().decode("utf-8")
+        key = _next_month_world_list_key()
+        body, etag = _get_s3_object(key)
+        nextMonthWorldList = _build_world_list_from_csv(body.decode("utf-8"))
+        _record_version(
+            "nextMonthWorldList", key, etag, time.perf_counter() - started
         )
         logger.info(
             "Loaded %d days of next-month calendar data from S3 key %s",
@@ -202,24 +307,232 @@ def _load_next_month_world_list():
 _load_next_month_world_list()
 
 
-challengeData = None
-
-
 def _load_challenge_data():
     """Read weekly challenge data from S3 JSON."""
     global challengeData
+    started = time.perf_counter()
     try:
-        s3 = boto3.resource("s3")
-        obj = s3.Bucket("guestworldskill").Object("WeeklyChallenges.json")
-        response = obj.get()
-        challengeData = json.loads(response["Body"].read().decode("utf-8"))
+        body, etag = _get_s3_object(CHALLENGE_DATA_KEY)
+        challengeData = json.loads(body.decode("utf-8"))
+        _record_version(
+            "challengeData", CHALLENGE_DATA_KEY, etag, time.perf_counter() - started
+        )
         logger.info("Loaded challenge data from S3")
+        return True
     except Exception:
         logger.error("Failed to load challenge data from S3", exc_info=True)
         challengeData = None
+        return False
+
+
+# Challenge data holds two months of route details and most sessions only
+# ask about guest worlds, so it is loaded on first use rather than at cold
+# start.  A failed load is retried after _CHALLENGE_RETRY_SECONDS.
+_CHALLENGE_RETRY_SECONDS = 60
+_challengeLock = threading.Lock()
+_challengeDataLoaded = False
+_challengeLoadFailedAt = None
+
+
+def _get_challenge_data():
+    """Return challengeData, loading it from S3 the first time it is needed."""
+    global _challengeDataLoaded, _challengeLoadFailedAt
+    if _challengeDataLoaded:
+        return challengeData
+    with _challengeLock:
+        if _challengeDataLoaded:
+            return challengeData
+        if (
+            _challengeLoadFailedAt is not None
+            and time.time() - _challengeLoadFailedAt < _CHALLENGE_RETRY_SECONDS
+        ):
+            return None
+        if _load_challenge_data():
+            _challengeDataLoaded = True
+            _challengeLoadFailedAt = None
+        else:
+            _challengeLoadFailedAt = time.time()
+        return challengeData
+
+
+def _prefetch_challenge_data():
+    """Load challenge data on a background thread if it is not loaded yet."""
+    if _challengeDataLoaded or _challengeLock.locked():
+        return
+    threading.Thread(
+        target=_get_challenge_data, name="challenge-prefetch", daemon=True
+    ).start()
+
+
+# ---------------------------------------------------------------------------
+# Background data refresh
+# ---------------------------------------------------------------------------
+
+
+_UNCHANGED = object()
+
+
+def _datasets():
+    """Return (name, key, parse, optional) for every refreshable dataset.
+
+    Challenge data is only revalidated once something has loaded it.
+    """
+    datasets = [
+        (
+            "worldList",
+            WORLD_LIST_KEY,
+            lambda body: _build_world_list_from_csv(body.decode("utf-8")),
+            False,
+        ),
+        (
+            "nextMonthWorldList",
+            _next_month_world_list_key(),
+            lambda body: _build_world_list_from_csv(body.decode("utf-8")),
+            True,
+        ),
+    ]
+    if _challengeDataLoaded:
+        datasets.append(
+            (
+                "challengeData",
+                CHALLENGE_DATA_KEY,
+                lambda body: json.loads(body.decode("utf-8")),
+                False,
+            )
+        )
+    return datasets
+
+
+def _fetch_manifest():
+    """Conditionally GET the scrapers' manifest.
+
+    Returns (objects, etag).  objects is _UNCHANGED if the manifest held in
+    memory is current, or None if there is no usable manifest.  Errors other
+    than a missing manifest propagate.
+    """
+    version = dataVersions.get("manifest") or {}
+    try:
+        body, etag = _get_s3_object(MANIFEST_KEY, version.get("etag"))
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return None, None
+        raise
+    if body is None:
+        return _UNCHANGED, etag
+    try:
+        objects = json.loads(body.decode("utf-8"))["objects"]
+    except (ValueError, KeyError, TypeError):
+        objects = None
+    if not isinstance(objects, dict):
+        logger.warning("Ignoring unreadable manifest at %s", MANIFEST_KEY)
+        return None, None
+    return objects, etag
+
 
+def _fetch_data_updates():
+    """Conditionally re-fetch every dataset and return the changes.
 
-_load_challenge_data()
+    Runs on the refresher's background thread, so it only reads module
+    state.  Returns a list of (name, key, value, etag); unchanged datasets
+    are reported with value _UNCHANGED.  A dataset that fails to load keeps
+    its current value; if every dataset fails the refresh raises so the
+    refresher backs off.
+
+    The manifest is checked first: a dataset whose manifest entry has the
+    ETag already held is unchanged without a request of its own, so when
+    nothing changed a refresh is a single conditional GET.  Datasets the
+    manifest does not list, or any dataset when there is no manifest, are
+    revalidated individually, except that an optional dataset the manifest
+    does not list is taken to be unpublished.
+    """
+    manifest_update = None
+    objects = None
+    try:
+        manifest, manifest_etag = _fetch_manifest()
+    except Exception:
+        logger.warning(
+            "Manifest check failed; revalidating each dataset", exc_info=True
+        )
+    else:
+        manifest_update = ("manifest", MANIFEST_KEY, manifest, manifest_etag)
+        objects = dataManifest if manifest is _UNCHANGED else manifest
+
+    updates = []
+    failures = 0
+    for name, key, parse, optional in _datasets():
+        version = dataVersions.get(name) or {}
+        etag = version.get("etag") if version.get("key") == key else None
+        listed = (objects or {}).get(key)
+        if etag and isinstance(listed, dict) and listed.get("etag") == etag:
+            updates.append((name, key, _UNCHANGED, etag))
+            continue
+        if optional and objects is not None and listed is None and not etag:
+            # Not published yet: every publish of it updates the manifest.
+            updates.append((name, key, None, None))
+            continue
+        try:
+            body, new_etag = _get_s3_object(key, etag)
+        except ClientError as e:
+            if optional and e.response.get("Error", {}).get("Code") in (
+                "NoSuchKey",
+                "404",
+            ):
+                updates.append((name, key, None, None))
+                continue
+            logger.warning("Refresh of %s from %s failed", name, key, exc_info=True)
+            failures += 1
+            continue
+        except Exception:
+            logger.warning("Refresh of %s from %s failed", name, key, exc_info=True)
+            failures += 1
+            continue
+        if body is None:
+            updates.append((name, key, _UNCHANGED, new_etag))
+        else:
+            updates.append((name, key, parse(body), new_etag))
+
+    if failures and not updates:
+        raise RuntimeError("Every dataset failed to refresh")
+    if manifest_update is not None:
+        updates.append(manifest_update)
+    return updates
+
+
+def _apply_data_updates(updates):
+    """Install a snapshot from _fetch_data_updates into the module globals."""
+    global worldList, nextMonthWorldList, challengeData, dataManifest
+    for name, key, value, etag in updates:
+        if value is _UNCHANGED:
+            dataVersions.setdefault(name, {"key": key, "etag": etag, "loaded_at": None})
+            dataVersions[name]["checked_at"] = time.time()
+            continue
+        if name == "worldList":
+            worldList = value
+        elif name == "nextMonthWorldList":
+            nextMonthWorldList = value
+        elif name == "challengeData":
+            challengeData = value
+        elif name == "manifest":
+            dataManifest = value
+        if value is None:
+            dataVersions.pop(name, None)
+        else:
+            _record_version(name, key, etag)
+            logger.info("Refreshed %s from S3 key %s", name, key)
+
+
+_PREFETCH_CHALLENGE_DATA = os.environ.get("PREFETCH_CHALLENGE_DATA") == "1"
+
+dataRefresher = DataRefresher(
+    fetch=_fetch_data_updates,
+    apply=_apply_data_updates,
+    soft_ttl=float(os.environ.get("DATA_SOFT_TTL_SECONDS", "900")),
+    hard_ttl=float(os.environ.get("DATA_HARD_TTL_SECONDS", "21600")),
+)
+if worldList is None:
+    # Cold-start load failed; retry on the first request instead of waiting
+    # out the soft TTL while every answer says "temporarily unavailable".
+    dataRefresher.mark_stale()
 
 
 # ---------------------------------------------------------------------------
@@ -356,21 +669,22 @@ class WhenWorldIntentHandler(AbstractRequestHandler):
             lookupDay = day
             found_in_next_month = False
             next_month_lookup_day = None
-            # Be sure to compare case insensitive and eliminate white space spaces because of data source words like NEWYORK vs New York
-            worldNameToMatch = worldName.casefold().replace(" ", "")
+            # Compare world ids so synonyms and data source spellings like
+            # NEWYORK vs New York resolve to the same world.
+            worldId = _canonical_slot_id(
+                _WORLD_SLOT_TYPE, worldName
+            ) or _slot_lookup_key(worldName)
             while True:
                 if lookupDay > last_day:
                     break
-                if worldNameToMatch in worldList[lookupDay].casefold().replace(" ", ""):
+                if worldId in _world_ids(worldList[lookupDay]):
                     break
                 lookupDay += 1
 
             if lookupDay > last_day and nextMonthWorldList is not None:
                 next_lookup = 1
                 while next_lookup < len(nextMonthWorldList):
-                    if worldNameToMatch in nextMonthWorldList[
-                        next_lookup
-                    ].casefold().replace(" ", ""):
+                    if worldId in _world_ids(nextMonthWorldList[next_lookup]):
                         found_in_next_month = True
                         next_month_lookup_day = next_lookup
                         break
@@ -529,7 +843,8 @@ class WorldOnDateIntentHandler(AbstractRequestHandler):
             )
             return handler_input.response_builder.speak(speak).ask(" ").response
 
-        # Weekend (2 dates)
+        # Weekend (2 dates); weekday facts come from the cached date context
+        ctx = clock.make_context(now)
         d1, dt1 = dates[0]
         d2, dt2 = dates[1]
         session_attr["last_answered_day"] = d2
@@ -539,21 +854,8 @@ class WorldOnDateIntentHandler(AbstractRequestHandler):
         if worldList[d1] == worldList[d2]:
             # Same worlds both days
             # Determine if we need disambiguation (today is weekend and this is NOT this weekend)
-            today_is_weekend = now.weekday() >= 5  # 5=Saturday, 6=Sunday
-            this_weekend_days = set()
-            if today_is_weekend:
-                # Find this weekend's Saturday and Sunday
-                if now.weekday() == 5:  # Saturday
-                    this_weekend_days = (
-                        {now.day, now.day + 1} if now.day + 1 <= last_day else {now.day}
-                    )
-                else:  # Sunday
-                    this_weekend_days = (
-                        {now.day - 1, now.day} if now.day - 1 >= 1 else {now.day}
-                    )
-
             requested_days = {d1, d2}
-            if today_is_weekend and requested_days != this_weekend_days:
+            if ctx.is_weekend and requested_days != ctx.this_weekend_days:
                 # "Next weekend" said on a weekend — need disambiguation
                 speak = (
                     "On Saturday and Sunday, "
@@ -573,20 +875,8 @@ class WorldOnDateIntentHandler(AbstractRequestHandler):
             return handler_input.response_builder.speak(speak).ask(" ").response
         else:
             # Different worlds each day
-            today_is_weekend = now.weekday() >= 5
-            this_weekend_days = set()
-            if today_is_weekend:
-                if now.weekday() == 5:
-                    this_weekend_days = (
-                        {now.day, now.day + 1} if now.day + 1 <= last_day else {now.day}
-                    )
-                else:
-                    this_weekend_days = (
-                        {now.day - 1, now.day} if now.day - 1 >= 1 else {now.day}
-                    )
-
             requested_days = {d1, d2}
-            if today_is_weekend and requested_days != this_weekend_days:
+            if ctx.is_weekend and requested_days != ctx.this_weekend_days:
                 speak = (
                     "On Saturday "
                     + _ordinal_date_string(dt1)
@@ -617,17 +907,17 @@ class AfterThatIntentHandler(AbstractRequestHandler):
 
     def handle(self, handler_input):
         logger.info("Handling AfterThatIntent")
-        now, day, midnight, last_day = _get_time_state()
         session_attr = handler_input.attributes_manager.session_attributes
         last_context = session_attr.get("last_context")
 
         if last_context == "challenge":
-            return self._handle_challenge_followup(handler_input, session_attr, now)
+            return self._handle_challenge_followup(handler_input, session_attr)
 
         # Default: world follow-up
         error = _data_unavailable_response(handler_input)
         if error:
             return error
+        now, day, midnight, last_day = _get_time_state()
 
         last_answered_day = session_attr.get("last_answered_day")
         last_answered_month_offset = session_attr.get("last_answered_month_offset", 0)
@@ -711,9 +1001,10 @@ class AfterThatIntentHandler(AbstractRequestHandler):
 
         return handler_input.response_builder.speak(speak).ask(" ").response
 
-    def _handle_challenge_followup(self, handler_input, session_attr, now):
+    def _handle_challenge_followup(self, handler_input, session_attr):
         """Handle 'after that' following a challenge query — advance by one week."""
-        if challengeData is None:
+        challenge_data = _get_challenge_data()
+        if challenge_data is None:
             speak = (
                 "Sorry, the weekly challenge data is temporarily unavailable. "
                 "Please try again later."
@@ -728,7 +1019,7 @@ class AfterThatIntentHandler(AbstractRequestHandler):
         last_date = datetime.strptime(last_date_str, "%Y-%m-%d")
         next_date = last_date + timedelta(days=7)
         month_key = next_date.strftime("%Y-%m")
-        month_data = challengeData.get(month_key)
+        month_data = challenge_data.get(month_key)
 
         if month_data is None:
             speak = "I don't have challenge data that far out."
@@ -784,7 +1075,8 @@ def _resolve_slot(handler_input, slot_name):
     """Resolve a custom slot value, returning the canonical value or None.
 
     Tries the resolution authority chain first (gives canonical value),
-    then falls back to the raw slot value.
+    then maps the raw slot value through the slot lookup table, and finally
+    falls back to the raw slot value.
     """
     try:
         slot = handler_input.request_envelope.request.intent.slots[slot_name]
@@ -795,8 +1087,14 @@ def _resolve_slot(handler_input, slot_name):
         return slot.resolutions.resolutions_per_authority[0].values[0].value.name
     except (AttributeError, IndexError, KeyError, TypeError):
         pass
-    # Fall back to raw slot value
-    return getattr(slot, "value", None)
+    # Fall back to raw slot value, canonicalized when it is a known synonym
+    raw_value = getattr(slot, "value", None)
+    slot_type = slotTable["slots"].get(slot_name)
+    if isinstance(raw_value, str) and slot_type:
+        value_id = _canonical_slot_id(slot_type, raw_value)
+        if value_id:
+            return slotTable["types"][slot_type]["names"][value_id]
+    return raw_value
 
 
 def _find_challenge_for_day(month_data, day):
@@ -870,7 +1168,8 @@ class WeeklyChallengeIntentHandler(AbstractRequestHandler):
     def handle(self, handler_input):
         logger.info("Handling WeeklyChallengeIntent")
 
-        if challengeData is None:
+        challenge_data = _get_challenge_data()
+        if challenge_data is None:
             speak = (
                 "Sorry, the weekly challenge data is temporarily unavailable. "
                 "Please try again later."
@@ -917,7 +1216,7 @@ class WeeklyChallengeIntentHandler(AbstractRequestHandler):
         if challenge_timeframe == "this month":
             return self._handle_this_month(
                 handler_input,
-                challengeData,
+                challenge_data,
                 current_month_key,
                 day,
                 last_day,
@@ -928,14 +1227,14 @@ class WeeklyChallengeIntentHandler(AbstractRequestHandler):
 
         if challenge_timeframe == "next month":
             return self._handle_next_month(
-                handler_input, challengeData, now, categories, use_imperial
+                handler_input, challenge_data, now, categories, use_imperial
             )
 
         if challenge_timeframe == "next week":
             # Calculate the date 7 days from now
             next_week = now + timedelta(days=7)
             month_key = next_week.strftime("%Y-%m")
-            month_data = challengeData.get(month_key)
+            month_data = challenge_data.get(month_key)
             if month_data is None:
                 speak = "I don't have next week's challenge schedule yet."
                 return handler_input.response_builder.speak(speak).ask(" ").response
@@ -947,7 +1246,7 @@ class WeeklyChallengeIntentHandler(AbstractRequestHandler):
             answer_date = next_week
         else:
             # Default: this week
-            month_data = challengeData.get(current_month_key)
+            month_data = challenge_data.get(current_month_key)
             if month_data is None:
                 speak = "I don't have challenge data for this month."
                 return handler_input.response_builder.speak(speak).ask(" ").response
@@ -1365,4 +1664,124 @@ sb.add_request_handler(
 
 sb.add_exception_handler(CatchAllExceptionHandler())
 
-lambda_handler = sb.lambda_handler()
+_skill_lambda_handler = sb.lambda_handler()
+
+
+# ---------------------------------------------------------------------------
+# Operator diagnostics
+# ---------------------------------------------------------------------------
+
+# A direct invoke with {"guestworldDiagnostics": {"token": ...}} returns a
+# report of what this container holds.  Alexa requests never carry that key.
+# The report is disabled unless DIAGNOSTICS_TOKEN is set.
+DIAGNOSTICS_EVENT_KEY = "guestworldDiagnostics"
+_invocationCount = 0
+
+
+def _cache_stats(cached_function):
+    """Summarize an lru_cache'd function's cache_info()."""
+    info = cached_function.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hit_ratio": round(info.hits / lookups, 4) if lookups else None,
+    }
+
+
+def _max_rss_kb():
+    """Return the process memory high-water mark in KiB (Linux), or None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _diagnostics_report():
+    """Describe the data, caches and memory of this warm container."""
+    now = time.time()
+    versions = {}
+    for name, version in dataVersions.items():
+        entry = dict(version)
+        for field in ("loaded_at", "checked_at"):
+            if entry.get(field) is not None:
+                entry[field.replace("_at", "_age_seconds")] = round(
+                    now - entry[field], 1
+                )
+        versions[name] = entry
+
+    return {
+        "container": {
+            "started_at": _containerStartedAt,
+            "uptime_seconds": round(now - _containerStartedAt, 1),
+            "invocations": _invocationCount,
+            "max_rss_kb": _max_rss_kb(),
+        },
+        "data": {
+            "versions": versions,
+            "world_list_days": len(worldList) - 1 if worldList else 0,
+            "next_month_world_list_days": (
+                len(nextMonthWorldList) - 1 if nextMonthWorldList else 0
+            ),
+            "challenge_data_loaded": _challengeDataLoaded,
+            "challenge_months": sorted(challengeData) if challengeData else [],
+        },
+        "refresher": {
+            "age_seconds": round(dataRefresher.age(), 1),
+            "soft_ttl": dataRefresher.soft_ttl,
+            "hard_ttl": dataRefresher.hard_ttl,
+            "last_attempt_at": dataRefresher.last_attempt_at,
+            "last_error": dataRefresher.last_error,
+            "stats": dict(dataRefresher.stats),
+        },
+        "caches": {
+            "world_ids": _cache_stats(_world_ids),
+            "date_facts": _cache_stats(clock._date_facts),
+            "month_length": _cache_stats(clock.month_length),
+        },
+        "slot_table": {
+            "load_seconds": round(_slotTableLoadSeconds, 6),
+            "slots": len(slotTable["slots"]),
+            "lookup_entries": sum(
+                len(t.get("lookup", {})) for t in slotTable["types"].values()
+            ),
+        },
+    }
+
+
+def _handle_diagnostics(request):
+    """Answer a diagnostics event if the caller presents the right token."""
+    expected = os.environ.get("DIAGNOSTICS_TOKEN")
+    if not expected:
+        return {"statusCode": 404, "error": "diagnostics disabled"}
+    token = request.get("token") if isinstance(request, dict) else None
+    # compare_digest only takes ASCII str, so compare the UTF-8 bytes.
+    if not isinstance(token, str) or not hmac.compare_digest(
+        token.encode("utf-8"), expected.encode("utf-8")
+    ):
+        logger.warning("Rejected diagnostics request with a bad token")
+        return {"statusCode": 403, "error": "forbidden"}
+    logger.info("Serving diagnostics report")
+    return {"statusCode": 200, "diagnostics": _diagnostics_report()}
+
+
+def lambda_handler(event, context):
+    """Entry point: pin one TimeContext, revalidate data, then run the skill.
+
+    With PREFETCH_CHALLENGE_DATA=1, challenge data starts loading in the
+    background once the first response has been produced, so a follow-up
+    challenge question in a warm container does not wait on S3.
+    """
+    global _invocationCount
+    if isinstance(event, dict) and DIAGNOSTICS_EVENT_KEY in event:
+        return _handle_diagnostics(event[DIAGNOSTICS_EVENT_KEY])
+    _invocationCount += 1
+    with clock.request_scope():
+        dataRefresher.ensure_fresh()
+        response = _skill_lambda_handler(event, context)
+    if _PREFETCH_CHALLENGE_DATA:
+        _prefetch_challenge_data()
+    return response
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Compile the per-locale interaction models from a single source.
+
+Inputs:
+    models/interaction_model.json   shared model (ASK interactionModel document)
+    models/locales/<locale>.json    optional per-locale overrides
+    skill.json                      list of published locales
+
+Outputs:
+    interactionModels/custom/<locale>.json   one model per published locale
+    lambda/slot_values.json                  runtime slot lookup table
+
+Override files are small JSON objects; every key is optional:
+
+    {
+      "invocationName": "which world",
+      "version": "87",
+      "samples": {"TodaysWorldIntent": {"add": ["..."], "remove": ["..."]}},
+      "values": {"AMAZON.AT_CITY": {"add": [{"name": {"value": "..."}}],
+                                     "remove": ["France"]}},
+      "synonyms": {"AMAZON.AT_CITY": {"Paris": {"add": ["..."], "remove": ["pears"]}}}
+    }
+
+Usage:
+    python models/build_models.py           # write all outputs
+    python models/build_models.py --check   # exit 1 if outputs are stale
+"""
+
+import argparse
+import copy
+import json
+import os
+import re
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+SOURCE_PATH = os.path.join(REPO_ROOT, "models", "interaction_model.json")
+OVERRIDES_DIR = os.path.join(REPO_ROOT, "models", "locales")
+SKILL_MANIFEST_PATH = os.path.join(REPO_ROOT, "skill.json")
+MODELS_DIR = os.path.join(REPO_ROOT, "interactionModels", "custom")
+RUNTIME_TABLE_PATH = os.path.join(REPO_ROOT, "lambda", "slot_values.json")
+
+
+def lookup_key(text):
+    """Normalize a spoken slot value into its lookup-table key.
+
+    Casefolds and drops all whitespace so "New York", "new york" and the
+    scraped "NEWYORK" share one key.  lambda_function applies the same rule.
+    """
+    return "".join((text or "").casefold().split())
+
+
+def slot_value_id(value):
+    """Return the explicit id of a slot value, or one derived from its name."""
+    if value.get("id"):
+        return value["id"]
+    return re.sub(r"[^0-9A-Za-z]+", "_", value["name"]["value"]).strip("_").upper()
+
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_model(model):
+    """Serialize a model the way the ASK console/CLI formats exported models."""
+    return json.dumps(model, indent=2, ensure_ascii=False).replace("'", "\\u0027") + "\n"
+
+
+def dump_runtime_table(table):
+    """Serialize the runtime table compactly; it ships inside the Lambda zip."""
+    return json.dumps(table, ensure_ascii=False, sort_keys=True, separators=(",", ":")) + "\n"
+
+
+def published_locales(manifest):
+    """Return the locales listed in skill.json, in manifest order."""
+    return list(manifest["manifest"]["publishingInformation"]["locales"].keys())
+
+
+def _edit_list(items, edits, what):
+    """Apply an {"add": [...], "remove": [...]} edit to a list of strings."""
+    result = list(items)
+    for item in edits.get("remove", []):
+        if item not in result:
+            raise ValueError("Cannot remove missing %s: %r" % (what, item))
+        result.remove(item)
+    for item in edits.get("add", []):
+        if item not in result:
+            result.append(item)
+    return result
+
+
+def apply_overrides(model, overrides):
+    """Return a copy of the shared model with one locale's overrides applied."""
+    model = copy.deepcopy(model)
+    if "version" in overrides:
+        model["version"] = overrides["version"]
+
+    language_model = model["interactionModel"]["languageModel"]
+    if "invocationName" in overrides:
+        language_model["invocationName"] = overrides["invocationName"]
+
+    intents = {intent["name"]: intent for intent in language_model["intents"]}
+    for intent_name, edits in overrides.get("samples", {}).items():
+        if intent_name not in intents:
+            raise ValueError("Override references unknown intent: %s" % intent_name)
+        intent = intents[intent_name]
+        intent["samples"] = _edit_list(
+            intent.get("samples", []), edits, "%s sample" % intent_name
+        )
+
+    types = {slot_type["name"]: slot_type for slot_type in language_model["types"]}
+    for type_name, edits in overrides.get("values", {}).items():
+        if type_name not in types:
+            raise ValueError("Override references unknown slot type: %s" % type_name)
+        values = types[type_name]["values"]
+        for name in edits.get("remove", []):
+            matches = [v for v in values if v["name"]["value"] == name]
+            if not matches:
+                raise ValueError("Cannot remove missing %s value: %r" % (type_name, name))
+            values.remove(matches[0])
+        values.extend(copy.deepcopy(edits.get("add", [])))
+
+    for type_name, by_value in overrides.get("synonyms", {}).items():
+        if type_name not in types:
+            raise ValueError("Override references unknown slot type: %s" % type_name)
+        values = {v["name"]["value"]: v for v in types[type_name]["values"]}
+        for value_name, edits in by_value.items():
+            if value_name not in values:
+                raise ValueError(
+                    "Override references unknown %s value: %s" % (type_name, value_name)
+                )
+            name = values[value_name]["name"]
+            synonyms = _edit_list(
+                name.get("synonyms", []), edits, "%s synonym" % value_name
+            )
+            if synonyms:
+                name["synonyms"] = synonyms
+            else:
+                name.pop("synonyms", None)
+
+    return model
+
+
+def build_runtime_table(models):
+    """Build the runtime slot table from the compiled locale models.
+
+    Returns a dict with:
+        slots  - slot name -> slot type, for every slot with a custom value list
+        types  - slot type -> {"names": {id: canonical name},
+                               "lookup": {lookup_key: id}}
+
+    Synonyms from every locale are merged.  A key that maps to two different
+    ids within one type is an authoring error and raises ValueError.
+    """
+    slots = {}
+    types = {}
+    for locale, model in models.items():
+        language_model = model["interactionModel"]["languageModel"]
+        for slot_type in language_model["types"]:
+            entry = types.setdefault(slot_type["name"], {"names": {}, "lookup": {}})
+            for value in slot_type["values"]:
+                value_id = slot_value_id(value)
+                name = value["name"]["value"]
+                known = entry["names"].setdefault(value_id, name)
+                if known != name:
+                    raise ValueError(
+                        "%s id %s names both %r and %r" % (slot_type["name"], value_id, known, name)
+                    )
+                for text in [name] + value["name"].get("synonyms", []):
+                    key = lookup_key(text)
+                    existing = entry["lookup"].setdefault(key, value_id)
+                    if existing != value_id:
+                        raise ValueError(
+                            "%s (%s): %r maps to both %s and %s"
+                            % (slot_type["name"], locale, text, existing, value_id)
+                        )
+
+        for intent in language_model["intents"]:
+            for slot in intent.get("slots", []):
+                if slot["type"] not in types:
+                    continue
+                known = slots.setdefault(slot["name"], slot["type"])
+                if known != slot["type"]:
+                    raise ValueError(
+                        "Slot %s has types %s and %s" % (slot["name"], known, slot["type"])
+                    )
+
+    return {"slots": slots, "types": types}
+
+
+def compile_models(source, manifest, overrides_dir=OVERRIDES_DIR):
+    """Return ({locale: model}, runtime_table) for every published locale."""
+    models = {}
+    for locale in published_locales(manifest):
+        override_path = os.path.join(overrides_dir, "%s.json" % locale)
+        overrides = load_json(override_path) if os.path.exists(override_path) else {}
+        models[locale] = apply_overrides(source, overrides)
+    return models, build_runtime_table(models)
+
+
+def _outputs():
+    """Return [(path, text)] for every generated file."""
+    models, table = compile_models(load_json(SOURCE_PATH), load_json(SKILL_MANIFEST_PATH))
+    outputs = [
+        (os.path.join(MODELS_DIR, "%s.json" % locale), dump_model(model))
+        for locale, model in models.items()
+    ]
+    outputs.append((RUNTIME_TABLE_PATH, dump_runtime_table(table)))
+    return outputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--check", action="store_true", help="verify generated files are up to date"
+    )
+    args = parser.parse_args(argv)
+
+    stale = []
+    for path, text in _outputs():
+        current = None
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                current = f.read()
+        if current == text:
+            continue
+        stale.append(os.path.relpath(path, REPO_ROOT))
+        if not args.check:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+    if args.check and stale:
+        print("Out of date: %s" % ", ".join(stale), file=sys.stderr)
+        print("Run: python models/build_models.py", file=sys.stderr)
+        return 1
+    for path in stale:
+        print("Wrote %s" % path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
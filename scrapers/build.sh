@@ -19,6 +19,15 @@ cp "$SCRIPT_DIR/guestworld_scraper_handler.py" "$PKG_DIR/"
 cp "$SCRIPT_DIR/guestworld_scraper_core.py" "$PKG_DIR/"
 cp "$SCRIPT_DIR/challenge_scraper_handler.py" "$PKG_DIR/"
 cp "$SCRIPT_DIR/challenge_scraper_core.py" "$PKG_DIR/"
+cp "$SCRIPT_DIR/scraper_orchestrator.py" "$PKG_DIR/"
+cp "$SCRIPT_DIR/http_fetch.py" "$PKG_DIR/"
+cp "$SCRIPT_DIR/fetch_state.py" "$PKG_DIR/"
+cp "$SCRIPT_DIR/s3_publish.py" "$PKG_DIR/"
+cp "$SCRIPT_DIR/dataset_manifest.py" "$PKG_DIR/"
+cp "$SCRIPT_DIR/phase_timer.py" "$PKG_DIR/"
+cp "$SCRIPT_DIR/ssm_params.py" "$PKG_DIR/"
+cp "$SCRIPT_DIR/html_backend.py" "$PKG_DIR/"
+cp "$SCRIPT_DIR/route_detail_index.py" "$PKG_DIR/"
 
 # Create zip
 cd "$PKG_DIR"
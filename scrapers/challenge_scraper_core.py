@@ -3,9 +3,10 @@
 Pure functions — no AWS or network calls.
 """
 
+import html
 import re
 
-from bs4 import BeautifulSoup
+from html_backend import find_table_by_class, make_soup
 
 # SSML phonetic overrides for route/climb names that Alexa's default TTS
 # mispronounces.  Maps exact name strings to SSML <phoneme> tags.
@@ -35,16 +36,16 @@ def parse_challenge_calendar_html(html_content):
         Each entry dict has keys: name, xp (int), detail_url (str or None).
         A day may have only "route", only "climb", or both.
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-    table = soup.find("table", class_=lambda c: c and "calendar-table" in c)
+    table = find_table_by_class(html_content, "calendar-table")
     if table is None:
         return []
 
-    cells = table.find_all("td", class_=lambda c: c and "day-with-date" in c)
+    cells = table.find_all("td", class_="day-with-date")
+    event_categories = _event_categories(table)
 
     days = []
     for cell in cells:
-        day_span = cell.find("span", class_=lambda c: c and "day-number" in c)
+        day_span = cell.find("span", class_="day-number")
         if not day_span:
             continue
 
@@ -71,7 +72,9 @@ def parse_challenge_calendar_html(html_content):
             detail_url = link["href"] if link else None
 
             # Classify as route or climb by CSS class or URL pattern
-            category = _classify_challenge(event, detail_url)
+            category = event_categories.get(id(event)) or _category_from_url(
+                detail_url
+            )
             if category:
                 entry = {"name": name, "xp": xp, "detail_url": detail_url}
                 challenges[category] = entry
@@ -83,49 +86,129 @@ def parse_challenge_calendar_html(html_content):
     return days
 
 
-def _classify_challenge(event_tag, detail_url):
-    """Determine whether an event is a 'route' or 'climb'.
+def _tag_category(tag):
+    """Return the category named by a tag's own classes, or None."""
+    classes = tag.get("class", [])
+    if isinstance(classes, str):
+        classes = classes.split()
+    for cls in classes:
+        if "category_367" in cls:
+            return "route"
+        if "category_370" in cls:
+            return "climb"
+    return None
+
+
+def _is_event(tag):
+    classes = tag.get("class", [])
+    return tag.name == "span" and "calnk" in classes
 
-    Uses CSS category class first, falls back to URL pattern.
+
+# Stack marker in _event_categories for leaving an event's subtree.
+_LEAVE_EVENT = object()
+
+
+def _event_categories(table):
+    """Classify every event in the table in one walk of the tree.
+
+    Returns {id(event_tag): category} for each <span class="calnk">.  An
+    event takes the category of its nearest ancestor with a category class;
+    failing that, the first category class on the event itself or one of
+    its descendants, in document order.  Events with neither are None.
     """
-    # Walk up to find an ancestor with a category class
-    for parent in event_tag.parents:
-        if parent is None:
+    inherited = None
+    for parent in table.parents:
+        inherited = _tag_category(parent)
+        if inherited:
             break
-        classes = parent.get("class", [])
-        if isinstance(classes, str):
-            classes = classes.split()
-        for cls in classes:
-            if "category_367" in cls:
-                return "route"
-            if "category_370" in cls:
-                return "climb"
-
-    # Also check the event tag itself and its descendants
-    all_tags = [event_tag] + list(event_tag.find_all(True))
-    for tag in all_tags:
-        classes = tag.get("class", [])
-        if isinstance(classes, str):
-            classes = classes.split()
-        for cls in classes:
-            if "category_367" in cls:
-                return "route"
-            if "category_370" in cls:
-                return "climb"
-
-    # Fallback: URL pattern
+
+    categories = {}
+    unresolved = []  # open events still waiting for a descendant category
+
+    # Explicit stack rather than recursion: pages can nest deeper than
+    # Python's recursion limit.  An (event, _LEAVE_EVENT) entry is popped
+    # once the event's subtree has been walked.
+    stack = [(table, inherited)]
+    while stack:
+        tag, inherited = stack.pop()
+        if inherited is _LEAVE_EVENT:
+            if unresolved and unresolved[-1] is tag:
+                unresolved.pop()
+            continue
+
+        own = _tag_category(tag)
+        if _is_event(tag):
+            categories[id(tag)] = inherited
+            if inherited is None:
+                unresolved.append(tag)
+            stack.append((tag, _LEAVE_EVENT))
+        if own and unresolved:
+            # Preorder: this is the first category inside each open event.
+            for event in unresolved:
+                categories[id(event)] = own
+            unresolved.clear()
+
+        child_inherited = own or inherited
+        children = [c for c in tag.children if getattr(c, "name", None)]
+        stack.extend((child, child_inherited) for child in reversed(children))
+
+    return categories
+
+
+def _category_from_url(detail_url):
+    """Fallback classification by detail URL pattern."""
     if detail_url:
         if "/route/" in detail_url:
             return "route"
         if "/portal/" in detail_url:
             return "climb"
-
     return None
 
 
+# Distance pattern: "22.5 km (14.0 miles)" or "22.5km (14.0mi)"
+_DISTANCE_PATTERN = re.compile(
+    r'([\d.]+)\s*km\s*\(\s*([\d.]+)\s*mi(?:les?)?\s*\)', re.IGNORECASE)
+# Elevation pattern: "350 m (1,148')" or "350m (1148 ft)" or "350 m (1,148 ft)"
+_ELEVATION_PATTERN = re.compile(
+    r'([\d,]+)\s*m\s*\(\s*([\d,]+)\s*(?:ft|\'|feet)\s*\)', re.IGNORECASE)
+
+# Markup that BeautifulSoup's get_text() leaves out, and any tag.
+_NON_TEXT_BLOCKS = re.compile(
+    r'<(script|style)\b.*?</\1\s*>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r'<[!/?a-zA-Z][^>]*>')
+
+
+def _page_text(html_content):
+    """Approximate soup.get_text() with regexes: drop tags, keep text."""
+    if isinstance(html_content, bytes):
+        html_content = html_content.decode("utf-8", errors="replace")
+    text = _NON_TEXT_BLOCKS.sub("", html_content)
+    return html.unescape(_TAG.sub("", text))
+
+
+def _extract_route_details(text):
+    """Find distance/elevation in page text; None if neither is present."""
+    result = {}
+    dist_match = _DISTANCE_PATTERN.search(text)
+    if dist_match:
+        result["distance_km"] = float(dist_match.group(1))
+        result["distance_mi"] = float(dist_match.group(2))
+
+    elev_match = _ELEVATION_PATTERN.search(text)
+    if elev_match:
+        result["elevation_m"] = float(elev_match.group(1).replace(",", ""))
+        result["elevation_ft"] = float(elev_match.group(2).replace(",", ""))
+
+    return result or None
+
+
 def parse_route_detail_page(html_content):
     """Extract distance and elevation from a route/climb detail page.
 
+    The patterns are first tried on the page text recovered with regexes,
+    which takes a fraction of a millisecond; only if that finds nothing is
+    a full tree built and searched.
+
     Args:
         html_content: raw HTML string or bytes from a route detail page.
 
@@ -136,42 +219,14 @@ def parse_route_detail_page(html_content):
     if not html_content:
         return None
 
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    distance_km = None
-    distance_mi = None
-    elevation_m = None
-    elevation_ft = None
+    result = _extract_route_details(_page_text(html_content))
+    if result is not None:
+        return result
 
     # Look for distance/elevation in common patterns:
     # "XX.X km (XX.X miles)" and "XXX m (X,XXX')" or "XXX m (XXX ft)"
-    text = soup.get_text()
-
-    # Distance pattern: "22.5 km (14.0 miles)" or "22.5km (14.0mi)"
-    dist_match = re.search(
-        r'([\d.]+)\s*km\s*\(\s*([\d.]+)\s*mi(?:les?)?\s*\)', text, re.IGNORECASE)
-    if dist_match:
-        distance_km = float(dist_match.group(1))
-        distance_mi = float(dist_match.group(2))
-
-    # Elevation pattern: "350 m (1,148')" or "350m (1148 ft)" or "350 m (1,148 ft)"
-    elev_match = re.search(
-        r'([\d,]+)\s*m\s*\(\s*([\d,]+)\s*(?:ft|\'|feet)\s*\)', text, re.IGNORECASE)
-    if elev_match:
-        elevation_m = float(elev_match.group(1).replace(",", ""))
-        elevation_ft = float(elev_match.group(2).replace(",", ""))
-
-    if distance_km is None and elevation_m is None:
-        return None
-
-    result = {}
-    if distance_km is not None:
-        result["distance_km"] = distance_km
-        result["distance_mi"] = distance_mi
-    if elevation_m is not None:
-        result["elevation_m"] = elevation_m
-        result["elevation_ft"] = elevation_ft
-    return result
+    soup = make_soup(html_content)
+    return _extract_route_details(soup.get_text())
 
 
 def build_challenge_json(days_by_month, route_details=None):
@@ -6,13 +6,24 @@ fetches route detail pages, and writes WeeklyChallenges.json (+ archive) to S3.
 Lambda config: handler = challenge_scraper_handler.lambda_handler
 """
 
+import hashlib
 import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+from urllib.parse import urljoin, urlsplit
 
 import boto3
-import requests
 
+import dataset_manifest
+import http_fetch
+import s3_publish
+import ssm_params
+from fetch_state import FetchState
+from phase_timer import PhaseTimer
+from route_detail_index import RouteDetailIndex, normalize_name
 from challenge_scraper_core import (
     parse_challenge_calendar_html,
     parse_route_detail_page,
@@ -41,6 +52,16 @@ _MONTH_ABBRS = {
 }
 
 
+# Route detail pages are fetched in parallel, but politely: a few workers,
+# at most _DETAIL_PER_HOST requests in flight per host, and an overall
+# deadline so slow pages cannot push the Lambda past its timeout.
+# http_fetch's host limiter may pace requests further below these caps.
+_DETAIL_MAX_WORKERS = 6
+_DETAIL_PER_HOST = 3
+_DETAIL_TIMEOUT_SECONDS = 15
+_DETAIL_DEADLINE_SECONDS = 90
+
+
 def _previous_month_year(year, month):
     """Return (year, month) for the month immediately before inputs."""
     if month == 1:
@@ -48,11 +69,6 @@ def _previous_month_year(year, month):
     return year, month - 1
 
 
-def _normalize_name(name):
-    """Normalize route/climb names for cache lookups."""
-    return " ".join((name or "").strip().casefold().split())
-
-
 def _extract_detail_fields(entry):
     """Extract cached distance/elevation fields from a challenge entry."""
     detail = {}
@@ -81,7 +97,7 @@ def _build_detail_cache_from_json(payload):
                 name = entry.get("name")
                 detail = _extract_detail_fields(entry)
                 if name and detail:
-                    norm = _normalize_name(name)
+                    norm = normalize_name(name)
                     if norm and norm not in cache:
                         cache[norm] = detail
     return cache
@@ -113,6 +129,19 @@ def _load_detail_cache_from_s3(s3_client, current_year, current_month):
     return cache
 
 
+def _load_detail_index(s3_client, current_year, current_month, timer):
+    """Load the route detail index, seeding it from recent JSON if missing."""
+    with timer.phase("detail_index_load"):
+        index = RouteDetailIndex(s3_client, S3_BUCKET).load()
+        if not index.loaded:
+            # First run with the index: migrate what the published files know.
+            index.seed(
+                _load_detail_cache_from_s3(s3_client, current_year, current_month)
+            )
+    logger.info("Route detail index has %d entries", len(index))
+    return index
+
+
 def _extract_month_keys(payload):
     """Return sorted valid month keys present in challenge payload JSON."""
     if not isinstance(payload, dict):
@@ -159,11 +188,22 @@ def _is_regression_against_existing(existing_payload, new_payload):
     return (len(regressed) > 0), sorted(regressed)
 
 
-def _safe_write_challenge_json(s3_client, key, json_content, challenge_json):
-    """Write S3 object only if it does not reduce month coverage vs existing."""
-    try:
-        existing_response = s3_client.get_object(Bucket=S3_BUCKET, Key=key)
-        existing_payload = json.loads(existing_response["Body"].read().decode("utf-8"))
+def _challenge_json_write(s3_client, key, json_content, challenge_json, after=None):
+    """Return an s3_publish.Write whose guard refuses reduced month coverage.
+
+    The content hash is stored in user metadata for the dataset manifest.
+    """
+    digest = hashlib.sha256(json_content.encode("utf-8")).hexdigest()
+
+    def check():
+        try:
+            existing_response = s3_client.get_object(Bucket=S3_BUCKET, Key=key)
+            existing_payload = json.loads(
+                existing_response["Body"].read().decode("utf-8")
+            )
+        except Exception:
+            # No existing object (or unreadable object) is treated as safe to write.
+            return True
         is_regression, missing_months = _is_regression_against_existing(
             existing_payload, challenge_json
         )
@@ -174,27 +214,162 @@ def _safe_write_challenge_json(s3_client, key, json_content, challenge_json):
                 ", ".join(missing_months),
             )
             return False
-    except Exception:
-        # No existing object (or unreadable object) is treated as safe to write.
-        pass
-
-    s3_client.put_object(
-        Bucket=S3_BUCKET,
-        Key=key,
-        Body=json_content,
-        ContentType="application/json",
-        ACL="public-read",
+        return True
+
+    def put():
+        s3_client.put_object(
+            Bucket=S3_BUCKET,
+            Key=key,
+            Body=json_content,
+            ContentType="application/json",
+            ACL="public-read",
+            Metadata={"sha256": digest},
+        )
+
+    return s3_publish.Write(key, check, put, after)
+
+
+def _fetch_route_details(base_url, urls):
+    """Fetch and parse route detail pages concurrently.
+
+    Returns (details, stats) where details maps every URL in ``urls`` to
+    parsed detail fields, or None if the page failed or the deadline passed.
+    """
+    started = time.monotonic()
+    deadline = started + _DETAIL_DEADLINE_SECONDS
+    stats = {
+        "requested": len(urls),
+        "fetched": 0,
+        "failed": 0,
+        "timed_out": 0,
+        "elapsed_seconds": 0.0,
+        "slowest_seconds": 0.0,
+    }
+    if not urls:
+        return {}, stats
+
+    # Detail URLs may be relative — resolve against base
+    full_urls = {
+        url: urljoin(base_url, url) if url.startswith("/") else url for url in urls
+    }
+    host_slots = {
+        host: threading.BoundedSemaphore(_DETAIL_PER_HOST)
+        for host in {urlsplit(u).netloc for u in full_urls.values()}
+    }
+
+    def fetch_one(url):
+        full_url = full_urls[url]
+        with host_slots[urlsplit(full_url).netloc]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Detail fetch deadline passed")
+            logger.info("Fetching detail page: %s", full_url)
+            fetch_started = time.monotonic()
+            try:
+                detail_page = http_fetch.get(
+                    full_url, timeout=min(_DETAIL_TIMEOUT_SECONDS, remaining)
+                )
+            except Exception as e:
+                # http_fetch bounds its limiter wait and the request by the
+                # timeout, which was cut to the deadline: a failure past it
+                # is a deadline miss.
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("Detail fetch deadline passed") from e
+                raise
+            detail_page.raise_for_status()
+            detail = parse_route_detail_page(detail_page.content)
+            return detail, time.monotonic() - fetch_started
+
+    details = {}
+    executor = ThreadPoolExecutor(
+        max_workers=min(_DETAIL_MAX_WORKERS, len(urls)),
+        thread_name_prefix="detail-fetch",
+    )
+    try:
+        futures = {url: executor.submit(fetch_one, url) for url in urls}
+        wait(futures.values(), timeout=max(0, deadline - time.monotonic()))
+        for url in urls:
+            future = futures[url]
+            if not future.done():
+                logger.warning("Detail page not fetched before deadline: %s", url)
+                stats["timed_out"] += 1
+                details[url] = None
+                continue
+            try:
+                detail, seconds = future.result()
+            except TimeoutError:
+                logger.warning("Detail page not fetched before deadline: %s", url)
+                stats["timed_out"] += 1
+                details[url] = None
+                continue
+            except Exception:
+                logger.warning("Failed to fetch detail page: %s", url, exc_info=True)
+                stats["failed"] += 1
+                details[url] = None
+                continue
+            details[url] = detail
+            stats["fetched"] += 1
+            stats["slowest_seconds"] = max(stats["slowest_seconds"], round(seconds, 3))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    stats["elapsed_seconds"] = round(time.monotonic() - started, 3)
+    logger.info(
+        "Fetched %d of %d detail pages in %.2fs (%d failed, %d timed out)",
+        stats["fetched"],
+        stats["requested"],
+        stats["elapsed_seconds"],
+        stats["failed"],
+        stats["timed_out"],
     )
-    return True
+    return details, stats
+
+
+def _load_fetch_state(s3, timer):
+    """Load the stored calendar validators, timed as "state_load"."""
+    with timer.phase("state_load"):
+        return FetchState(s3, S3_BUCKET, "challenges").load()
+
+
+def _fetch_calendar(state, url, force, timer, label):
+    """Fetch one calendar page conditionally, timed as "fetch.<label>"."""
+    with timer.phase("fetch." + label):
+        return state.fetch(url, 30, force)
+
+
+def _parse_result(state, result, timer, label):
+    """Parse a calendar FetchResult, re-fetching a 304 page in full."""
+    if result.response is None:
+        result = _fetch_calendar(state, result.url, True, timer, label)
+    with timer.phase("parse." + label):
+        return parse_challenge_calendar_html(result.response.content)
 
 
 def lambda_handler(event, context):
-    # Read challenges calendar URL from SSM
+    s3 = boto3.client("s3")
     ssm = boto3.client("ssm", region_name="us-east-1")
-    base_url = ssm.get_parameter(Name="/guestworld/challenges-url")["Parameter"][
-        "Value"
-    ]
+    return scrape(event, s3, ssm)
+
+
+def scrape(event, s3, ssm):
+    """Run the challenge routes pipeline with the given S3 and SSM clients.
+
+    The summary includes per-phase "timings", which are also emitted as one
+    CloudWatch EMF line whether or not the run succeeds.
+    """
+    timer = PhaseTimer("challenges")
+    status = "error"
+    try:
+        with timer.phase("total"):
+            result = _scrape(event, s3, ssm, timer)
+        status = "ok"
+    finally:
+        timer.emit(Status=status)
+    result["timings"] = timer.as_dict()
+    return result
+
 
+def _scrape(event, s3, ssm, timer):
     now = datetime.utcnow()
     current_month = now.month
     current_year = now.year
@@ -207,34 +382,72 @@ def lambda_handler(event, context):
         next_month = current_month + 1
         next_year = current_year
 
-    # Fetch current month (default page)
-    logger.info("Fetching current month calendar")
-    page_current = requests.get(base_url, timeout=30)
-    page_current.raise_for_status()
-    days_current = parse_challenge_calendar_html(page_current.content)
-
-    # Fetch next month (best effort)
-    next_month_url = "%s?month=%s&yr=%d" % (
-        base_url,
-        _MONTH_ABBRS[next_month],
-        next_year,
-    )
-    logger.info("Fetching next month calendar: %s", _MONTH_ABBRS[next_month])
-    days_next = []
-    try:
-        page_next = requests.get(next_month_url, timeout=30)
-        page_next.raise_for_status()
-        days_next = parse_challenge_calendar_html(page_next.content)
-    except Exception:
-        logger.warning("Unable to fetch next month challenge calendar", exc_info=True)
-        days_next = []
+    archive_key = "WeeklyChallenges%04d%02d.json" % (current_year, current_month)
 
-    if not days_current and not days_next:
-        raise ValueError("No challenge calendar data found for either month")
+    # {"force": true} ignores stored validators and rebuilds everything.
+    force = bool((event or {}).get("force"))
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        # The stored validators load while SSM answers.
+        state_future = pool.submit(_load_fetch_state, s3, timer)
+
+        # Read challenges calendar URL from SSM
+        with timer.phase("ssm"):
+            base_url = ssm_params.get_parameter(ssm, "/guestworld/challenges-url")
+        state = state_future.result()
+
+        next_month_url = "%s?month=%s&yr=%d" % (
+            base_url,
+            _MONTH_ABBRS[next_month],
+            next_year,
+        )
+        logger.info("Fetching current month calendar")
+        current_future = pool.submit(
+            _fetch_calendar, state, base_url, force, timer, "current"
+        )
+        logger.info("Fetching next month calendar: %s", _MONTH_ABBRS[next_month])
+        next_future = pool.submit(
+            _fetch_calendar, state, next_month_url, force, timer, "next"
+        )
 
-    # Load persistent route/climb detail cache from current + recent S3 JSON
-    s3 = boto3.client("s3")
-    detail_cache_by_name = _load_detail_cache_from_s3(s3, current_year, current_month)
+        current_result = current_future.result()
+
+        # Next month is best effort
+        try:
+            next_result = next_future.result()
+        except Exception:
+            logger.warning(
+                "Unable to fetch next month challenge calendar", exc_info=True
+            )
+            next_result = None
+
+        if not current_result.changed and not (next_result and next_result.changed):
+            logger.info("Challenge calendars unchanged; skipped parsing and S3 writes")
+            state.save()
+            return {
+                "statusCode": 200,
+                "unchanged": True,
+                "archive_key": archive_key,
+                "wrote_keys": [],
+                "skipped_keys": [],
+            }
+
+        # Something changed, so the route detail index will be needed.  It
+        # does not depend on the calendar and loads while the pages parse.
+        index_future = pool.submit(
+            _load_detail_index, s3, current_year, current_month, timer
+        )
+
+        # The output combines both months, so a page that answered 304
+        # while the other changed has to be read again in full.
+        days_current = _parse_result(state, current_result, timer, "current")
+        days_next = (
+            _parse_result(state, next_result, timer, "next") if next_result else []
+        )
+
+        if not days_current and not days_next:
+            raise ValueError("No challenge calendar data found for either month")
+
+        detail_index = index_future.result()
 
     # Collect unique detail URLs from both months, mapped to challenge names
     detail_urls = {}
@@ -245,32 +458,33 @@ def lambda_handler(event, context):
                 if url:
                     detail_urls[url] = challenges[category].get("name", "")
 
-    # Fetch route detail pages
+    # Resolve route details from the index, fetching only misses and
+    # entries past their TTL.
     route_details = {}
+    stale_details = {}
+    to_fetch = []
     cache_hits = 0
     for url, name in detail_urls.items():
-        cached_detail = detail_cache_by_name.get(_normalize_name(name))
-        if cached_detail:
+        cached_detail, fresh = detail_index.lookup(url, name)
+        if cached_detail and fresh:
             route_details[url] = cached_detail
             cache_hits += 1
-            continue
-
-        try:
-            # Detail URLs may be relative — resolve against base
-            if url.startswith("/"):
-                # Extract base domain from base_url
-                from urllib.parse import urljoin
-
-                full_url = urljoin(base_url, url)
-            else:
-                full_url = url
-            logger.info("Fetching detail page: %s", full_url)
-            detail_page = requests.get(full_url, timeout=15)
-            detail_page.raise_for_status()
-            route_details[url] = parse_route_detail_page(detail_page.content)
-        except Exception:
-            logger.warning("Failed to fetch detail page: %s", url, exc_info=True)
-            route_details[url] = None
+        else:
+            if cached_detail:
+                stale_details[url] = cached_detail
+            to_fetch.append(url)
+
+    with timer.phase("detail_fetch"):
+        fetched, fetch_stats = _fetch_route_details(base_url, to_fetch)
+    for url, detail in fetched.items():
+        if detail:
+            detail_index.record(url, detail_urls[url], detail)
+            route_details[url] = detail
+        else:
+            # A stale entry beats no entry when the refetch fails.
+            route_details[url] = stale_details.get(url)
+    # Keep route_details in calendar order regardless of completion order.
+    route_details = {url: route_details.get(url) for url in detail_urls}
 
     logger.info(
         "Detail cache hits: %d of %d unique detail URLs",
@@ -291,31 +505,54 @@ def lambda_handler(event, context):
     challenge_json = build_challenge_json(days_by_month, route_details)
     json_content = json.dumps(challenge_json, ensure_ascii=False)
 
-    # Write to S3, but avoid overwriting with reduced month coverage.
-    wrote_keys = []
-    skipped_keys = []
-
-    if _safe_write_challenge_json(
-        s3, "WeeklyChallenges.json", json_content, challenge_json
-    ):
-        wrote_keys.append("WeeklyChallenges.json")
-    else:
-        skipped_keys.append("WeeklyChallenges.json")
+    # Publish to S3, but avoid overwriting with reduced month coverage.
+    # WeeklyChallenges.json is only replaced once its archive is written.
+    with timer.phase("s3_publish"):
+        published = s3_publish.publish(
+            [
+                _challenge_json_write(s3, archive_key, json_content, challenge_json),
+                _challenge_json_write(
+                    s3,
+                    "WeeklyChallenges.json",
+                    json_content,
+                    challenge_json,
+                    after=archive_key,
+                ),
+            ]
+        )
+    if published["failed_keys"]:
+        # Leave the fetch state alone so the next run retries these pages.
+        raise RuntimeError("Failed to publish %s" % ", ".join(published["failed_keys"]))
+
+    # The manifest goes last.  Failing here leaves the fetch state
+    # uncommitted, so the next run republishes and retries it.
+    with timer.phase("manifest"):
+        manifest_keys = dataset_manifest.update(
+            s3, S3_BUCKET, [archive_key, "WeeklyChallenges.json"]
+        )
 
-    archive_key = "WeeklyChallenges%04d%02d.json" % (current_year, current_month)
-    if _safe_write_challenge_json(s3, archive_key, json_content, challenge_json):
-        wrote_keys.append(archive_key)
-    else:
-        skipped_keys.append(archive_key)
+    state.commit(base_url, days=len(days_current))
+    if next_result:
+        state.commit(next_month_url, days=len(days_next))
+    with timer.phase("state_save"):
+        state.save()
+        try:
+            detail_index.save()
+        except Exception:
+            logger.warning("Failed to save route detail index", exc_info=True)
 
     months = [k for k in [current_key, next_key] if k in days_by_month]
     return {
         "statusCode": 200,
+        "unchanged": False,
         "routes_scraped": len(detail_urls),
         "detail_cache_hits": cache_hits,
+        "detail_fetch": fetch_stats,
+        "detail_stale_refetched": len(stale_details),
         "months": months,
         "archive_key": archive_key,
         "next_month_available": bool(days_next),
-        "wrote_keys": wrote_keys,
-        "skipped_keys": skipped_keys,
+        "wrote_keys": published["wrote_keys"],
+        "skipped_keys": published["skipped_keys"],
+        "manifest_keys": manifest_keys,
     }
@@ -0,0 +1,129 @@
+"""Manifest of the datasets the scrapers publish.
+
+MANIFEST_KEY lists the current S3 ETag and content hash of every published
+object the skill reads:
+
+    {"version": 1, "updated_at": "...",
+     "objects": {"GuestWorlds.csv": {"etag": "\\"...\\"", "sha256": "...",
+                                     "updated_at": "..."}, ...}}
+
+The skill GETs only this object to decide which datasets changed, so it is
+updated after the objects it describes.  Entries come from a HEAD of each
+object rather than from the scraper's own bookkeeping, so an update always
+describes what is really in the bucket, including objects a guard refused
+to overwrite.
+
+Both scrapers update the manifest, possibly at the same time under the
+orchestrator, so each update is a read-modify-write guarded by a
+conditional put and retried when the other writer got there first.
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_KEY = "manifest.json"
+MANIFEST_VERSION = 1
+MAX_ATTEMPTS = 5
+
+# Error codes S3 returns when an If-Match / If-None-Match put loses a race.
+_CONFLICT_CODES = ("PreconditionFailed", "ConditionalRequestConflict", "412", "409")
+
+
+def _describe(s3_client, bucket, key):
+    """Return {"etag", "sha256"} for key from a HEAD, or None if unavailable."""
+    try:
+        response = s3_client.head_object(Bucket=bucket, Key=key)
+    except Exception:
+        return None
+    etag = response.get("ETag")
+    if not isinstance(etag, str):
+        return None
+    metadata = response.get("Metadata")
+    digest = metadata.get("sha256") if isinstance(metadata, dict) else None
+    return {"etag": etag, "sha256": digest if isinstance(digest, str) else None}
+
+
+def _load(s3_client, bucket):
+    """Return (objects, etag) for the stored manifest; ({}, None) if missing.
+
+    A manifest that exists but cannot be parsed is returned as empty with
+    its ETag, so update() replaces it rather than failing every run.
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=MANIFEST_KEY)
+    except Exception:
+        logger.info("No manifest at %s", MANIFEST_KEY)
+        return {}, None
+    etag = response.get("ETag")
+    etag = etag if isinstance(etag, str) else None
+    try:
+        objects = json.loads(response["Body"].read().decode("utf-8"))["objects"]
+    except Exception:
+        objects = None
+    if not isinstance(objects, dict):
+        logger.warning("Replacing unreadable manifest at %s", MANIFEST_KEY)
+        return {}, etag
+    return objects, etag
+
+
+def update(s3_client, bucket, keys, now=None):
+    """Record the current ETag and hash of keys in the manifest.
+
+    Keys that do not exist are left alone.  Returns the keys whose entry
+    changed (empty if the manifest was already current).  Raises
+    RuntimeError if a concurrent writer wins MAX_ATTEMPTS times in a row.
+    """
+    described = {}
+    for key in keys:
+        entry = _describe(s3_client, bucket, key)
+        if entry is not None:
+            described[key] = entry
+    if not described:
+        return []
+
+    stamp = (now or datetime.now(timezone.utc)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    for _ in range(MAX_ATTEMPTS):
+        objects, etag = _load(s3_client, bucket)
+        changed = [
+            key
+            for key, entry in described.items()
+            if {f: (objects.get(key) or {}).get(f) for f in entry} != entry
+        ]
+        if not changed:
+            return []
+        for key in changed:
+            objects[key] = dict(described[key], updated_at=stamp)
+
+        # Only replace the manifest that was read, or create it if none was.
+        condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+        try:
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=MANIFEST_KEY,
+                Body=json.dumps(
+                    {
+                        "version": MANIFEST_VERSION,
+                        "updated_at": stamp,
+                        "objects": objects,
+                    },
+                    sort_keys=True,
+                ),
+                ContentType="application/json",
+                CacheControl="no-cache",
+                **condition,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in _CONFLICT_CODES:
+                raise
+            logger.info("Manifest changed while updating it; retrying")
+            continue
+        logger.info("Updated manifest entries: %s", ", ".join(changed))
+        return changed
+    raise RuntimeError(
+        "Manifest kept changing; gave up after %d attempts" % MAX_ATTEMPTS
+    )
@@ -4,6 +4,7 @@
 #   ./deploy.sh              # deploy to both Lambdas
 #   ./deploy.sh challenge    # deploy to ChallengeRoutesCalendarScraper only
 #   ./deploy.sh guestworld   # deploy to GuestWorldScraper only
+#   ./deploy.sh orchestrator # deploy to ScraperOrchestrator only
 
 set -euo pipefail
 
@@ -34,13 +35,16 @@ case "$TARGET" in
     guestworld)
         deploy_function "GuestWorldScraper"
         ;;
+    orchestrator)
+        deploy_function "ScraperOrchestrator"
+        ;;
     all)
         deploy_function "ChallengeRoutesCalendarScraper"
         deploy_function "GuestWorldScraper"
         ;;
     *)
         echo "Unknown target: $TARGET"
-        echo "Usage: $0 [challenge|guestworld|all]"
+        echo "Usage: $0 [challenge|guestworld|orchestrator|all]"
         exit 1
         ;;
 esac
@@ -0,0 +1,119 @@
+"""Persisted HTTP validators for the scrapers' calendar fetches.
+
+Each scraper keeps a small private JSON object in the bucket mapping every
+calendar URL it fetched to the ETag, Last-Modified and SHA-256 of the body
+it last processed.  The next run sends If-None-Match / If-Modified-Since
+and treats a 304, or a 200 whose body hashes the same, as "unchanged", so
+a frequent schedule costs one round trip per page instead of a parse and
+a set of S3 writes.
+
+Validators for changed pages are only persisted once the caller has
+finished writing its outputs (commit + save), so a failed write is retried
+on the next run rather than being masked as "unchanged".
+"""
+
+import hashlib
+import json
+import logging
+from collections import namedtuple
+
+import http_fetch
+
+logger = logging.getLogger(__name__)
+
+STATE_KEY_TEMPLATE = "scraper-state/%s.json"
+
+# changed: the body differs from the last processed one (or force was set).
+# response: None when the server answered 304 Not Modified.
+FetchResult = namedtuple("FetchResult", ["url", "changed", "response"])
+
+
+def _header(response, name):
+    """Return a response header only if it is a real string value."""
+    value = response.headers.get(name)
+    return value if isinstance(value, str) else None
+
+
+class FetchState:
+    """Validators for one scraper, loaded from and saved to S3."""
+
+    def __init__(self, s3_client, bucket, name):
+        self._s3 = s3_client
+        self._bucket = bucket
+        self.key = STATE_KEY_TEMPLATE % name
+        self._entries = {}
+        self._pending = {}
+        self._dirty = False
+
+    def load(self):
+        """Read persisted validators; a missing or unreadable object is empty."""
+        try:
+            response = self._s3.get_object(Bucket=self._bucket, Key=self.key)
+            entries = json.loads(response["Body"].read().decode("utf-8"))
+            if isinstance(entries, dict):
+                self._entries = entries
+        except Exception:
+            logger.info("No usable fetch state at %s", self.key)
+        return self
+
+    def entry(self, url):
+        """Return the persisted entry for url (validators plus extras), or {}."""
+        return dict(self._entries.get(url) or {})
+
+    def fetch(self, url, timeout=30, force=False):
+        """GET url conditionally and report whether its body changed."""
+        headers = {}
+        known = self._entries.get(url) or {}
+        if not force:
+            if known.get("etag"):
+                headers["If-None-Match"] = known["etag"]
+            if known.get("last_modified"):
+                headers["If-Modified-Since"] = known["last_modified"]
+
+        response = http_fetch.get(url, timeout=timeout, headers=headers or None)
+        if response.status_code == 304:
+            logger.info("Not modified: %s", url)
+            return FetchResult(url, False, None)
+        response.raise_for_status()
+
+        digest = hashlib.sha256(response.content).hexdigest()
+        entry = dict(
+            known,
+            etag=_header(response, "ETag"),
+            last_modified=_header(response, "Last-Modified"),
+            sha256=digest,
+        )
+        if not force and known.get("sha256") == digest:
+            logger.info("Unchanged body: %s", url)
+            # Nothing downstream depends on this page, so refreshed
+            # validators can be kept straight away.
+            self._set(url, entry)
+            return FetchResult(url, False, response)
+
+        self._pending[url] = entry
+        return FetchResult(url, True, response)
+
+    def commit(self, url, **extra):
+        """Keep the validators of a changed page once it has been processed."""
+        entry = self._pending.pop(url, None)
+        if entry is not None:
+            entry.update(extra)
+            self._set(url, entry)
+
+    def save(self):
+        """Write the state object back if anything was committed."""
+        if not self._dirty:
+            return False
+        self._s3.put_object(
+            Bucket=self._bucket,
+            Key=self.key,
+            Body=json.dumps(self._entries, sort_keys=True),
+            ContentType="application/json",
+        )
+        self._dirty = False
+        return True
+
+    def _set(self, url, entry):
+        if self._entries.get(url) != entry:
+            self._entries[url] = entry
+            self._dirty = True
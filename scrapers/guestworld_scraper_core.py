@@ -3,7 +3,7 @@
 Pure functions — no AWS or network calls.
 """
 
-from bs4 import BeautifulSoup
+from html_backend import find_table_by_class
 
 
 def parse_calendar_html(html_content):
@@ -16,16 +16,15 @@ def parse_calendar_html(html_content):
         Sorted list of (int, list[str]) tuples, one per calendar day that
         contains at least one world name.
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-    table = soup.find("table", class_=lambda c: c and "calendar-table" in c)
+    table = find_table_by_class(html_content, "calendar-table")
     if table is None:
         return []
 
-    cells = table.find_all("td", class_=lambda c: c and "day-with-date" in c)
+    cells = table.find_all("td", class_="day-with-date")
 
     days = []
     for cell in cells:
-        day_span = cell.find("span", class_=lambda c: c and "day-number" in c)
+        day_span = cell.find("span", class_="day-number")
         world_spans = cell.find_all("span", class_="spiffy-title")
         if day_span and world_spans:
             day_num = int(day_span.get_text())
@@ -51,3 +50,49 @@ def format_csv(days):
     for i, (_, worlds) in enumerate(days, start=1):
         lines.append(" and ".join(worlds) + "," + str(i))
     return "\n".join(lines) + "\n" if lines else ""
+
+
+def parse_csv(csv_content):
+    """Parse CSV written by format_csv() into {day_number: "World1 and World2"}.
+
+    Blank or malformed lines are ignored.
+    """
+    rotations = {}
+    for line in (csv_content or "").splitlines():
+        worlds, _, day = line.rpartition(",")
+        if worlds and day.strip().isdigit():
+            rotations[int(day)] = worlds
+    return rotations
+
+
+def diff_calendars(old_csv, new_csv):
+    """Compare two calendar CSVs day by day.
+
+    Args:
+        old_csv: the previously published CSV, or None if there was none.
+        new_csv: the CSV about to be published.
+
+    Returns:
+        Dict with "new_month" (no previous CSV), "added_days",
+        "removed_days", "changed_days" (list of {"day", "before", "after"})
+        and "changed" (True if any of those is non-empty).
+    """
+    old = parse_csv(old_csv) if old_csv is not None else {}
+    new = parse_csv(new_csv)
+    diff = {
+        "new_month": old_csv is None,
+        "added_days": sorted(set(new) - set(old)),
+        "removed_days": sorted(set(old) - set(new)),
+        "changed_days": [
+            {"day": day, "before": old[day], "after": new[day]}
+            for day in sorted(set(old) & set(new))
+            if old[day] != new[day]
+        ],
+    }
+    diff["changed"] = bool(
+        diff["new_month"]
+        or diff["added_days"]
+        or diff["removed_days"]
+        or diff["changed_days"]
+    )
+    return diff
@@ -1,24 +1,41 @@
 """AWS Lambda handler for the guest world scraper.
 
 Reads the schedule URL from SSM, scrapes the calendar, and writes
-GuestWorlds.csv (+ monthly archives) to S3.
+GuestWorlds.csv (+ monthly archives) to S3.  An event such as
+{"backfill": {"from": "2025-01", "to": "2025-06"}} instead rebuilds the
+monthly archives for that range.
 
 Lambda config: handler = guestworld_scraper_handler.lambda_handler
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import hashlib
+import json
 import logging
+import re
+import threading
+import time
 
 import boto3
-import requests
 
-from guestworld_scraper_core import parse_calendar_html, format_csv
+import dataset_manifest
+import http_fetch
+import s3_publish
+import ssm_params
+from fetch_state import FetchState
+from phase_timer import PhaseTimer
+from guestworld_scraper_core import diff_calendars, format_csv, parse_calendar_html
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 S3_BUCKET = "guestworldskill"
 
+# Per-day differences from the last published calendar, rewritten on every
+# run that changes something so consumers can skip reloading otherwise.
+CHANGE_LOG_KEY = "GuestWorldsChanges.json"
+
 # Abbreviated month names for calendar URL query params
 _MONTH_ABBRS = {
     1: "jan",
@@ -35,11 +52,266 @@ _MONTH_ABBRS = {
     12: "dec",
 }
 
+# Backfill fetches archive pages in parallel, but politely: at most
+# _BACKFILL_MAX_WORKERS in flight and request starts spaced by the delay.
+_BACKFILL_MAX_WORKERS = 4
+_BACKFILL_DELAY_SECONDS = 1.0
+_BACKFILL_MAX_MONTHS = 36
+_MONTH_PATTERN = re.compile(r"^(\d{4})-(\d{2})$")
+
+
+def _calendar_csv_write(s3_client, key, csv_content, day_count, month, after=None):
+    """Return an s3_publish.Write for a calendar CSV, guarded against regressions.
+
+    Each object carries its content hash, day count and calendar month
+    (YYYYMM) in user metadata, so the guard only needs a HEAD request.  It
+    refuses content identical to the existing object, and fewer days than
+    the existing object for the same month (a bad scrape).
+    """
+    digest = hashlib.sha256(csv_content.encode("utf-8")).hexdigest()
+
+    def check():
+        try:
+            existing = s3_client.head_object(Bucket=S3_BUCKET, Key=key).get(
+                "Metadata"
+            )
+        except Exception:
+            # No existing object (or no access to it) is treated as safe to write.
+            return True
+        if not isinstance(existing, dict):
+            return True
+        if existing.get("sha256") == digest:
+            logger.info("Skipping write to %s; content is unchanged", key)
+            return False
+        existing_days = existing.get("days")
+        if (
+            existing.get("month") == month
+            and isinstance(existing_days, str)
+            and existing_days.isdigit()
+            and day_count < int(existing_days)
+        ):
+            logger.warning(
+                "Skipping write to %s because new data has %d days, existing has %s",
+                key,
+                day_count,
+                existing_days,
+            )
+            return False
+        return True
+
+    def put():
+        s3_client.put_object(
+            Bucket=S3_BUCKET,
+            Key=key,
+            Body=csv_content,
+            ACL="public-read",
+            Metadata={"sha256": digest, "days": str(day_count), "month": month},
+        )
+
+    return s3_publish.Write(key, check, put, after)
+
+
+def _safe_write_calendar_csv(s3_client, key, csv_content, day_count, month):
+    """Write a calendar CSV unless its guard refuses; True if it was written."""
+    write = _calendar_csv_write(s3_client, key, csv_content, day_count, month)
+    if not write.check():
+        return False
+    write.put()
+    return True
+
+
+def _read_published_csv(s3_client, archive_key, month):
+    """Return the published CSV for month (YYYYMM), or None if there is none.
+
+    The month's archive is preferred; GuestWorlds.csv is used only if its
+    metadata says it holds the same month.
+    """
+    for key in (archive_key, "GuestWorlds.csv"):
+        try:
+            response = s3_client.get_object(Bucket=S3_BUCKET, Key=key)
+        except Exception:
+            continue
+        if key == archive_key or response.get("Metadata", {}).get("month") == month:
+            return response["Body"].read().decode("utf-8")
+    return None
+
+
+def _write_change_log(s3_client, changes, now):
+    """Publish CHANGE_LOG_KEY describing the months that changed this run."""
+    body = {"generated_at": now.strftime("%Y-%m-%dT%H:%M:%SZ"), "months": changes}
+    s3_client.put_object(
+        Bucket=S3_BUCKET,
+        Key=CHANGE_LOG_KEY,
+        Body=json.dumps(body, ensure_ascii=False),
+        ContentType="application/json",
+        ACL="public-read",
+    )
+
+
+def _fetch_calendar_days(state, url, force, timer, label):
+    """Fetch one calendar page and parse it if it changed since the last run.
+
+    Returns (changed, days); days is None when the page is unchanged.  The
+    fetch and parse are timed as "fetch.<label>" and "parse.<label>".
+    """
+    with timer.phase("fetch." + label):
+        result = state.fetch(url, timeout=30, force=force)
+    if not result.changed:
+        return False, None
+    with timer.phase("parse." + label):
+        return True, parse_calendar_html(result.response.content)
+
+
+def _parse_month(value):
+    """Return (year, month) for a "YYYY-MM" string, or raise ValueError."""
+    match = _MONTH_PATTERN.match(str(value or ""))
+    if not match or not 1 <= int(match.group(2)) <= 12:
+        raise ValueError("Expected a YYYY-MM month, got %r" % (value,))
+    return int(match.group(1)), int(match.group(2))
+
+
+def _month_range(start, end):
+    """Return every (year, month) from start to end inclusive."""
+    months = []
+    year, month = start
+    while (year, month) <= end:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _backfill(s3, base_url, options):
+    """Fetch, parse and archive every month in options["from"]..options["to"].
+
+    Only the monthly archives are written; GuestWorlds.csv is left alone.
+    Returns one outcome per month, in calendar order.
+    """
+    start = _parse_month(options.get("from"))
+    end = _parse_month(options.get("to") or options.get("from"))
+    if end < start:
+        raise ValueError("Backfill range ends before it starts")
+    months = _month_range(start, end)
+    if len(months) > _BACKFILL_MAX_MONTHS:
+        raise ValueError(
+            "Backfill range has %d months; the limit is %d"
+            % (len(months), _BACKFILL_MAX_MONTHS)
+        )
+
+    workers = max(1, min(int(options.get("max_workers", 2)), _BACKFILL_MAX_WORKERS))
+    delay = max(float(options.get("delay_seconds", 0)), _BACKFILL_DELAY_SECONDS)
+    slot_lock = threading.Lock()
+    next_start = [time.monotonic()]
+
+    def wait_for_slot():
+        # Space request starts by `delay` across all workers.
+        with slot_lock:
+            now = time.monotonic()
+            start_at = max(now, next_start[0])
+            next_start[0] = start_at + delay
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def backfill_month(year, month):
+        suffix = "%04d%02d" % (year, month)
+        outcome = {
+            "month": "%04d-%02d" % (year, month),
+            "key": "GuestWorlds%s.csv" % suffix,
+        }
+        url = "%s?month=%s&yr=%d" % (base_url, _MONTH_ABBRS[month], year)
+        try:
+            wait_for_slot()
+            logger.info("Backfilling %s from %s", outcome["month"], url)
+            page = http_fetch.get(url, timeout=30)
+            page.raise_for_status()
+            days = parse_calendar_html(page.content)
+            outcome["days"] = len(days)
+            if not days:
+                outcome["status"] = "empty"
+            elif _safe_write_calendar_csv(
+                s3, outcome["key"], format_csv(days), len(days), suffix
+            ):
+                outcome["status"] = "written"
+            else:
+                outcome["status"] = "skipped"
+        except Exception as e:
+            logger.warning("Backfill of %s failed", outcome["month"], exc_info=True)
+            outcome["status"] = "failed"
+            outcome["error"] = "%s: %s" % (type(e).__name__, e)
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as pool:
+        outcomes = list(pool.map(lambda ym: backfill_month(*ym), months))
+
+    logger.info(
+        "Backfilled %d months: %s",
+        len(outcomes),
+        ", ".join("%s=%s" % (o["month"], o["status"]) for o in outcomes),
+    )
+    return outcomes
+
 
 def lambda_handler(event, context):
-    # Read scraper URL from SSM
+    s3 = boto3.client("s3")
     ssm = boto3.client("ssm", region_name="us-east-1")
-    base_url = ssm.get_parameter(Name="/guestworld/scraper-url")["Parameter"]["Value"]
+    return scrape(event, s3, ssm)
+
+
+def scrape(event, s3, ssm):
+    """Run the guest world pipeline with the given S3 and SSM clients.
+
+    The summary includes per-phase "timings", which are also emitted as one
+    CloudWatch EMF line whether or not the run succeeds.
+    """
+    timer = PhaseTimer("guestworld")
+    status = "error"
+    try:
+        with timer.phase("total"):
+            result = _scrape(event, s3, ssm, timer)
+        status = "ok"
+    finally:
+        timer.emit(Status=status)
+    result["timings"] = timer.as_dict()
+    return result
+
+
+def _load_fetch_state(s3, timer):
+    """Load the stored calendar validators, timed as "state_load"."""
+    with timer.phase("state_load"):
+        return FetchState(s3, S3_BUCKET, "guestworld").load()
+
+
+def _scrape(event, s3, ssm, timer):
+    # {"backfill": {"from": "YYYY-MM", "to": "YYYY-MM"}} rebuilds archives
+    # for a range of months instead of the usual current/next scrape.
+    backfill = (event or {}).get("backfill")
+
+    with ThreadPoolExecutor(max_workers=1) as state_pool:
+        # The usual scrape needs the stored validators; load them while
+        # SSM answers rather than after.
+        state_future = (
+            None if backfill else state_pool.submit(_load_fetch_state, s3, timer)
+        )
+        # Read scraper URL from SSM
+        with timer.phase("ssm"):
+            base_url = ssm_params.get_parameter(ssm, "/guestworld/scraper-url")
+
+    if backfill:
+        with timer.phase("backfill"):
+            outcomes = _backfill(s3, base_url, backfill)
+        with timer.phase("manifest"):
+            manifest_keys = dataset_manifest.update(
+                s3,
+                S3_BUCKET,
+                [o["key"] for o in outcomes if o["status"] in ("written", "skipped")],
+            )
+        return {
+            "statusCode": 200,
+            "backfill": True,
+            "months": outcomes,
+            "wrote_keys": [o["key"] for o in outcomes if o["status"] == "written"],
+            "failed_months": [o["month"] for o in outcomes if o["status"] == "failed"],
+            "manifest_keys": manifest_keys,
+        }
 
     now = datetime.utcnow()
     current_month = now.month
@@ -53,57 +325,154 @@ def lambda_handler(event, context):
         next_month = current_month + 1
         next_year = current_year
 
-    # Fetch and parse current month (default page)
-    page = requests.get(base_url, timeout=30)
-    page.raise_for_status()
-    days_current = parse_calendar_html(page.content)
-    if not days_current:
-        raise ValueError("No calendar data found on the schedule page")
-
-    csv_current = format_csv(days_current)
-
-    # Try to fetch next month. If unavailable, continue with current month only.
-    days_next = []
     next_month_url = "%s?month=%s&yr=%d" % (
         base_url,
         _MONTH_ABBRS[next_month],
         next_year,
     )
-    try:
+
+    # {"force": true} ignores stored validators and rewrites everything.
+    force = bool((event or {}).get("force"))
+    state = state_future.result()
+
+    # Fetch both months at once; wall time is the slower of the two pages.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        current_future = pool.submit(
+            _fetch_calendar_days, state, base_url, force, timer, "current"
+        )
         logger.info("Fetching next month calendar: %s", _MONTH_ABBRS[next_month])
-        page_next = requests.get(next_month_url, timeout=30)
-        page_next.raise_for_status()
-        days_next = parse_calendar_html(page_next.content)
-    except Exception:
-        logger.warning("Unable to fetch next month calendar", exc_info=True)
-        days_next = []
-
-    # Calculate archive key — named for the current month being scraped
+        next_future = pool.submit(
+            _fetch_calendar_days, state, next_month_url, force, timer, "next"
+        )
+
+        current_changed, days_current = current_future.result()
+        if current_changed and not days_current:
+            raise ValueError("No calendar data found on the schedule page")
+
+        # Next month is best effort: continue with current month only.
+        try:
+            next_changed, days_next = next_future.result()
+        except Exception:
+            logger.warning("Unable to fetch next month calendar", exc_info=True)
+            next_changed, days_next = False, []
+
+    # Calculate archive keys — named for the month being scraped
     current_archive_suffix = "%04d%02d" % (current_year, current_month)
     current_archive_key = f"GuestWorlds{current_archive_suffix}.csv"
+    next_archive_suffix = "%04d%02d" % (next_year, next_month)
 
-    # Write to S3
-    s3 = boto3.client("s3")
-    s3.put_object(
-        Bucket=S3_BUCKET, Key="GuestWorlds.csv", Body=csv_current, ACL="public-read"
-    )
-    s3.put_object(
-        Bucket=S3_BUCKET, Key=current_archive_key, Body=csv_current, ACL="public-read"
-    )
+    # Publish to S3, skipping pages that have not changed since the last
+    # run.  GuestWorlds.csv is only replaced once its archive is written.
+    writes = []
+    new_csvs = {}  # archive key -> (YYYYMM, csv) for the change log
+    if current_changed:
+        current_csv = format_csv(days_current)
+        new_csvs[current_archive_key] = (current_archive_suffix, current_csv)
+        writes.append(
+            _calendar_csv_write(
+                s3,
+                current_archive_key,
+                current_csv,
+                len(days_current),
+                current_archive_suffix,
+            )
+        )
+        writes.append(
+            _calendar_csv_write(
+                s3,
+                "GuestWorlds.csv",
+                current_csv,
+                len(days_current),
+                current_archive_suffix,
+                after=current_archive_key,
+            )
+        )
+        days_scraped = len(days_current)
+    else:
+        days_scraped = state.entry(base_url).get("days")
 
-    next_archive_key = None
-    if days_next:
-        csv_next = format_csv(days_next)
-        next_archive_suffix = "%04d%02d" % (next_year, next_month)
-        next_archive_key = f"GuestWorlds{next_archive_suffix}.csv"
-        s3.put_object(
-            Bucket=S3_BUCKET, Key=next_archive_key, Body=csv_next, ACL="public-read"
+    if next_changed and days_next:
+        next_csv = format_csv(days_next)
+        new_csvs[f"GuestWorlds{next_archive_suffix}.csv"] = (
+            next_archive_suffix,
+            next_csv,
+        )
+        writes.append(
+            _calendar_csv_write(
+                s3,
+                f"GuestWorlds{next_archive_suffix}.csv",
+                next_csv,
+                len(days_next),
+                next_archive_suffix,
+            )
         )
 
+    # Diff against what is published now, before it is overwritten.
+    diffs = {}
+    with timer.phase("diff"):
+        for key, (month, csv_content) in new_csvs.items():
+            diff = diff_calendars(_read_published_csv(s3, key, month), csv_content)
+            if diff["changed"]:
+                diffs[key] = ("%s-%s" % (month[:4], month[4:]), diff)
+
+    with timer.phase("s3_publish"):
+        published = s3_publish.publish(writes)
+    if published["failed_keys"]:
+        # Leave the fetch state alone so the next run retries these pages.
+        raise RuntimeError("Failed to publish %s" % ", ".join(published["failed_keys"]))
+
+    # Only report months whose archive was actually written; a guard that
+    # refused the new data leaves the published calendar unchanged.
+    changes = dict(diffs[key] for key in published["wrote_keys"] if key in diffs)
+    if changes:
+        # Written after the calendars, so a consumer that sees it also sees
+        # the new data.
+        with timer.phase("s3_publish"):
+            _write_change_log(s3, changes, now)
+
+    # The manifest goes last.  Failing here leaves the fetch state
+    # uncommitted, so the next run republishes and retries it.
+    manifest_keys = []
+    if writes:
+        with timer.phase("manifest"):
+            manifest_keys = dataset_manifest.update(
+                s3,
+                S3_BUCKET,
+                [
+                    current_archive_key,
+                    "GuestWorlds.csv",
+                    f"GuestWorlds{next_archive_suffix}.csv",
+                ],
+            )
+
+    if current_changed:
+        state.commit(base_url, days=len(days_current))
+    if next_changed:
+        state.commit(next_month_url, days=len(days_next))
+        next_days = len(days_next)
+    elif days_next is None:
+        next_days = state.entry(next_month_url).get("days") or 0
+    else:
+        next_days = 0
+
+    next_archive_key = f"GuestWorlds{next_archive_suffix}.csv" if next_days else None
+    with timer.phase("state_save"):
+        state.save()
+
+    unchanged = not current_changed and not next_changed
+    if unchanged:
+        logger.info("Schedule pages unchanged; skipped parsing and S3 writes")
+
     return {
         "statusCode": 200,
-        "days_scraped": len(days_current),
+        "unchanged": unchanged,
+        "days_scraped": days_scraped,
         "archive_key": current_archive_key,
-        "next_month_available": bool(days_next),
+        "next_month_available": bool(next_days),
         "next_archive_key": next_archive_key,
+        "wrote_keys": published["wrote_keys"],
+        "skipped_keys": published["skipped_keys"],
+        "changes": changes,
+        "change_log_key": CHANGE_LOG_KEY if changes else None,
+        "manifest_keys": manifest_keys,
     }
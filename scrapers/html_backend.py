@@ -0,0 +1,129 @@
+"""HTML parser backend shared by the scraper cores.
+
+The cores are written against the BeautifulSoup API; this module decides
+which tree builder sits underneath it.  lxml's C parser builds the same
+tree several times faster than the pure-Python "html.parser", so it is
+used whenever it is importable.  Set SCRAPER_HTML_PARSER to force a
+backend (for example to compare output, or if a deployment package was
+built without a matching lxml wheel).
+
+find_table_by_class() builds a tree for just one table, so parse time and
+memory follow the size of the calendar rather than the whole page.
+
+Pure functions — no AWS or network calls.
+"""
+
+import logging
+import os
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+
+logger = logging.getLogger(__name__)
+
+# Fastest first.  "html.parser" ships with Python and is always available.
+PREFERRED_BACKENDS = ("lxml", "html.parser")
+
+
+def available_backends():
+    """Return the backends from PREFERRED_BACKENDS that can be used here."""
+    backends = []
+    for name in PREFERRED_BACKENDS:
+        if name == "lxml":
+            try:
+                import lxml.etree  # noqa: F401
+            except ImportError:
+                continue
+        backends.append(name)
+    return backends
+
+
+def select_backend(requested=None):
+    """Pick the backend to use: requested, else $SCRAPER_HTML_PARSER, else fastest."""
+    requested = requested or os.environ.get("SCRAPER_HTML_PARSER")
+    available = available_backends()
+    if requested:
+        if requested in available:
+            return requested
+        logger.warning(
+            "HTML parser backend %r is not available; using %s",
+            requested,
+            available[0],
+        )
+    return available[0]
+
+
+BACKEND = select_backend()
+
+
+def make_soup(html_content, parse_only=None, backend=None):
+    """Parse HTML with the selected backend and return a BeautifulSoup tree."""
+    return BeautifulSoup(html_content, backend or BACKEND, parse_only=parse_only)
+
+
+_TABLE_TAG = re.compile(r"<(/?)table\b", re.IGNORECASE)
+# Spans no parser turns into elements: comments, scripts and styles.
+_NON_ELEMENT_BLOCKS = re.compile(
+    r"<!--.*?-->|<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+
+
+def _blank_non_elements(markup):
+    """Replace comments, scripts and styles with spaces, keeping offsets."""
+    return _NON_ELEMENT_BLOCKS.sub(lambda m: " " * len(m.group(0)), markup)
+
+
+def _table_start_pattern(css_class):
+    # A real <table ... class="... css_class ..."> start tag.  The attribute
+    # value must open with a quote, so escaped JavaScript strings such as
+    # "<table class=\"calendar-table\">" inside a <script> do not match.
+    return re.compile(
+        r"<table\b[^>]*?\bclass\s*=\s*([\"'])[^\"'>]*?(?<![\w-])%s(?![\w-])"
+        % re.escape(css_class),
+        re.IGNORECASE,
+    )
+
+
+def _table_region(markup, css_class):
+    """Return the source text of the first table with css_class, or None.
+
+    Tables inside comments, scripts or styles are not elements, so the
+    search runs over a copy with those spans blanked out.
+    """
+    scan = _blank_non_elements(markup)
+    start = _table_start_pattern(css_class).search(scan)
+    if start is None:
+        return None
+    depth = 0
+    for tag in _TABLE_TAG.finditer(scan, start.start()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            end = scan.find(">", tag.end())
+            if end == -1:
+                return None
+            return markup[start.start() : end + 1]
+    return None
+
+
+def find_table_by_class(html_content, css_class):
+    """Parse only the first <table> carrying css_class and return it, or None.
+
+    A text pre-scan cuts the table out of the page before any tree is
+    built.  If the markup is too unusual for the pre-scan, the whole page
+    is parsed with a SoupStrainer that keeps only matching tables.
+    """
+    if isinstance(html_content, bytes):
+        markup = UnicodeDammit(html_content, is_html=True).unicode_markup
+    else:
+        markup = html_content
+    if markup is None:
+        markup = html_content
+
+    region = _table_region(markup, css_class) if isinstance(markup, str) else None
+    if region is not None:
+        table = make_soup(region).find("table", class_=css_class)
+        if table is not None:
+            return table
+
+    strainer = SoupStrainer("table", class_=css_class)
+    return make_soup(markup, parse_only=strainer).find("table", class_=css_class)
@@ -0,0 +1,269 @@
+"""Shared HTTP client for the scrapers.
+
+Every calendar and route detail fetch goes through one pooled
+requests.Session kept at module level, so a warm Lambda container reuses
+its TCP/TLS connections across pages and across invocations.  Connection
+errors and 5xx responses are retried with jittered exponential backoff
+before the caller sees an error.
+
+Requests are also paced per upstream host by a HostLimiter: a token bucket
+caps the request rate and an adaptive limit caps requests in flight.  Both
+grow while the host answers quickly and halve when it answers 429 or 503,
+and a Retry-After header pauses the host until then.  Concurrent callers
+(route details, backfill) can therefore go as fast as the host allows
+without each needing its own politeness delay.
+"""
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 30
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (500, 502, 504)
+# Enough pooled connections for the challenge scraper's detail workers.
+POOL_MAXSIZE = 10
+
+# Per-host pacing (see HostLimiter).  429 and 503 are retried by get()
+# rather than urllib3, so the limiter sees every throttled attempt.
+THROTTLE_STATUSES = (429, 503)
+RATE_INITIAL = 5.0  # requests per second
+RATE_MIN = 0.5
+RATE_MAX = 50.0
+RATE_STEP = 0.5  # added per healthy response
+BURST = 10  # tokens an idle host accumulates
+CONCURRENCY_INITIAL = 3
+CONCURRENCY_MAX = POOL_MAXSIZE
+LATENCY_TARGET = 2.0  # seconds; faster responses count as healthy
+MAX_RETRY_AFTER = 30  # longer Retry-After values are returned to the caller
+
+_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": "guestworld-scraper",
+}
+
+_session = None
+_session_lock = threading.Lock()
+_limiters = {}
+
+
+class _JitteredRetry(Retry):
+    """Retry whose backoff is drawn uniformly from [0, exponential delay].
+
+    Full jitter keeps the scrapers' parallel requests from retrying in
+    lockstep against a struggling server.
+    """
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+
+class HostLimiter:
+    """Token bucket plus an adaptive in-flight limit for one upstream host.
+
+    Each request takes a token (refilled at ``rate`` per second, up to
+    BURST) and one of ``limit`` request slots.  A healthy response raises
+    the rate by RATE_STEP and the limit by 1/limit (about one slot per
+    round of requests); a slow or failed one shrinks the limit a little;
+    a throttled one halves both and honours Retry-After.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.rate = RATE_INITIAL
+        self.limit = float(CONCURRENCY_INITIAL)
+        self.in_flight = 0
+        self._tokens = float(BURST)
+        self._clock = clock
+        self._refilled_at = clock()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        elapsed = now - self._refilled_at
+        self._tokens = min(float(BURST), self._tokens + elapsed * self.rate)
+        self._refilled_at = now
+
+    def acquire(self, timeout):
+        """Take a token and a slot; False if that takes longer than timeout."""
+        deadline = self._clock() + timeout
+        with self._cond:
+            while True:
+                now = self._clock()
+                self._refill(now)
+                if (
+                    now >= self._paused_until
+                    and self.in_flight < int(self.limit)
+                    and self._tokens >= 1
+                ):
+                    self._tokens -= 1
+                    self.in_flight += 1
+                    return True
+                if now >= deadline:
+                    return False
+                # A freed slot wakes us via release(); pauses and empty
+                # buckets only clear with time.
+                wait = deadline - now
+                if now < self._paused_until:
+                    wait = min(wait, self._paused_until - now)
+                elif self._tokens < 1:
+                    wait = min(wait, (1 - self._tokens) / self.rate)
+                self._cond.wait(wait)
+
+    def release(self, status, seconds, retry_after=None):
+        """Free a slot and adapt to the response (status None: no response).
+
+        Only fast responses below 500 count as healthy: a host failing
+        quickly must not make the scrapers speed up.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if status in THROTTLE_STATUSES:
+                self.rate = max(RATE_MIN, self.rate / 2)
+                self.limit = max(1.0, self.limit / 2)
+                if retry_after:
+                    self._paused_until = max(
+                        self._paused_until, self._clock() + retry_after
+                    )
+            elif status is not None and status < 500 and seconds < LATENCY_TARGET:
+                self.rate = min(RATE_MAX, self.rate + RATE_STEP)
+                self.limit = min(float(CONCURRENCY_MAX), self.limit + 1 / self.limit)
+            else:
+                self.limit = max(1.0, self.limit * 0.9)
+            self._cond.notify_all()
+
+
+def _limiter_for(url):
+    """Return the HostLimiter shared by every request to url's host."""
+    host = urlsplit(url).netloc
+    with _session_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = HostLimiter()
+        return limiter
+
+
+def _retry_after_seconds(response):
+    """Parse a Retry-After header (seconds or HTTP date); None if absent."""
+    value = response.headers.get("Retry-After")
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _build_session():
+    """Create a Session with keep-alive pooling, retries and gzip."""
+    retry = _JitteredRetry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=RETRY_TOTAL,
+        status=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        # Hand the final 5xx back to the caller's raise_for_status().
+        raise_on_status=False,
+        # Otherwise urllib3 retries any 429/503 carrying Retry-After itself,
+        # sleeping out the header inside the adapter; get() handles those.
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=POOL_MAXSIZE, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(_HEADERS)
+    return session
+
+
+def get_session():
+    """Return the process-wide Session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def reset_session():
+    """Close and drop the shared Session and host limiters (tests, or after fork)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _limiters.clear()
+
+
+def get(url, timeout=DEFAULT_TIMEOUT, headers=None):
+    """GET url through the shared Session and return the Response.
+
+    Like requests.get, the caller decides whether to raise_for_status().
+    timeout is one budget for the whole call: waiting for the host's
+    limiter, each attempt and any retry delay all come out of it, and
+    requests.exceptions.Timeout is raised if no slot frees up in time.
+    429 and 503 responses are retried up to RETRY_TOTAL times, after
+    Retry-After if the host sent one; a Retry-After over MAX_RETRY_AFTER,
+    or past the budget, returns the response as is.
+
+    Connection errors and 500/502/504 are retried inside urllib3 within a
+    single limiter slot, so those retries are not paced by the limiter.
+    """
+    limiter = _limiter_for(url)
+    deadline = time.monotonic() + timeout
+    for attempt in range(RETRY_TOTAL + 1):
+        if not limiter.acquire(max(0.0, deadline - time.monotonic())):
+            raise requests.exceptions.Timeout(
+                "No request slot for %s within %s seconds" % (url, timeout)
+            )
+        started = time.monotonic()
+        remaining = max(deadline - started, 0.001)
+        status = retry_after = None
+        try:
+            response = get_session().get(url, timeout=remaining, headers=headers)
+            status = response.status_code
+            if status in THROTTLE_STATUSES:
+                retry_after = _retry_after_seconds(response)
+        finally:
+            limiter.release(status, time.monotonic() - started, retry_after)
+
+        if status not in THROTTLE_STATUSES or attempt == RETRY_TOTAL:
+            return response
+        if retry_after is None:
+            delay = random.uniform(0, RETRY_BACKOFF_FACTOR * 2**attempt)
+        else:
+            delay = retry_after
+        if delay > MAX_RETRY_AFTER or time.monotonic() + delay >= deadline:
+            logger.warning(
+                "HTTP %d from %s; retry in %.1fs would exceed the time allowed",
+                status,
+                url,
+                delay,
+            )
+            return response
+        logger.info("HTTP %d from %s; retrying in %.2fs", status, url, delay)
+        if retry_after is None:
+            # A Retry-After pauses the whole host in the limiter instead.
+            time.sleep(delay)
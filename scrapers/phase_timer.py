@@ -0,0 +1,79 @@
+"""Per-phase wall-clock timings for the scraper pipelines.
+
+Each pipeline run times its phases (SSM, page fetches, parses, cache
+loads, detail fetches, S3 publication) with one PhaseTimer.  The timings
+are returned in the run summary and emitted once as a CloudWatch Embedded
+Metric Format (EMF) line, which CloudWatch Logs turns into metrics under
+METRIC_NAMESPACE with a Pipeline dimension.
+
+Phases that run concurrently overlap, so they can add up to more than the
+"total" phase.
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+METRIC_NAMESPACE = "GuestWorld/Scrapers"
+
+
+class PhaseTimer:
+    """Accumulates seconds per named phase; safe to use from worker threads."""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self._seconds = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        """Add seconds to phase name (a phase may be timed more than once)."""
+        with self._lock:
+            self._seconds[name] = self._seconds.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as phase name, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def as_dict(self):
+        """Return {phase: seconds} rounded to milliseconds, in first-seen order."""
+        with self._lock:
+            return {name: round(s, 3) for name, s in self._seconds.items()}
+
+    def emf_record(self, **properties):
+        """Return the EMF document for these timings plus extra properties."""
+        timings = self.as_dict()
+        record = {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": METRIC_NAMESPACE,
+                        "Dimensions": [["Pipeline"]],
+                        "Metrics": [
+                            {"Name": name, "Unit": "Seconds"} for name in timings
+                        ],
+                    }
+                ],
+            },
+            "Pipeline": self.pipeline,
+        }
+        record.update(properties)
+        record.update(timings)
+        return record
+
+    def emit(self, stream=None, **properties):
+        """Write the EMF document as one line on stdout.
+
+        EMF must be a bare JSON line, so this bypasses the logging module,
+        whose Lambda formatter prefixes each line with level and request id.
+        """
+        stream = stream or sys.stdout
+        stream.write(json.dumps(self.emf_record(**properties)) + "\n")
+        stream.flush()
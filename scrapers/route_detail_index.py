@@ -0,0 +1,116 @@
+"""Persisted route/climb detail index for the challenge scraper.
+
+Route and climb detail pages (distance and elevation) almost never change,
+so every detail the scraper has parsed is kept in one small private JSON
+object in the bucket, keyed by normalized challenge name and by detail URL.
+A run reads that single object instead of re-parsing the published
+challenge JSON files, and only fetches detail pages that are missing or
+whose entry is older than the TTL.
+
+The index is keyed by route, not by month, so it stays the size of the
+game's route list however many months the scraper has run.
+"""
+
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "scraper-state/route-details.json"
+INDEX_VERSION = 1
+
+# Entries older than this are refetched; the stored detail is still used
+# if the refetch fails.
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+
+
+def normalize_name(name):
+    """Normalize route/climb names for index lookups."""
+    return " ".join((name or "").strip().casefold().split())
+
+
+class RouteDetailIndex:
+    """Name- and URL-keyed route details, loaded from and saved to S3."""
+
+    def __init__(self, s3_client, bucket, ttl_seconds=DEFAULT_TTL_SECONDS, clock=None):
+        self._s3 = s3_client
+        self._bucket = bucket
+        self._ttl = ttl_seconds
+        self._clock = clock or time.time
+        self._by_name = {}
+        self._by_url = {}
+        self._dirty = False
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def load(self):
+        """Read the index object; a missing or unreadable object leaves it empty."""
+        try:
+            response = self._s3.get_object(Bucket=self._bucket, Key=INDEX_KEY)
+            payload = json.loads(response["Body"].read().decode("utf-8"))
+        except Exception:
+            logger.info("No usable route detail index at %s", INDEX_KEY)
+            return self
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION:
+            logger.info("Ignoring route detail index with unknown version")
+            return self
+        by_name = payload.get("by_name")
+        by_url = payload.get("by_url")
+        if isinstance(by_name, dict) and isinstance(by_url, dict):
+            self._by_name = by_name
+            self._by_url = by_url
+            self.loaded = True
+        return self
+
+    def seed(self, details_by_name):
+        """Add name-keyed details (no URL known), stamped as fetched now."""
+        fetched_at = int(self._clock())
+        for name_key, detail in details_by_name.items():
+            if name_key and detail and name_key not in self._by_name:
+                self._by_name[name_key] = {
+                    "detail": dict(detail),
+                    "url": None,
+                    "fetched_at": fetched_at,
+                }
+                self._dirty = True
+
+    def lookup(self, url, name):
+        """Return (detail, fresh) for a detail URL or name, or (None, False)."""
+        name_key = self._by_url.get(url) or normalize_name(name)
+        entry = self._by_name.get(name_key)
+        if not isinstance(entry, dict) or not entry.get("detail"):
+            return None, False
+        age = self._clock() - (entry.get("fetched_at") or 0)
+        return dict(entry["detail"]), age < self._ttl
+
+    def record(self, url, name, detail):
+        """Store a freshly fetched detail under its name and URL."""
+        name_key = normalize_name(name) or url
+        self._by_name[name_key] = {
+            "detail": dict(detail),
+            "url": url,
+            "fetched_at": int(self._clock()),
+        }
+        self._by_url[url] = name_key
+        self._dirty = True
+
+    def save(self):
+        """Write the index back if anything was added or refreshed."""
+        if not self._dirty:
+            return False
+        payload = {
+            "version": INDEX_VERSION,
+            "by_name": self._by_name,
+            "by_url": self._by_url,
+        }
+        self._s3.put_object(
+            Bucket=self._bucket,
+            Key=INDEX_KEY,
+            Body=json.dumps(payload, sort_keys=True, ensure_ascii=False),
+            ContentType="application/json",
+        )
+        self._dirty = False
+        return True
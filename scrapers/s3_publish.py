@@ -0,0 +1,78 @@
+"""Concurrent publication of scraper outputs to S3.
+
+Each output is a Write: a guard check (typically a HEAD or GET of the
+existing object, returning False to skip) and the put itself.  publish()
+runs every guard read and every put on a small thread pool, so a run pays
+for roughly one S3 round trip per stage instead of one per object.
+
+A Write may name another key in ``after``; its put then waits for that
+write to finish, and is abandoned if that write failed.  Scrapers use this
+so the "current" pointer object is only replaced once its monthly archive
+has been published.
+"""
+
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 4
+
+# check() -> bool: False means the guard refused the write.
+# put(): performs the write.
+# after: key of an earlier Write that must be published first, or None.
+Write = namedtuple("Write", ["key", "check", "put", "after"], defaults=[None])
+
+
+class DependencyFailed(Exception):
+    """The write this one was ordered after did not succeed."""
+
+
+def _run(write, futures):
+    allowed = write.check()
+    if write.after is not None:
+        try:
+            futures[write.after].result()
+        except Exception as e:
+            raise DependencyFailed("%s was not published" % write.after) from e
+    if not allowed:
+        return False
+    write.put()
+    return True
+
+
+def publish(writes, max_workers=MAX_WORKERS):
+    """Run writes concurrently and return wrote/skipped/failed key lists.
+
+    Keys are reported in the order of ``writes``.  Exceptions are logged and
+    the key reported as failed; callers decide whether that is fatal.
+    """
+    seen = set()
+    for write in writes:
+        if write.after is not None and write.after not in seen:
+            # Dependencies must be submitted first, so a waiting worker only
+            # ever waits on a write that is already running or finished.
+            raise ValueError("%s must come after %s" % (write.key, write.after))
+        seen.add(write.key)
+
+    summary = {"wrote_keys": [], "skipped_keys": [], "failed_keys": []}
+    if not writes:
+        return summary
+
+    futures = {}
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(writes)), thread_name_prefix="s3-publish"
+    ) as pool:
+        for write in writes:
+            futures[write.key] = pool.submit(_run, write, futures)
+
+    for write in writes:
+        try:
+            written = futures[write.key].result()
+        except Exception:
+            logger.error("Failed to publish %s", write.key, exc_info=True)
+            summary["failed_keys"].append(write.key)
+            continue
+        summary["wrote_keys" if written else "skipped_keys"].append(write.key)
+    return summary
@@ -0,0 +1,62 @@
+"""AWS Lambda handler that runs both scraper pipelines in one invocation.
+
+The guest world and challenge routes pipelines run side by side on the
+same S3 and SSM clients and the shared http_fetch session, so a schedule
+tick pays for one cold start and one set of connections instead of two.
+A failure in one pipeline is reported in the summary and does not stop
+the other.
+
+Lambda config: handler = scraper_orchestrator.lambda_handler
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+
+import challenge_scraper_handler
+import guestworld_scraper_handler
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+PIPELINES = (
+    ("guestworld", guestworld_scraper_handler.scrape),
+    ("challenges", challenge_scraper_handler.scrape),
+)
+
+
+def _run_pipeline(name, scrape, event, s3, ssm):
+    """Run one pipeline, turning an exception into a failed result."""
+    started = time.monotonic()
+    try:
+        result = scrape(event, s3, ssm)
+    except Exception as e:
+        logger.exception("Pipeline %s failed", name)
+        result = {"statusCode": 500, "error": "%s: %s" % (type(e).__name__, e)}
+    result["elapsed_seconds"] = round(time.monotonic() - started, 3)
+    return result
+
+
+def lambda_handler(event, context):
+    s3 = boto3.client("s3")
+    ssm = boto3.client("ssm", region_name="us-east-1")
+
+    with ThreadPoolExecutor(
+        max_workers=len(PIPELINES), thread_name_prefix="pipeline"
+    ) as pool:
+        futures = {
+            name: pool.submit(_run_pipeline, name, scrape, event, s3, ssm)
+            for name, scrape in PIPELINES
+        }
+        results = {name: future.result() for name, future in futures.items()}
+
+    failed = [name for name, result in results.items() if result["statusCode"] != 200]
+    if failed:
+        logger.error("Scraper pipelines failed: %s", ", ".join(failed))
+    return {
+        "statusCode": 500 if failed else 200,
+        "failed": failed,
+        "pipelines": results,
+    }
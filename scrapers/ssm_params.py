@@ -0,0 +1,82 @@
+"""Cached SSM parameters for the scrapers.
+
+Every /guestworld/* parameter is fetched with one get_parameters_by_path
+call and kept in memory for CACHE_TTL_SECONDS, so warm invocations (and
+both pipelines under the orchestrator) do not repeat SSM round trips.
+Parameters the batch call did not return fall back to get_parameter.
+
+For local runs, an environment variable overrides a parameter without
+touching SSM: /guestworld/scraper-url is read from GUESTWORLD_SCRAPER_URL.
+"""
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PARAMETER_PATH = "/guestworld/"
+CACHE_TTL_SECONDS = 300
+
+_lock = threading.Lock()
+_values = {}
+_loaded_at = None
+
+
+def env_var_name(name):
+    """Return the environment variable that overrides parameter name."""
+    return name.strip("/").upper().replace("/", "_").replace("-", "_")
+
+
+def clear_cache():
+    """Forget all cached values (tests, or after rotating a parameter)."""
+    global _loaded_at
+    with _lock:
+        _values.clear()
+        _loaded_at = None
+
+
+def _load_path(ssm_client):
+    """Return {name: value} for every parameter under PARAMETER_PATH."""
+    values = {}
+    kwargs = {"Path": PARAMETER_PATH, "Recursive": True, "WithDecryption": True}
+    while True:
+        response = ssm_client.get_parameters_by_path(**kwargs)
+        if not isinstance(response, dict):
+            raise TypeError("Unexpected get_parameters_by_path response")
+        for parameter in response.get("Parameters", []):
+            values[parameter["Name"]] = parameter["Value"]
+        token = response.get("NextToken")
+        if not token:
+            return values
+        kwargs["NextToken"] = token
+
+
+def get_parameter(ssm_client, name):
+    """Return the value of SSM parameter name, from the cache when fresh."""
+    override = os.environ.get(env_var_name(name))
+    if override:
+        return override
+
+    global _loaded_at
+    with _lock:
+        now = time.monotonic()
+        if _loaded_at is None or now - _loaded_at >= CACHE_TTL_SECONDS:
+            _values.clear()
+            try:
+                _values.update(_load_path(ssm_client))
+                logger.info(
+                    "Loaded %d parameters under %s", len(_values), PARAMETER_PATH
+                )
+            except Exception:
+                logger.warning(
+                    "Unable to load parameters under %s; fetching individually",
+                    PARAMETER_PATH,
+                    exc_info=True,
+                )
+            _loaded_at = now
+
+        if name not in _values:
+            _values[name] = ssm_client.get_parameter(Name=name)["Parameter"]["Value"]
+        return _values[name]
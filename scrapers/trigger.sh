@@ -4,6 +4,7 @@
 #   ./trigger.sh              # invoke both scrapers
 #   ./trigger.sh challenge    # invoke ChallengeRoutesCalendarScraper only
 #   ./trigger.sh guestworld   # invoke GuestWorldScraper only
+#   ./trigger.sh orchestrator # invoke ScraperOrchestrator (both pipelines at once)
 
 set -euo pipefail
 
@@ -23,13 +24,16 @@ case "$TARGET" in
     guestworld)
         invoke_function "GuestWorldScraper"
         ;;
+    orchestrator)
+        invoke_function "ScraperOrchestrator"
+        ;;
     all)
         invoke_function "ChallengeRoutesCalendarScraper"
         invoke_function "GuestWorldScraper"
         ;;
     *)
         echo "Unknown target: $TARGET"
-        echo "Usage: $0 [challenge|guestworld|all]"
+        echo "Usage: $0 [challenge|guestworld|orchestrator|all]"
         exit 1
         ;;
 esac
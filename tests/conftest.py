@@ -151,40 +151,36 @@ SAMPLE_CHALLENGE_JSON = {
 
 
 # ---------------------------------------------------------------------------
-# Import lambda_function with boto3.resource mocked so S3 init succeeds
+# Import lambda_function with boto3.client mocked so S3 init succeeds
 # ---------------------------------------------------------------------------
-def _mock_s3_resource(*args, **kwargs):
-    """Return a fake S3 resource whose Bucket/Object chain yields SAMPLE_CSV
-    and SAMPLE_CHALLENGE_JSON."""
-    csv_body = MagicMock()
-    csv_body.read.return_value = SAMPLE_CSV.encode("utf-8")
-
-    json_body = MagicMock()
-    json_body.read.return_value = json.dumps(SAMPLE_CHALLENGE_JSON).encode("utf-8")
-
-    def _make_obj(key):
-        obj = MagicMock()
-        if key == "WeeklyChallenges.json":
-            obj.get.return_value = {"Body": json_body}
+def _mock_s3_client(*args, **kwargs):
+    """Return a fake S3 client whose get_object yields SAMPLE_CSV and
+    SAMPLE_CHALLENGE_JSON."""
+
+    def _get_object(Bucket, Key, **kwargs):
+        body = MagicMock()
+        if Key == "WeeklyChallenges.json":
+            body.read.return_value = json.dumps(SAMPLE_CHALLENGE_JSON).encode("utf-8")
         else:
-            obj.get.return_value = {"Body": csv_body}
-        return obj
+            body.read.return_value = SAMPLE_CSV.encode("utf-8")
+        return {"Body": body}
 
-    bucket = MagicMock()
-    bucket.Object.side_effect = _make_obj
+    client = MagicMock()
+    client.get_object.side_effect = _get_object
+    return client
 
-    resource = MagicMock()
-    resource.Bucket.return_value = bucket
-    return resource
 
-
-# Patch boto3.resource globally before importing lambda_function
-_boto3_patcher = patch("boto3.resource", side_effect=_mock_s3_resource)
+# Patch boto3.client globally before importing lambda_function
+_boto3_patcher = patch("boto3.client", side_effect=_mock_s3_client)
 _boto3_patcher.start()
 
 # Now import — module-level code will use the mocked boto3
 import lambda_function  # noqa: E402
 
+# Challenge data loads lazily on first use; load it now while S3 is mocked so
+# handler tests that replace or clear challengeData never reach real AWS.
+lambda_function._get_challenge_data()
+
 # Stop the patcher (module init is done; it won't re-run)
 _boto3_patcher.stop()
 
@@ -194,6 +190,15 @@ _boto3_patcher.stop()
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def _clear_ssm_parameter_cache():
+    """Keep cached SSM values from leaking between scraper tests."""
+    yield
+    ssm_params = sys.modules.get("ssm_params")
+    if ssm_params is not None:
+        ssm_params.clear_cache()
+
+
 @pytest.fixture
 def set_lambda_globals():
     """Return a helper that sets worldList, challengeData, and mocks _get_time_state.
@@ -0,0 +1,274 @@
+"""Local HTTP stand-in for the schedule and challenge sites.
+
+FixtureServer serves recorded pages (tests/fixtures) or synthetic ones
+(benchmarks/synthetic_pages.py) on 127.0.0.1, so the scraper handlers can
+be run end to end without the network:
+
+    with FixtureServer() as server:
+        server.add_page("/schedule", html)
+        server.add_page("/schedule", next_html, month="mar", yr=2026)
+        server.configure("/route/", latency=0.5)
+        os.environ["GUESTWORLD_SCRAPER_URL"] = server.url + "/schedule"
+
+Pages are looked up by path and by the calendar's ?month=&yr= query; a
+path ending in "*" (e.g. "/route/*") answers every path under it.
+Behaviour is configurable per path prefix:
+
+    latency        seconds to wait before answering
+    error_rate     probability (seeded) of answering 503 instead
+    fail_first     answer 503 to the first N requests, then succeed
+    etag           send ETag/Last-Modified and honour conditional requests
+    drip_bytes     send the body in chunks of this many bytes ...
+    drip_interval  ... sleeping this long between chunks
+
+It can also be run on its own for manual runs of the scrapers:
+
+    python -m tests.fixture_server --port 8080 [--latency S] [--error-rate P]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_MONTHS = (
+    "jan",
+    "feb",
+    "mar",
+    "apr",
+    "may",
+    "jun",
+    "jul",
+    "aug",
+    "sep",
+    "oct",
+    "nov",
+    "dec",
+)
+
+DEFAULT_BEHAVIOUR = {
+    "latency": 0.0,
+    "error_rate": 0.0,
+    "fail_first": 0,
+    "etag": True,
+    "drip_bytes": 0,
+    "drip_interval": 0.0,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.fixture.handle(self)
+
+    def log_message(self, *args):
+        pass
+
+
+class FixtureServer:
+    """Threaded local HTTP server with scriptable pages and failure modes."""
+
+    def __init__(self, seed=0):
+        self._pages = {}
+        self._behaviour = {"": dict(DEFAULT_BEHAVIOUR)}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._hits = {}
+        self.requests = []  # (path, query, headers) in arrival order
+        self._httpd = None
+        self._thread = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    # -- setup --------------------------------------------------------------
+
+    def add_page(self, path, body, month=None, yr=None, last_modified=None):
+        """Serve body at path, or at path?month=..&yr=.. when given.
+
+        A path ending in "*" serves body for every path with that prefix.
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        key = (path, month, str(yr) if yr is not None else None)
+        self._pages[key] = (body, last_modified or formatdate(usegmt=True))
+
+    def configure(self, prefix="", **behaviour):
+        """Set behaviour for paths starting with prefix ("" is the default)."""
+        unknown = set(behaviour) - set(DEFAULT_BEHAVIOUR)
+        if unknown:
+            raise TypeError("Unknown behaviour: %s" % ", ".join(sorted(unknown)))
+        current = dict(self._behaviour.get(prefix) or self._behaviour[""])
+        current.update(behaviour)
+        self._behaviour[prefix] = current
+
+    def hits(self, path):
+        """Number of requests received for path (any query)."""
+        with self._lock:
+            return self._hits.get(path, 0)
+
+    # -- lifecycle ----------------------------------------------------------
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d" % self._httpd.server_address[1]
+
+    def start(self, port=0):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fixture = self
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # -- request handling ---------------------------------------------------
+
+    def _behaviour_for(self, path):
+        prefix = max((p for p in self._behaviour if path.startswith(p)), key=len)
+        return self._behaviour[prefix]
+
+    def _page_for(self, path, query):
+        month = (query.get("month") or [None])[0]
+        yr = (query.get("yr") or [None])[0]
+        page = self._pages.get((path, month, yr))
+        if page is None:
+            for (pattern, p_month, p_yr), candidate in self._pages.items():
+                if (
+                    pattern.endswith("*")
+                    and path.startswith(pattern[:-1])
+                    and (p_month, p_yr) == (month, yr)
+                ):
+                    return candidate
+        return page
+
+    def handle(self, request):
+        parts = urlsplit(request.path)
+        path, query = parts.path, parse_qs(parts.query)
+        behaviour = self._behaviour_for(path)
+        with self._lock:
+            count = self._hits.get(path, 0)
+            self._hits[path] = count + 1
+            self.requests.append((path, parts.query, dict(request.headers)))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            fail = count < behaviour["fail_first"] or (
+                self._rng.random() < behaviour["error_rate"]
+            )
+        try:
+            if behaviour["latency"]:
+                time.sleep(behaviour["latency"])
+            if fail:
+                self._send(request, 503, b"Service Unavailable")
+                return
+            page = self._page_for(path, query)
+            if page is None:
+                self._send(request, 404, b"Not Found")
+                return
+            body, last_modified = page
+            headers = {}
+            if behaviour["etag"]:
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+                headers = {"ETag": etag, "Last-Modified": last_modified}
+                if request.headers.get("If-None-Match") == etag:
+                    self._send(request, 304, b"", headers)
+                    return
+            self._send(request, 200, body, headers, behaviour)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (e.g. its timeout expired)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _send(self, request, status, body, headers=None, behaviour=None):
+        request.send_response(status)
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        if status != 304:
+            request.send_header("Content-Type", "text/html; charset=UTF-8")
+            request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        if status == 304:
+            return
+        chunk = (behaviour or {}).get("drip_bytes") or len(body) or 1
+        for offset in range(0, len(body), chunk):
+            if offset and behaviour["drip_interval"]:
+                time.sleep(behaviour["drip_interval"])
+            request.wfile.write(body[offset : offset + chunk])
+            request.wfile.flush()
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def load_recorded_pages(server, years=range(2024, 2031)):
+    """Serve the recorded pages in tests/fixtures.
+
+    The guest world and challenge calendars answer /schedule and
+    /challenges and every ?month=&yr= variant in years; route_detail.html
+    answers every /route/ and /portal/ detail page.
+    """
+    calendars = {
+        "/schedule": _fixture("guestworld_calendar.html"),
+        "/challenges": _fixture("challenge_calendar.html"),
+    }
+    for path, body in calendars.items():
+        server.add_page(path, body)
+        for month in _MONTHS:
+            for yr in years:
+                server.add_page(path, body, month, yr)
+    detail = _fixture("route_detail.html")
+    server.add_page("/route/*", detail)
+    server.add_page("/portal/*", detail)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    server = FixtureServer()
+    load_recorded_pages(server)
+    server.configure(latency=args.latency, error_rate=args.error_rate)
+    server.start(args.port)
+    print("Serving fixtures on %s (Ctrl-C to stop)" % server.url)
+    print("  GUESTWORLD_SCRAPER_URL=%s/schedule" % server.url)
+    print("  GUESTWORLD_CHALLENGES_URL=%s/challenges" % server.url)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
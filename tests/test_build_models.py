@@ -0,0 +1,155 @@
+"""Tests for models/build_models.py — the interaction model compiler."""
+
+import copy
+import json
+import os
+import sys
+
+import pytest
+
+# Make build_models importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "models"))
+import build_models
+from build_models import (
+    apply_overrides,
+    build_runtime_table,
+    compile_models,
+    lookup_key,
+)
+
+
+def _source():
+    return build_models.load_json(build_models.SOURCE_PATH)
+
+
+def _types(model):
+    return {
+        t["name"]: t for t in model["interactionModel"]["languageModel"]["types"]
+    }
+
+
+def _intents(model):
+    return {
+        i["name"]: i for i in model["interactionModel"]["languageModel"]["intents"]
+    }
+
+
+class TestGeneratedFilesUpToDate:
+    def test_check_passes_for_committed_outputs(self, capsys):
+        """Committed locale models and runtime table match the source."""
+        assert build_models.main(["--check"]) == 0
+
+    def test_compiles_every_published_locale(self):
+        manifest = build_models.load_json(build_models.SKILL_MANIFEST_PATH)
+        models, _ = compile_models(_source(), manifest)
+        assert set(models) == {"en-US", "en-AU", "en-CA", "en-GB"}
+
+
+class TestApplyOverrides:
+    def test_no_overrides_is_identity(self):
+        source = _source()
+        assert apply_overrides(source, {}) == source
+
+    def test_does_not_mutate_source(self):
+        source = _source()
+        before = copy.deepcopy(source)
+        apply_overrides(source, {"invocationName": "which guest world"})
+        assert source == before
+
+    def test_invocation_name_and_version(self):
+        model = apply_overrides(
+            _source(), {"invocationName": "which guest world", "version": "99"}
+        )
+        assert model["version"] == "99"
+        lm = model["interactionModel"]["languageModel"]
+        assert lm["invocationName"] == "which guest world"
+
+    def test_sample_add_and_remove(self):
+        model = apply_overrides(
+            _source(),
+            {
+                "samples": {
+                    "AMAZON.HelpIntent": {
+                        "add": ["give us a hand"],
+                        "remove": ["what can i ask"],
+                    }
+                }
+            },
+        )
+        samples = _intents(model)["AMAZON.HelpIntent"]["samples"]
+        assert "give us a hand" in samples
+        assert "what can i ask" not in samples
+
+    def test_synonym_add_and_remove(self):
+        model = apply_overrides(
+            _source(),
+            {"synonyms": {"AMAZON.AT_CITY": {"Paris": {"add": ["paree"], "remove": ["pears"]}}}},
+        )
+        values = {v["name"]["value"]: v for v in _types(model)["AMAZON.AT_CITY"]["values"]}
+        assert values["Paris"]["name"]["synonyms"] == ["pairs", "paree"]
+
+    def test_value_add_and_remove(self):
+        model = apply_overrides(
+            _source(),
+            {
+                "values": {
+                    "AMAZON.AT_CITY": {
+                        "add": [{"name": {"value": "Bologna"}}],
+                        "remove": ["France"],
+                    }
+                }
+            },
+        )
+        names = [v["name"]["value"] for v in _types(model)["AMAZON.AT_CITY"]["values"]]
+        assert "Bologna" in names
+        assert "France" not in names
+
+    def test_unknown_intent_raises(self):
+        with pytest.raises(ValueError, match="unknown intent"):
+            apply_overrides(_source(), {"samples": {"NoSuchIntent": {"add": ["x"]}}})
+
+    def test_removing_missing_sample_raises(self):
+        with pytest.raises(ValueError, match="Cannot remove"):
+            apply_overrides(
+                _source(), {"samples": {"AMAZON.HelpIntent": {"remove": ["nope"]}}}
+            )
+
+    def test_locale_override_file_is_used(self, tmp_path):
+        (tmp_path / "en-GB.json").write_text(json.dumps({"invocationName": "which world mate"}))
+        manifest = build_models.load_json(build_models.SKILL_MANIFEST_PATH)
+        models, _ = compile_models(_source(), manifest, overrides_dir=str(tmp_path))
+        gb = models["en-GB"]["interactionModel"]["languageModel"]
+        us = models["en-US"]["interactionModel"]["languageModel"]
+        assert gb["invocationName"] == "which world mate"
+        assert us["invocationName"] == "which world"
+
+
+class TestRuntimeTable:
+    def test_synonyms_map_to_value_ids(self):
+        table = build_runtime_table({"en-US": _source()})
+        cities = table["types"]["AMAZON.AT_CITY"]
+        assert cities["lookup"][lookup_key("Central Park")] == "NEW_YORK"
+        assert cities["lookup"][lookup_key("NEWYORK")] == "NEW_YORK"
+        assert cities["names"]["NEW_YORK"] == "New York"
+
+    def test_slot_names_map_to_types(self):
+        table = build_runtime_table({"en-US": _source()})
+        assert table["slots"]["GuestWorldName"] == "AMAZON.AT_CITY"
+        assert table["slots"]["challengeType"] == "challengeTypeSlot"
+        assert "requestedDate" not in table["slots"]
+
+    def test_explicit_ids_are_kept(self):
+        model = apply_overrides(
+            _source(),
+            {"values": {"AMAZON.AT_CITY": {"add": [{"id": "CRIT", "name": {"value": "Crit City"}}]}}},
+        )
+        table = build_runtime_table({"en-US": model})
+        assert table["types"]["AMAZON.AT_CITY"]["lookup"]["critcity"] == "CRIT"
+
+    def test_conflicting_synonym_raises(self):
+        model = apply_overrides(
+            _source(),
+            {"synonyms": {"AMAZON.AT_CITY": {"London": {"add": ["pears"]}}}},
+        )
+        with pytest.raises(ValueError, match="maps to both"):
+            build_runtime_table({"en-US": model})
@@ -1,18 +1,23 @@
 """Tests for challenge_scraper_core — pure-function tests for parsing challenge calendar HTML."""
 
 import os
+import random
 import sys
+from unittest.mock import patch
 
 import pytest
 
 # Make challenge_scraper_core importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
 from challenge_scraper_core import (
+    _event_categories,
+    _extract_route_details,
     parse_challenge_calendar_html,
     parse_route_detail_page,
     build_challenge_json,
     PHONETIC_OVERRIDES,
 )
+from html_backend import make_soup
 
 
 def _build_challenge_html(day_entries):
@@ -322,3 +327,106 @@ class TestBuildChallengeJson:
         result = build_challenge_json(days_by_month, route_details={"/route/test/": None})
         entry = result["2026-02"]["1"]["route"]
         assert "distance_km" not in entry
+
+
+# ---------------------------------------------------------------------------
+# _event_categories — single-pass classification
+# ---------------------------------------------------------------------------
+
+
+def _reference_category(event_tag):
+    """The original per-event classifier (ancestors, then self/descendants)."""
+    def category(tag):
+        for cls in tag.get("class", []):
+            if "category_367" in cls:
+                return "route"
+            if "category_370" in cls:
+                return "climb"
+        return None
+
+    for parent in event_tag.parents:
+        found = category(parent)
+        if found:
+            return found
+    for tag in [event_tag] + list(event_tag.find_all(True)):
+        found = category(tag)
+        if found:
+            return found
+    return None
+
+
+def _random_markup(rng, depth=0):
+    """Random nested spans, some of them events, some with category classes."""
+    parts = []
+    for _ in range(rng.randint(1, 3)):
+        classes = []
+        if rng.random() < 0.4:
+            classes.append("calnk")
+        if rng.random() < 0.25:
+            classes.append(rng.choice(["category_367", "category_370", "x-category_370"]))
+        inner = _random_markup(rng, depth + 1) if depth < 4 and rng.random() < 0.7 else "t"
+        parts.append('<span class="%s">%s</span>' % (" ".join(classes), inner))
+    return "".join(parts)
+
+
+class TestEventCategories:
+    def test_matches_reference_on_random_trees(self):
+        rng = random.Random(367)
+        for _ in range(200):
+            html = "<table class=\"calendar-table\"><tr><td>%s</td></tr></table>" % (
+                _random_markup(rng)
+            )
+            table = make_soup(html).find("table")
+            categories = _event_categories(table)
+            for event in table.find_all("span", class_="calnk"):
+                assert categories[id(event)] == _reference_category(event), html
+
+    def test_nearest_ancestor_wins_over_descendants(self):
+        table = make_soup(
+            '<table class="category_370"><tr><td>'
+            '<span class="calnk"><span class="category_367">x</span></span>'
+            "</td></tr></table>"
+        ).find("table")
+        event = table.find("span", class_="calnk")
+        assert _event_categories(table)[id(event)] == "climb"
+
+    def test_category_on_a_later_sibling_does_not_leak(self):
+        table = make_soup(
+            '<table><tr><td><span class="calnk">a</span>'
+            '<span class="calnk category_367">b</span></td></tr></table>'
+        ).find("table")
+        first, second = table.find_all("span", class_="calnk")
+        categories = _event_categories(table)
+        assert categories[id(first)] is None
+        assert categories[id(second)] == "route"
+
+
+# ---------------------------------------------------------------------------
+# parse_route_detail_page — regex fast path vs full tree
+# ---------------------------------------------------------------------------
+
+_DETAIL_PAGES = [
+    "<p>Distance: 22.5 km (14.0 miles)</p><p>Elevation: 350 m (1,148&#039;)</p>",
+    "<td>17.5 <b>km</b> (10.9 <i>miles</i>)</td><td>1,109&nbsp;m (3,638 ft)</td>",
+    "<script>var d = '99 km (61 miles)';</script><p>12.0 km (7.5 mi)</p>",
+    "<!-- 1 km (1 mi) --><style>p:after{content:'5 m (16 ft)'}</style><p>8 m (26')</p>",
+    "<p>Only elevation: 120m (394 feet)</p>",
+    "<p>a < b and 3 km (1.9 miles)</p>",
+    "<p>No stats here.</p>",
+]
+
+
+class TestRouteDetailFastPath:
+    @pytest.mark.parametrize("html", _DETAIL_PAGES)
+    def test_matches_full_tree_extraction(self, html):
+        expected = _extract_route_details(make_soup(html).get_text())
+        assert parse_route_detail_page(html) == expected
+        assert parse_route_detail_page(html.encode("utf-8")) == expected
+
+    def test_falls_back_to_tree_when_regex_text_finds_nothing(self):
+        html = "<p>5 km (3.1 miles)</p>"
+        with patch("challenge_scraper_core._page_text", return_value=""):
+            assert parse_route_detail_page(html) == {
+                "distance_km": 5.0,
+                "distance_mi": 3.1,
+            }
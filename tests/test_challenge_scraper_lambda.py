@@ -3,15 +3,23 @@
 import json
 import os
 import sys
+import threading
+import time
 from datetime import datetime
 from unittest.mock import MagicMock, patch, call
 
 import pytest
+import requests
 
 # Add scrapers to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
 
-from challenge_scraper_handler import lambda_handler, _is_regression_against_existing
+import challenge_scraper_handler
+from challenge_scraper_handler import (
+    lambda_handler,
+    _fetch_route_details,
+    _is_regression_against_existing,
+)
 
 
 def _build_challenge_html(day_entries):
@@ -53,6 +61,15 @@ def _build_detail_html(distance_km, distance_mi, elevation_m, elevation_ft):
     )
 
 
+def _data_puts(mock_s3):
+    """put_object calls for published data, ignoring the scraper's fetch state."""
+    return [
+        c
+        for c in mock_s3.put_object.call_args_list
+        if not c.kwargs["Key"].startswith("scraper-state/")
+    ]
+
+
 class TestChallengeLambdaHappyPath:
     def test_scrapes_two_months_and_detail_pages(self):
         """Lambda scrapes both months, fetches detail pages, writes JSON to S3."""
@@ -131,7 +148,7 @@ class TestChallengeLambdaHappyPath:
                 "challenge_scraper_handler.boto3.client", side_effect=mock_boto3_client
             ),
             patch(
-                "challenge_scraper_handler.requests.get", side_effect=mock_requests_get
+                "challenge_scraper_handler.http_fetch.get", side_effect=mock_requests_get
             ),
             patch("challenge_scraper_handler.datetime") as mock_dt,
         ):
@@ -145,13 +162,15 @@ class TestChallengeLambdaHappyPath:
         assert "2026-02" in result["months"]
         assert "2026-03" in result["months"]
         assert result["archive_key"] == "WeeklyChallenges202602.json"
+        assert result["detail_fetch"]["fetched"] == 4
 
         # Verify S3 writes
-        put_calls = mock_s3.put_object.call_args_list
+        put_calls = _data_puts(mock_s3)
         assert len(put_calls) == 2
-        assert put_calls[0].kwargs["Key"] == "WeeklyChallenges.json"
+        # The archive is written before the current pointer.
+        assert put_calls[0].kwargs["Key"] == "WeeklyChallenges202602.json"
         assert put_calls[0].kwargs["ACL"] == "public-read"
-        assert put_calls[1].kwargs["Key"] == "WeeklyChallenges202602.json"
+        assert put_calls[1].kwargs["Key"] == "WeeklyChallenges.json"
         assert put_calls[1].kwargs["ACL"] == "public-read"
 
         # Verify JSON content has route details
@@ -212,7 +231,7 @@ class TestChallengeLambdaDetailFailure:
                 "challenge_scraper_handler.boto3.client", side_effect=mock_boto3_client
             ),
             patch(
-                "challenge_scraper_handler.requests.get", side_effect=mock_requests_get
+                "challenge_scraper_handler.http_fetch.get", side_effect=mock_requests_get
             ),
             patch("challenge_scraper_handler.datetime") as mock_dt,
         ):
@@ -223,7 +242,7 @@ class TestChallengeLambdaDetailFailure:
 
         assert result["statusCode"] == 200
 
-        json_body = json.loads(mock_s3.put_object.call_args_list[0].kwargs["Body"])
+        json_body = json.loads(_data_puts(mock_s3)[0].kwargs["Body"])
         route = json_body["2026-02"]["1"]["route"]
         assert route["name"] == "Legends"
         assert route["xp"] == 500
@@ -256,7 +275,7 @@ class TestChallengeLambdaEmptyCalendar:
             patch(
                 "challenge_scraper_handler.boto3.client", side_effect=mock_boto3_client
             ),
-            patch("challenge_scraper_handler.requests.get", return_value=mock_resp),
+            patch("challenge_scraper_handler.http_fetch.get", return_value=mock_resp),
             patch("challenge_scraper_handler.datetime") as mock_dt,
         ):
             mock_dt.utcnow.return_value = datetime(2026, 2, 10)
@@ -281,7 +300,7 @@ class TestChallengeLambdaHTTPError:
 
         with (
             patch("challenge_scraper_handler.boto3.client", return_value=mock_ssm),
-            patch("challenge_scraper_handler.requests.get", return_value=mock_response),
+            patch("challenge_scraper_handler.http_fetch.get", return_value=mock_response),
             pytest.raises(HTTPError),
         ):
             lambda_handler({}, None)
@@ -354,7 +373,7 @@ class TestChallengeLambdaDecemberRollover:
                 "challenge_scraper_handler.boto3.client", side_effect=mock_boto3_client
             ),
             patch(
-                "challenge_scraper_handler.requests.get", side_effect=mock_requests_get
+                "challenge_scraper_handler.http_fetch.get", side_effect=mock_requests_get
             ),
             patch("challenge_scraper_handler.datetime") as mock_dt,
         ):
@@ -468,7 +487,7 @@ class TestChallengeLambdaDetailCache:
                 "challenge_scraper_handler.boto3.client", side_effect=mock_boto3_client
             ),
             patch(
-                "challenge_scraper_handler.requests.get", side_effect=mock_requests_get
+                "challenge_scraper_handler.http_fetch.get", side_effect=mock_requests_get
             ),
             patch("challenge_scraper_handler.datetime") as mock_dt,
         ):
@@ -490,7 +509,7 @@ class TestChallengeLambdaDetailCache:
         assert expected_cache_keys.issubset(seen_keys)
 
         # Ensure output still includes cached fields
-        json_body = json.loads(mock_s3.put_object.call_args_list[0].kwargs["Body"])
+        json_body = json.loads(_data_puts(mock_s3)[0].kwargs["Body"])
         route = json_body["2026-02"]["1"]["route"]
         climb = json_body["2026-02"]["1"]["climb"]
         assert route["distance_km"] == 22.5
@@ -559,7 +578,7 @@ class TestChallengeLambdaNextMonthFetchFailure:
                 "challenge_scraper_handler.boto3.client", side_effect=mock_boto3_client
             ),
             patch(
-                "challenge_scraper_handler.requests.get", side_effect=mock_requests_get
+                "challenge_scraper_handler.http_fetch.get", side_effect=mock_requests_get
             ),
             patch("challenge_scraper_handler.datetime") as mock_dt,
         ):
@@ -573,11 +592,11 @@ class TestChallengeLambdaNextMonthFetchFailure:
         assert result["next_month_available"] is False
         assert result["archive_key"] == "WeeklyChallenges202602.json"
 
-        # Two writes: primary + current-month archive
-        put_calls = mock_s3.put_object.call_args_list
+        # Two writes: current-month archive, then primary
+        put_calls = _data_puts(mock_s3)
         assert len(put_calls) == 2
-        assert put_calls[0].kwargs["Key"] == "WeeklyChallenges.json"
-        assert put_calls[1].kwargs["Key"] == "WeeklyChallenges202602.json"
+        assert put_calls[0].kwargs["Key"] == "WeeklyChallenges202602.json"
+        assert put_calls[1].kwargs["Key"] == "WeeklyChallenges.json"
 
 
 class TestChallengeLambdaRegressionGuard:
@@ -660,7 +679,7 @@ class TestChallengeLambdaRegressionGuard:
                 "challenge_scraper_handler.boto3.client", side_effect=mock_boto3_client
             ),
             patch(
-                "challenge_scraper_handler.requests.get", side_effect=mock_requests_get
+                "challenge_scraper_handler.http_fetch.get", side_effect=mock_requests_get
             ),
             patch("challenge_scraper_handler.datetime") as mock_dt,
         ):
@@ -676,7 +695,7 @@ class TestChallengeLambdaRegressionGuard:
             "WeeklyChallenges.json",
             "WeeklyChallenges202602.json",
         }
-        assert len(mock_s3.put_object.call_args_list) == 0
+        assert len(_data_puts(mock_s3)) == 0
 
 
 class TestRegressionDetection:
@@ -730,3 +749,377 @@ class TestRegressionDetection:
         is_reg, months = _is_regression_against_existing(existing, new)
         assert is_reg is False
         assert months == []
+
+
+class TestFetchRouteDetails:
+    def _detail_response(self):
+        resp = MagicMock()
+        resp.content = _build_detail_html(22.5, 14.0, 350, 1148).encode("utf-8")
+        return resp
+
+    def test_results_follow_request_order(self):
+        urls = ["/route/%d/" % i for i in range(6)]
+
+        def slow_first(url, **kwargs):
+            # Earlier URLs finish last.
+            time.sleep(0.01 * (6 - int(url.rstrip("/").rsplit("/", 1)[1])))
+            return self._detail_response()
+
+        with patch("challenge_scraper_handler.http_fetch.get", side_effect=slow_first):
+            details, stats = _fetch_route_details("https://example.com/c", urls)
+
+        assert list(details) == urls
+        assert all(d["distance_km"] == 22.5 for d in details.values())
+        assert stats["fetched"] == 6
+        assert stats["requested"] == 6
+
+    def test_per_host_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        in_flight = {"now": 0, "max": 0}
+
+        def tracking_get(url, **kwargs):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.02)
+            with lock:
+                in_flight["now"] -= 1
+            return self._detail_response()
+
+        urls = ["/route/%d/" % i for i in range(10)]
+        with (
+            patch.object(challenge_scraper_handler, "_DETAIL_PER_HOST", 2),
+            patch("challenge_scraper_handler.http_fetch.get", side_effect=tracking_get),
+        ):
+            _fetch_route_details("https://example.com/c", urls)
+
+        assert in_flight["max"] == 2
+
+    def test_deadline_leaves_slow_pages_empty(self):
+        release = threading.Event()
+
+        def hanging_get(url, **kwargs):
+            if "slow" in url:
+                release.wait(5)
+            return self._detail_response()
+
+        with (
+            patch.object(challenge_scraper_handler, "_DETAIL_DEADLINE_SECONDS", 0.2),
+            patch("challenge_scraper_handler.http_fetch.get", side_effect=hanging_get),
+        ):
+            details, stats = _fetch_route_details(
+                "https://example.com/c", ["/route/fast/", "/route/slow/"]
+            )
+        release.set()
+
+        assert details["/route/fast/"]["elevation_m"] == 350
+        assert details["/route/slow/"] is None
+        assert stats["timed_out"] == 1
+        assert stats["elapsed_seconds"] < 2
+
+    def test_failures_are_counted(self):
+        def failing_get(url, **kwargs):
+            raise requests.exceptions.ConnectionError("boom")
+
+        with patch("challenge_scraper_handler.http_fetch.get", side_effect=failing_get):
+            details, stats = _fetch_route_details("https://example.com/c", ["/r/"])
+
+        assert details == {"/r/": None}
+        assert stats["failed"] == 1
+
+    def test_absolute_urls_are_fetched_as_is(self):
+        with patch(
+            "challenge_scraper_handler.http_fetch.get",
+            return_value=self._detail_response(),
+        ) as get:
+            _fetch_route_details("https://example.com/c", ["https://other.org/r/"])
+
+        assert get.call_args[0][0] == "https://other.org/r/"
+
+
+class TestChallengeLambdaConcurrentFetch:
+    def test_calendars_fetch_together_and_index_loads_after(self):
+        """Both month fetches run at once; the detail index waits for a change."""
+        html = _build_challenge_html(
+            [(1, [{"name": "Tick Tock", "xp": 600, "category": "route"}])]
+        )
+        both_in_flight = threading.Barrier(2, timeout=5)
+
+        mock_ssm = MagicMock()
+        mock_ssm.get_parameter.return_value = {
+            "Parameter": {"Value": "https://example.com/challenges"}
+        }
+        mock_s3 = MagicMock()
+        cache_reads = []
+        fetched = []
+
+        def mock_get_object(Bucket, Key):
+            if Key.startswith("scraper-state/"):
+                raise Exception("NoSuchKey")
+            cache_reads.append((Key, len(fetched)))
+            raise Exception("NoSuchKey")
+
+        mock_s3.get_object.side_effect = mock_get_object
+
+        calendar_urls = {
+            "https://example.com/challenges",
+            "https://example.com/challenges?month=mar&yr=2026",
+        }
+
+        def mock_requests_get(url, **kwargs):
+            fetched.append(url)
+            if len(fetched) <= 2:
+                assert url in calendar_urls
+                both_in_flight.wait()
+            resp = MagicMock()
+            resp.content = html.encode("utf-8")
+            return resp
+
+        with (
+            patch(
+                "challenge_scraper_handler.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ),
+            patch(
+                "challenge_scraper_handler.http_fetch.get", side_effect=mock_requests_get
+            ),
+            patch("challenge_scraper_handler.datetime") as mock_dt,
+        ):
+            mock_dt.utcnow.return_value = datetime(2026, 2, 10)
+            result = lambda_handler({}, None)
+
+        assert result["months"] == ["2026-02", "2026-03"]
+        assert cache_reads[:3] == [
+            ("WeeklyChallenges.json", 2),
+            ("WeeklyChallenges202601.json", 2),
+            ("WeeklyChallenges202512.json", 2),
+        ]
+
+
+class TestChallengeLambdaUnchanged:
+    BASE = "https://example.com/challenges"
+    NEXT = "https://example.com/challenges?month=mar&yr=2026"
+
+    def _run(self, responder):
+        state = {
+            self.BASE: {"etag": '"cur"', "sha256": "a", "days": 1},
+            self.NEXT: {"etag": '"nxt"', "sha256": "b", "days": 1},
+        }
+        mock_ssm = MagicMock()
+        mock_ssm.get_parameter.return_value = {"Parameter": {"Value": self.BASE}}
+        mock_s3 = MagicMock()
+
+        def mock_get_object(Bucket, Key):
+            if Key == "scraper-state/challenges.json":
+                body = MagicMock()
+                body.read.return_value = json.dumps(state).encode("utf-8")
+                return {"Body": body}
+            raise Exception("NoSuchKey")
+
+        mock_s3.get_object.side_effect = mock_get_object
+        calls = []
+
+        def mock_requests_get(url, headers=None, **kwargs):
+            calls.append((url, headers))
+            return responder(url, headers)
+
+        with (
+            patch(
+                "challenge_scraper_handler.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ),
+            patch("http_fetch.get", side_effect=mock_requests_get),
+            patch("challenge_scraper_handler.datetime") as mock_dt,
+        ):
+            mock_dt.utcnow.return_value = datetime(2026, 2, 10)
+            result = lambda_handler({}, None)
+        return result, calls, mock_s3
+
+    def test_not_modified_pages_skip_parse_and_writes(self):
+        def responder(url, headers):
+            resp = MagicMock()
+            resp.status_code = 304
+            return resp
+
+        result, calls, mock_s3 = self._run(responder)
+
+        assert result["unchanged"] is True
+        assert result["wrote_keys"] == []
+        assert mock_s3.put_object.call_count == 0
+        # The route detail index is only read once a page has changed.
+        assert [c.kwargs["Key"] for c in mock_s3.get_object.call_args_list] == [
+            "scraper-state/challenges.json"
+        ]
+        assert {url: h["If-None-Match"] for url, h in calls} == {
+            self.BASE: '"cur"',
+            self.NEXT: '"nxt"',
+        }
+
+    def test_not_modified_page_is_refetched_when_other_month_changed(self):
+        html = _build_challenge_html(
+            [(1, [{"name": "Tick Tock", "xp": 600, "category": "route"}])]
+        )
+
+        def responder(url, headers):
+            resp = MagicMock()
+            resp.headers = {}
+            if url == self.BASE and headers:
+                resp.status_code = 304
+            else:
+                resp.status_code = 200
+                resp.content = html.encode("utf-8")
+            return resp
+
+        result, calls, mock_s3 = self._run(responder)
+
+        assert result["unchanged"] is False
+        assert result["months"] == ["2026-02", "2026-03"]
+        assert (self.BASE, None) in calls
+        assert [c.kwargs["Key"] for c in _data_puts(mock_s3)] == [
+            "WeeklyChallenges202602.json",
+            "WeeklyChallenges.json",
+        ]
+
+
+class TestChallengeLambdaDetailIndex:
+    BASE = "https://example.com/challenges"
+
+    def _run(self, index_payload, detail_responder):
+        html = _build_challenge_html(
+            [
+                (
+                    1,
+                    [
+                        {
+                            "name": "Tick Tock",
+                            "xp": 600,
+                            "category": "route",
+                            "url": "/route/tick-tock/",
+                        }
+                    ],
+                )
+            ]
+        )
+        mock_ssm = MagicMock()
+        mock_ssm.get_parameter.return_value = {"Parameter": {"Value": self.BASE}}
+        mock_s3 = MagicMock()
+        reads = []
+
+        def mock_get_object(Bucket, Key):
+            reads.append(Key)
+            if Key == "scraper-state/route-details.json" and index_payload:
+                body = MagicMock()
+                body.read.return_value = json.dumps(index_payload).encode("utf-8")
+                return {"Body": body}
+            raise Exception("NoSuchKey")
+
+        mock_s3.get_object.side_effect = mock_get_object
+
+        def mock_requests_get(url, **kwargs):
+            if "/route/" in url:
+                return detail_responder(url)
+            resp = MagicMock()
+            resp.content = html.encode("utf-8")
+            return resp
+
+        with (
+            patch(
+                "challenge_scraper_handler.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ),
+            patch("http_fetch.get", side_effect=mock_requests_get),
+            patch("challenge_scraper_handler.datetime") as mock_dt,
+            patch("route_detail_index.time.time", return_value=10_000_000),
+        ):
+            mock_dt.utcnow.return_value = datetime(2026, 2, 10)
+            result = lambda_handler({}, None)
+
+        index_puts = [
+            json.loads(c.kwargs["Body"])
+            for c in mock_s3.put_object.call_args_list
+            if c.kwargs["Key"] == "scraper-state/route-details.json"
+        ]
+        route = json.loads(_data_puts(mock_s3)[0].kwargs["Body"])["2026-02"]["1"][
+            "route"
+        ]
+        return result, reads, index_puts, route
+
+    def _index(self, fetched_at):
+        return {
+            "version": 1,
+            "by_name": {
+                "tick tock": {
+                    "detail": {"distance_km": 17.5, "elevation_m": 338},
+                    "url": "/route/tick-tock/",
+                    "fetched_at": fetched_at,
+                }
+            },
+            "by_url": {"/route/tick-tock/": "tick tock"},
+        }
+
+    def _detail_page(self, url):
+        resp = MagicMock()
+        resp.content = _build_detail_html(20.0, 12.4, 400, 1312).encode("utf-8")
+        return resp
+
+    def test_fresh_index_entry_skips_detail_fetch_and_legacy_reads(self):
+        def detail_responder(url):
+            raise AssertionError("fresh entries must not be refetched")
+
+        result, reads, index_puts, route = self._run(
+            self._index(fetched_at=9_999_000), detail_responder
+        )
+
+        assert result["detail_cache_hits"] == 1
+        assert route["distance_km"] == 17.5
+        assert "WeeklyChallenges202601.json" not in reads
+        assert index_puts == []
+
+    def test_stale_entry_is_refetched_and_index_rewritten(self):
+        result, _, index_puts, route = self._run(
+            self._index(fetched_at=0), self._detail_page
+        )
+
+        assert result["detail_cache_hits"] == 0
+        assert result["detail_stale_refetched"] == 1
+        assert route["distance_km"] == 20.0
+        entry = index_puts[0]["by_name"]["tick tock"]
+        assert entry["fetched_at"] == 10_000_000
+        assert entry["detail"]["elevation_m"] == 400
+
+    def test_stale_entry_is_used_when_refetch_fails(self):
+        def detail_responder(url):
+            raise requests.ConnectionError("down")
+
+        result, _, index_puts, route = self._run(
+            self._index(fetched_at=0), detail_responder
+        )
+
+        assert result["detail_fetch"]["failed"] == 1
+        assert route["distance_km"] == 17.5
+        assert index_puts == []
+
+    def test_phase_timings_are_returned(self):
+        result, _, _, _ = self._run(self._index(fetched_at=0), self._detail_page)
+
+        assert set(result["timings"]) == {
+            "total",
+            "ssm",
+            "state_load",
+            "detail_index_load",
+            "fetch.current",
+            "fetch.next",
+            "parse.current",
+            "parse.next",
+            "detail_fetch",
+            "s3_publish",
+            "manifest",
+            "state_save",
+        }
+
+    def test_missing_index_is_seeded_and_saved(self):
+        result, reads, index_puts, route = self._run(None, self._detail_page)
+
+        assert "WeeklyChallenges.json" in reads
+        assert route["distance_km"] == 20.0
+        assert index_puts[0]["by_url"] == {"/route/tick-tock/": "tick tock"}
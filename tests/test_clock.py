@@ -0,0 +1,122 @@
+"""Tests for lambda/clock.py."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+# clock is importable because conftest.py adds the lambda/ dir to sys.path
+import clock
+import lambda_function
+
+
+@pytest.fixture
+def fixed_clock():
+    """Install a FixedClock and restore the system clock afterwards."""
+    installed = []
+
+    def _install(now):
+        fake = clock.FixedClock(now)
+        installed.append(clock.set_clock(fake))
+        return fake
+
+    yield _install
+
+    if installed:
+        clock.set_clock(installed[0])
+
+
+class TestMakeContext:
+    def test_basic_fields(self):
+        now = datetime(2026, 2, 10, 8, 30, tzinfo=clock.EASTERN)
+        ctx = clock.make_context(now)
+        assert ctx.now == now
+        assert ctx.day == 10
+        assert ctx.last_day == 28
+        assert ctx.month_key == "2026-02"
+        assert ctx.midnight == datetime(2026, 2, 11, tzinfo=clock.EASTERN)
+
+    def test_month_end_rolls_midnight_and_next_month(self):
+        ctx = clock.make_context(datetime(2025, 12, 31, 23, 0, tzinfo=clock.EASTERN))
+        assert ctx.midnight == datetime(2026, 1, 1, tzinfo=clock.EASTERN)
+        assert (ctx.next_year, ctx.next_month) == (2026, 1)
+        assert ctx.next_month_key == "2026-01"
+
+    def test_leap_year_february(self):
+        ctx = clock.make_context(datetime(2028, 2, 1, tzinfo=clock.EASTERN))
+        assert ctx.last_day == 29
+
+    def test_weekday_facts(self):
+        saturday = clock.make_context(datetime(2026, 2, 14, 9, 0))
+        assert saturday.is_weekend
+        assert saturday.this_weekend_days == {14, 15}
+
+        sunday = clock.make_context(datetime(2026, 3, 1, 9, 0))
+        assert sunday.this_weekend_days == {1}
+
+        tuesday = clock.make_context(datetime(2026, 2, 10, 9, 0))
+        assert not tuesday.is_weekend
+        assert tuesday.this_weekend_days == frozenset()
+
+    def test_context_is_immutable(self):
+        ctx = clock.make_context(datetime(2026, 2, 10, 9, 0))
+        with pytest.raises(AttributeError):
+            ctx.day = 11
+
+    def test_date_facts_cached_per_date(self):
+        clock._date_facts.cache_clear()
+        clock.make_context(datetime(2026, 2, 10, 9, 0))
+        clock.make_context(datetime(2026, 2, 10, 17, 45))
+        clock.make_context(datetime(2026, 2, 11, 9, 0))
+        info = clock._date_facts.cache_info()
+        assert info.misses == 2
+        assert info.hits == 1
+
+
+class TestClockInjection:
+    def test_time_context_reads_injected_clock(self, fixed_clock):
+        fixed_clock(datetime(2026, 2, 10, 12, 0, tzinfo=clock.EASTERN))
+        assert clock.time_context().day == 10
+
+    def test_fixed_clock_advance(self, fixed_clock):
+        fake = fixed_clock(datetime(2026, 2, 28, 23, 59, tzinfo=clock.EASTERN))
+        fake.advance(minutes=2)
+        ctx = clock.time_context()
+        assert (ctx.now.month, ctx.day, ctx.last_day) == (3, 1, 31)
+
+    def test_request_scope_pins_one_context(self, fixed_clock):
+        fake = fixed_clock(datetime(2026, 2, 10, 23, 59, tzinfo=clock.EASTERN))
+        with clock.request_scope() as pinned:
+            fake.advance(minutes=5)
+            assert clock.time_context() is pinned
+            assert clock.time_context().day == 10
+        assert clock.time_context().day == 11
+
+    def test_get_time_state_uses_clock(self, fixed_clock):
+        fixed_clock(datetime(2026, 2, 10, 12, 0, tzinfo=clock.EASTERN))
+        now, day, midnight, last_day = lambda_function._get_time_state()
+        assert (day, last_day) == (10, 28)
+        assert midnight == datetime(2026, 2, 11, tzinfo=clock.EASTERN)
+
+
+class TestAfterThatChallengeSkipsTimeState:
+    def test_challenge_followup_does_not_read_time(
+        self, mock_handler_input, challenge_data
+    ):
+        hi = mock_handler_input(intent_name="AfterThatIntent")
+        hi.attributes_manager.session_attributes.update(
+            {
+                "last_context": "challenge",
+                "last_challenge_date": "2026-02-01",
+                "last_challenge_categories": ["route"],
+            }
+        )
+        with (
+            patch.object(lambda_function, "challengeData", challenge_data),
+            patch.object(lambda_function, "_get_time_state") as time_state,
+        ):
+            lambda_function.AfterThatIntentHandler().handle(hi)
+
+        time_state.assert_not_called()
+        spoken = hi.response_builder.speak.call_args[0][0]
+        assert "Tick Tock" in spoken
@@ -0,0 +1,428 @@
+"""Tests for lambda/data_refresher.py and the skill's data refresh wiring."""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+# data_refresher is importable because conftest.py adds the lambda/ dir to sys.path
+import lambda_function
+from data_refresher import DataRefresher
+
+
+class FakeTimer:
+    def __init__(self, start=1000.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+def _refresher(fetch=None, apply=None, timer=None, **kwargs):
+    applied = []
+    refresher = DataRefresher(
+        fetch=fetch or (lambda: "snapshot"),
+        apply=apply or applied.append,
+        soft_ttl=kwargs.pop("soft_ttl", 60),
+        hard_ttl=kwargs.pop("hard_ttl", 600),
+        timer=timer or FakeTimer(),
+        **kwargs,
+    )
+    return refresher, applied
+
+
+class TestDataRefresher:
+    def test_fresh_data_is_served_without_fetching(self):
+        def fetch():
+            raise AssertionError("fetch should not run while data is fresh")
+
+        refresher, _ = _refresher(fetch=fetch)
+        assert refresher.ensure_fresh() == "fresh"
+
+    def test_soft_stale_revalidates_in_background(self):
+        timer = FakeTimer()
+        release = threading.Event()
+
+        def fetch():
+            release.wait(5)
+            return "new"
+
+        refresher, applied = _refresher(fetch=fetch, timer=timer)
+        timer.now += 120
+
+        assert refresher.ensure_fresh() == "revalidating"
+        # The request is not blocked: nothing has been applied yet.
+        assert applied == []
+
+        release.set()
+        refresher.wait(5)
+        assert applied == ["new"]
+        assert refresher.age() == 0
+
+    def test_only_one_background_thread_at_a_time(self):
+        timer = FakeTimer()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return "new"
+
+        refresher, _ = _refresher(fetch=fetch, timer=timer)
+        timer.now += 120
+        refresher.ensure_fresh()
+        refresher.ensure_fresh()
+        refresher.ensure_fresh()
+        release.set()
+        refresher.wait(5)
+
+        assert len(calls) == 1
+        assert refresher.stats["background_started"] == 1
+
+    def test_hard_stale_blocks_on_refresh(self):
+        timer = FakeTimer()
+        refresher, applied = _refresher(timer=timer)
+        timer.now += 700
+
+        assert refresher.ensure_fresh() == "blocked"
+        assert applied == ["snapshot"]
+        assert refresher.ensure_fresh() == "fresh"
+
+    def test_mark_stale_forces_blocking_refresh(self):
+        refresher, applied = _refresher()
+        refresher.mark_stale()
+        assert refresher.ensure_fresh() == "blocked"
+        assert applied == ["snapshot"]
+
+    def test_failure_keeps_data_and_backs_off(self):
+        timer = FakeTimer()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            raise RuntimeError("S3 down")
+
+        refresher, applied = _refresher(fetch=fetch, timer=timer, retry_interval=30)
+        timer.now += 700
+        assert refresher.ensure_fresh() == "blocked"
+        assert applied == []
+        assert refresher.last_error is not None
+
+        timer.now += 10
+        assert refresher.ensure_fresh() == "backoff"
+        assert len(calls) == 1
+
+        timer.now += 30
+        refresher.ensure_fresh()
+        assert len(calls) == 2
+
+    def test_older_attempt_cannot_overwrite_newer_data(self):
+        timer = FakeTimer()
+        release = threading.Event()
+        results = iter(["old", "new"])
+
+        def fetch():
+            value = next(results)
+            if value == "old":
+                release.wait(5)
+            return value
+
+        refresher, applied = _refresher(fetch=fetch, timer=timer, join_timeout=0)
+        timer.now += 120
+        refresher.ensure_fresh()  # background attempt fetching "old", stalled
+        timer.now += 600
+        refresher.ensure_fresh()  # blocking attempt installs "new"
+        release.set()
+        refresher.wait(5)
+
+        assert applied == ["new"]
+
+
+# ---------------------------------------------------------------------------
+# lambda_function wiring
+# ---------------------------------------------------------------------------
+
+
+def _not_found(key):
+    return ClientError({"Error": {"Code": "NoSuchKey", "Message": key}}, "GetObject")
+
+
+@pytest.fixture
+def restore_skill_data():
+    saved = (
+        lambda_function.worldList,
+        lambda_function.nextMonthWorldList,
+        lambda_function.challengeData,
+        lambda_function.dataManifest,
+        dict(lambda_function.dataVersions),
+    )
+    yield
+    (
+        lambda_function.worldList,
+        lambda_function.nextMonthWorldList,
+        lambda_function.challengeData,
+        lambda_function.dataManifest,
+        versions,
+    ) = saved
+    lambda_function.dataVersions.clear()
+    lambda_function.dataVersions.update(versions)
+
+
+class TestSkillDataRefresh:
+    def test_conditional_fetch_uses_known_etags(self, restore_skill_data):
+        lambda_function.dataVersions.clear()
+        lambda_function.dataVersions["worldList"] = {
+            "key": "GuestWorlds.csv",
+            "etag": '"abc"',
+        }
+        seen = {}
+
+        def fake_get(key, etag=None):
+            seen[key] = etag
+            if key == "GuestWorlds.csv":
+                return None, etag
+            if key == "WeeklyChallenges.json":
+                return b'{"2026-02": {}}', '"def"'
+            raise _not_found(key)
+
+        with patch.object(lambda_function, "_get_s3_object", side_effect=fake_get):
+            updates = lambda_function._fetch_data_updates()
+
+        assert seen["GuestWorlds.csv"] == '"abc"'
+        assert seen["WeeklyChallenges.json"] is None
+        by_name = {name: value for name, _, value, _ in updates}
+        assert by_name["worldList"] is lambda_function._UNCHANGED
+        assert by_name["nextMonthWorldList"] is None
+        assert by_name["challengeData"] == {"2026-02": {}}
+
+    def test_apply_swaps_only_changed_datasets(self, restore_skill_data):
+        original_world_list = lambda_function.worldList
+        lambda_function._apply_data_updates(
+            [
+                ("worldList", "GuestWorlds.csv", lambda_function._UNCHANGED, '"a"'),
+                ("challengeData", "WeeklyChallenges.json", {"k": 1}, '"b"'),
+            ]
+        )
+        assert lambda_function.worldList is original_world_list
+        assert lambda_function.challengeData == {"k": 1}
+        assert lambda_function.dataVersions["challengeData"]["etag"] == '"b"'
+
+    def test_failed_dataset_keeps_current_value(self, restore_skill_data):
+        def fake_get(key, etag=None):
+            if key == "GuestWorlds.csv":
+                raise ClientError(
+                    {"Error": {"Code": "500", "Message": "boom"}}, "GetObject"
+                )
+            if key == "WeeklyChallenges.json":
+                return None, etag
+            raise _not_found(key)
+
+        with patch.object(lambda_function, "_get_s3_object", side_effect=fake_get):
+            updates = lambda_function._fetch_data_updates()
+
+        assert "worldList" not in {name for name, _, _, _ in updates}
+
+    def test_every_dataset_failing_raises(self, restore_skill_data):
+        with (
+            patch.object(
+                lambda_function, "_get_s3_object", side_effect=ConnectionError("down")
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            lambda_function._fetch_data_updates()
+
+    def test_get_s3_object_uses_the_shared_client(self):
+        client = MagicMock()
+        client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "304", "Message": "Not Modified"}}, "GetObject"
+        )
+        with patch.object(lambda_function, "_s3_client", client):
+            assert lambda_function._get_s3_object("k.csv", '"e1"') == (None, '"e1"')
+            client.get_object.side_effect = None
+            client.get_object.return_value = {
+                "Body": MagicMock(read=MagicMock(return_value=b"x")),
+                "ETag": '"e2"',
+            }
+            assert lambda_function._get_s3_object("k.csv") == (b"x", '"e2"')
+
+        assert client.get_object.call_args_list[0].kwargs == {
+            "Bucket": lambda_function.S3_BUCKET,
+            "Key": "k.csv",
+            "IfNoneMatch": '"e1"',
+        }
+        assert "IfNoneMatch" not in client.get_object.call_args.kwargs
+
+
+def _manifest(**etags):
+    objects = {key: {"etag": etag, "sha256": None} for key, etag in etags.items()}
+    return json.dumps({"version": 1, "objects": objects}).encode("utf-8")
+
+
+class TestManifestRefresh:
+    @pytest.fixture(autouse=True)
+    def loaded(self, restore_skill_data):
+        lambda_function.dataVersions.clear()
+        lambda_function.dataVersions["worldList"] = {
+            "key": "GuestWorlds.csv",
+            "etag": '"w1"',
+        }
+        lambda_function.dataManifest = None
+        with (
+            patch.object(lambda_function, "_challengeDataLoaded", False),
+            patch.object(
+                lambda_function,
+                "_next_month_world_list_key",
+                return_value="GuestWorlds202602.csv",
+            ),
+        ):
+            yield
+
+    def _refresh(self, fake_get):
+        with patch.object(
+            lambda_function, "_get_s3_object", side_effect=fake_get
+        ) as get:
+            lambda_function._apply_data_updates(lambda_function._fetch_data_updates())
+        return [c.args[0] for c in get.call_args_list]
+
+    def test_unchanged_manifest_is_the_only_request(self):
+        manifest = _manifest(**{"GuestWorlds.csv": '"w1"'})
+        self._refresh(lambda key, etag=None: (manifest, '"m1"'))
+
+        requested = self._refresh(lambda key, etag=None: (None, etag))
+
+        assert requested == ["manifest.json"]
+        assert lambda_function.dataVersions["manifest"]["etag"] == '"m1"'
+
+    def test_only_changed_datasets_are_downloaded(self):
+        def fake_get(key, etag=None):
+            if key == "manifest.json":
+                return _manifest(**{"GuestWorlds.csv": '"w2"'}), '"m2"'
+            assert key == "GuestWorlds.csv" and etag == '"w1"'
+            return b"Watopia,1\n", '"w2"'
+
+        requested = self._refresh(fake_get)
+
+        assert requested == ["manifest.json", "GuestWorlds.csv"]
+        assert lambda_function.worldList == ["IndexZero", "Watopia", ""]
+        assert lambda_function.dataVersions["worldList"]["etag"] == '"w2"'
+
+    def test_falls_back_to_each_dataset_without_a_manifest(self):
+        def fake_get(key, etag=None):
+            if key == "GuestWorlds.csv":
+                return None, etag
+            raise _not_found(key)
+
+        requested = self._refresh(fake_get)
+
+        assert requested == [
+            "manifest.json",
+            "GuestWorlds.csv",
+            "GuestWorlds202602.csv",
+        ]
+        assert "manifest" not in lambda_function.dataVersions
+
+
+# ---------------------------------------------------------------------------
+# Lazy challenge data
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def unloaded_challenge_data(restore_skill_data):
+    """Put lambda_function back into its cold-start, challenge-not-loaded state."""
+    with (
+        patch.object(lambda_function, "_challengeDataLoaded", False),
+        patch.object(lambda_function, "_challengeLoadFailedAt", None),
+        patch.object(lambda_function, "challengeData", None),
+    ):
+        yield
+
+
+class TestLazyChallengeData:
+    def test_loads_once_on_first_use(self, unloaded_challenge_data, challenge_data):
+        body = json.dumps(challenge_data).encode("utf-8")
+        with patch.object(
+            lambda_function, "_get_s3_object", return_value=(body, '"e1"')
+        ) as get:
+            assert lambda_function._get_challenge_data() == challenge_data
+            assert lambda_function._get_challenge_data() == challenge_data
+
+        get.assert_called_once_with("WeeklyChallenges.json")
+
+    def test_concurrent_first_use_loads_once(
+        self, unloaded_challenge_data, challenge_data
+    ):
+        body = json.dumps(challenge_data).encode("utf-8")
+        started = threading.Barrier(4)
+        results = []
+
+        def slow_get(key, etag=None):
+            time.sleep(0.05)
+            return body, '"e1"'
+
+        def worker():
+            started.wait(5)
+            results.append(lambda_function._get_challenge_data())
+
+        with patch.object(
+            lambda_function, "_get_s3_object", side_effect=slow_get
+        ) as get:
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(5)
+
+        assert get.call_count == 1
+        assert results == [challenge_data] * 4
+
+    def test_failed_load_is_retried_after_backoff(self, unloaded_challenge_data):
+        with (
+            patch.object(
+                lambda_function, "_get_s3_object", side_effect=ConnectionError("down")
+            ) as get,
+            patch.object(lambda_function.time, "time", return_value=1000.0),
+        ):
+            assert lambda_function._get_challenge_data() is None
+            assert lambda_function._get_challenge_data() is None
+        assert get.call_count == 1
+
+        with (
+            patch.object(
+                lambda_function, "_get_s3_object", return_value=(b"{}", None)
+            ) as get,
+            patch.object(lambda_function.time, "time", return_value=1061.0),
+        ):
+            assert lambda_function._get_challenge_data() == {}
+        assert get.call_count == 1
+
+    def test_world_intent_does_not_load_challenge_data(
+        self, unloaded_challenge_data, mock_handler_input, set_lambda_globals, world_list
+    ):
+        set_lambda_globals(day=5, lastDayOfMonth=31, worldList=world_list)
+        hi = mock_handler_input(intent_name="TodaysWorldIntent")
+        with patch.object(lambda_function, "_get_s3_object") as get:
+            lambda_function.TodaysWorldIntentHandler().handle(hi)
+        get.assert_not_called()
+
+    def test_refresh_skips_challenge_data_until_loaded(self, unloaded_challenge_data):
+        names = [name for name, _, _, _ in lambda_function._datasets()]
+        assert "challengeData" not in names
+
+    def test_prefetch_loads_in_background(
+        self, unloaded_challenge_data, challenge_data
+    ):
+        body = json.dumps(challenge_data).encode("utf-8")
+        with patch.object(
+            lambda_function, "_get_s3_object", return_value=(body, None)
+        ):
+            lambda_function._prefetch_challenge_data()
+            for _ in range(100):
+                if lambda_function._challengeDataLoaded:
+                    break
+                time.sleep(0.01)
+            assert lambda_function.challengeData == challenge_data
@@ -0,0 +1,143 @@
+"""Tests for scrapers/dataset_manifest.py."""
+
+import json
+import os
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+# Add scrapers to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
+
+import dataset_manifest
+from dataset_manifest import MANIFEST_KEY, update
+
+NOW = datetime(2026, 1, 15, 6, 0)
+
+
+def _conflict():
+    return ClientError(
+        {"Error": {"Code": "PreconditionFailed", "Message": "etag"}}, "PutObject"
+    )
+
+
+def _bucket(objects, manifest=None, manifest_etag='"m1"'):
+    """MagicMock S3 client: HEAD answers from objects, GET returns manifest."""
+    s3 = MagicMock()
+
+    def head_object(Bucket, Key):
+        if Key not in objects:
+            raise Exception("NoSuchKey")
+        etag, digest = objects[Key]
+        return {"ETag": etag, "Metadata": {"sha256": digest} if digest else {}}
+
+    def get_object(Bucket, Key):
+        if manifest is None:
+            raise Exception("NoSuchKey")
+        body = MagicMock()
+        body.read.return_value = json.dumps(manifest).encode("utf-8")
+        return {"Body": body, "ETag": manifest_etag}
+
+    s3.head_object.side_effect = head_object
+    s3.get_object.side_effect = get_object
+    return s3
+
+
+def _written(s3):
+    return json.loads(s3.put_object.call_args.kwargs["Body"])
+
+
+class TestUpdate:
+    def test_creates_manifest_for_existing_keys(self):
+        s3 = _bucket({"GuestWorlds.csv": ('"e1"', "abc")})
+
+        changed = update(
+            s3, "bucket", ["GuestWorlds.csv", "GuestWorlds202602.csv"], NOW
+        )
+
+        assert changed == ["GuestWorlds.csv"]
+        kwargs = s3.put_object.call_args.kwargs
+        assert kwargs["Key"] == MANIFEST_KEY
+        assert kwargs["IfNoneMatch"] == "*"
+        assert _written(s3) == {
+            "version": 1,
+            "updated_at": "2026-01-15T06:00:00Z",
+            "objects": {
+                "GuestWorlds.csv": {
+                    "etag": '"e1"',
+                    "sha256": "abc",
+                    "updated_at": "2026-01-15T06:00:00Z",
+                }
+            },
+        }
+
+    def test_current_manifest_is_not_rewritten(self):
+        manifest = {
+            "objects": {
+                "WeeklyChallenges.json": {
+                    "etag": '"e1"',
+                    "sha256": None,
+                    "updated_at": "2026-01-01T00:00:00Z",
+                }
+            }
+        }
+        s3 = _bucket({"WeeklyChallenges.json": ('"e1"', None)}, manifest)
+
+        assert update(s3, "bucket", ["WeeklyChallenges.json"], NOW) == []
+        s3.put_object.assert_not_called()
+
+    def test_keeps_other_writers_entries_and_matches_etag(self):
+        manifest = {"objects": {"WeeklyChallenges.json": {"etag": '"c1"'}}}
+        s3 = _bucket({"GuestWorlds.csv": ('"e2"', "def")}, manifest)
+
+        update(s3, "bucket", ["GuestWorlds.csv"], NOW)
+
+        assert s3.put_object.call_args.kwargs["IfMatch"] == '"m1"'
+        assert set(_written(s3)["objects"]) == {
+            "GuestWorlds.csv",
+            "WeeklyChallenges.json",
+        }
+
+    def test_retries_when_another_writer_wins(self):
+        s3 = _bucket({"GuestWorlds.csv": ('"e1"', "abc")})
+        s3.put_object.side_effect = [_conflict(), None]
+
+        assert update(s3, "bucket", ["GuestWorlds.csv"], NOW) == ["GuestWorlds.csv"]
+        assert s3.put_object.call_count == 2
+        assert s3.get_object.call_count == 2
+
+    def test_gives_up_after_max_attempts(self):
+        s3 = _bucket({"GuestWorlds.csv": ('"e1"', "abc")})
+        s3.put_object.side_effect = _conflict()
+
+        with pytest.raises(RuntimeError):
+            update(s3, "bucket", ["GuestWorlds.csv"], NOW)
+        assert s3.put_object.call_count == dataset_manifest.MAX_ATTEMPTS
+
+    def test_other_put_errors_propagate(self):
+        s3 = _bucket({"GuestWorlds.csv": ('"e1"', "abc")})
+        s3.put_object.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied", "Message": "no"}}, "PutObject"
+        )
+
+        with pytest.raises(ClientError):
+            update(s3, "bucket", ["GuestWorlds.csv"], NOW)
+        assert s3.put_object.call_count == 1
+
+    def test_unreadable_manifest_is_replaced(self):
+        s3 = _bucket({"GuestWorlds.csv": ('"e1"', "abc")}, manifest=["not", "a"])
+
+        update(s3, "bucket", ["GuestWorlds.csv"], NOW)
+
+        assert s3.put_object.call_args.kwargs["IfMatch"] == '"m1"'
+        assert list(_written(s3)["objects"]) == ["GuestWorlds.csv"]
+
+    def test_no_existing_keys_touches_nothing(self):
+        s3 = _bucket({})
+
+        assert update(s3, "bucket", ["GuestWorlds.csv"], NOW) == []
+        s3.get_object.assert_not_called()
+        s3.put_object.assert_not_called()
@@ -0,0 +1,82 @@
+"""Tests for the operator diagnostics event handled by lambda_function."""
+
+import json
+import os
+from unittest.mock import patch
+
+import lambda_function
+
+
+def _invoke(event, token="s3cret"):
+    with (
+        patch.dict("os.environ"),
+        patch.object(lambda_function, "_skill_lambda_handler") as skill,
+    ):
+        os.environ.pop("DIAGNOSTICS_TOKEN", None)
+        if token:
+            os.environ["DIAGNOSTICS_TOKEN"] = token
+        result = lambda_function.lambda_handler(event, None)
+    skill.assert_not_called()
+    return result
+
+
+class TestDiagnosticsGuard:
+    def test_disabled_without_configured_token(self):
+        result = _invoke({"guestworldDiagnostics": {"token": "anything"}}, token=None)
+        assert result["statusCode"] == 404
+        assert "diagnostics" not in result
+
+    def test_wrong_token_is_rejected(self):
+        result = _invoke({"guestworldDiagnostics": {"token": "guess"}})
+        assert result == {"statusCode": 403, "error": "forbidden"}
+
+    def test_non_ascii_token_is_rejected(self):
+        result = _invoke({"guestworldDiagnostics": {"token": "s3crét"}})
+        assert result == {"statusCode": 403, "error": "forbidden"}
+
+    def test_non_ascii_configured_token_is_accepted(self):
+        with patch.object(lambda_function, "_diagnostics_report", return_value={}):
+            result = _invoke({"guestworldDiagnostics": {"token": "s3crét"}}, "s3crét")
+        assert result == {"statusCode": 200, "diagnostics": {}}
+
+    def test_missing_token_is_rejected(self):
+        result = _invoke({"guestworldDiagnostics": {}})
+        assert result["statusCode"] == 403
+
+    def test_alexa_requests_are_not_diagnostics(self):
+        with (
+            patch.object(lambda_function, "_skill_lambda_handler") as skill,
+            patch.object(lambda_function.dataRefresher, "ensure_fresh"),
+        ):
+            skill.return_value = {"version": "1.0"}
+            result = lambda_function.lambda_handler({"request": {}}, None)
+        assert result == {"version": "1.0"}
+
+
+class TestDiagnosticsReport:
+    def test_report_contents(self):
+        result = _invoke({"guestworldDiagnostics": {"token": "s3cret"}})
+        assert result["statusCode"] == 200
+        report = result["diagnostics"]
+
+        assert report["data"]["world_list_days"] == len(lambda_function.worldList) - 1
+        assert "worldList" in report["data"]["versions"]
+        assert set(report["caches"]) == {"world_ids", "date_facts", "month_length"}
+        assert report["slot_table"]["slots"] > 0
+        assert report["refresher"]["stats"].keys() == (
+            lambda_function.dataRefresher.stats.keys()
+        )
+        assert report["container"]["max_rss_kb"] > 0
+        # The report is returned straight to the invoker, so it must serialize.
+        json.dumps(result)
+
+    def test_cache_hit_ratio(self):
+        lambda_function._world_ids.cache_clear()
+        lambda_function._world_ids("London and Yorkshire")
+        lambda_function._world_ids("London and Yorkshire")
+        stats = lambda_function._cache_stats(lambda_function._world_ids)
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+    def test_empty_cache_has_no_ratio(self):
+        lambda_function._world_ids.cache_clear()
+        assert lambda_function._cache_stats(lambda_function._world_ids)["hit_ratio"] is None
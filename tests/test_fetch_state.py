@@ -0,0 +1,142 @@
+"""Tests for scrapers/fetch_state.py."""
+
+import io
+import json
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests.exceptions import HTTPError
+
+# Add scrapers to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
+
+from fetch_state import FetchState
+
+
+class FakeS3:
+    """Just enough of an S3 client for get_object/put_object round trips."""
+
+    def __init__(self):
+        self.objects = {}
+        self.puts = []
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise Exception("NoSuchKey")
+        return {"Body": io.BytesIO(self.objects[Key].encode("utf-8"))}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+        self.puts.append(Key)
+
+
+def _response(status=200, body=b"<html>v1</html>", etag='"v1"', last_modified=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.content = body
+    headers = {}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    resp.headers = headers
+    if status >= 400:
+        resp.raise_for_status.side_effect = HTTPError(str(status))
+    return resp
+
+
+URL = "https://example.com/schedule"
+
+
+class TestFetchState:
+    def test_first_fetch_is_changed_and_unconditional(self):
+        state = FetchState(FakeS3(), "bucket", "test").load()
+        with patch("http_fetch.get", return_value=_response()) as get:
+            result = state.fetch(URL)
+        assert result.changed
+        assert get.call_args.kwargs["headers"] is None
+
+    def test_validators_are_sent_after_commit_and_save(self):
+        s3 = FakeS3()
+        state = FetchState(s3, "bucket", "test").load()
+        with patch(
+            "http_fetch.get",
+            return_value=_response(last_modified="Mon, 02 Feb 2026 00:00:00 GMT"),
+        ):
+            state.fetch(URL)
+        state.commit(URL, days=28)
+        assert state.save()
+        assert s3.puts == ["scraper-state/test.json"]
+
+        reloaded = FetchState(s3, "bucket", "test").load()
+        assert reloaded.entry(URL)["days"] == 28
+        with patch("http_fetch.get", return_value=_response(status=304)) as get:
+            result = reloaded.fetch(URL)
+        assert get.call_args.kwargs["headers"] == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 02 Feb 2026 00:00:00 GMT",
+        }
+        assert not result.changed
+        assert result.response is None
+        assert not reloaded.save()
+
+    def test_uncommitted_changes_are_not_saved(self):
+        s3 = FakeS3()
+        state = FetchState(s3, "bucket", "test").load()
+        with patch("http_fetch.get", return_value=_response()):
+            state.fetch(URL)
+        # The caller failed before commit(): next run must reprocess.
+        assert not state.save()
+        assert s3.puts == []
+
+    def test_identical_body_is_unchanged(self):
+        s3 = FakeS3()
+        state = FetchState(s3, "bucket", "test").load()
+        with patch("http_fetch.get", return_value=_response(etag=None)):
+            state.fetch(URL)
+        state.commit(URL)
+        state.save()
+
+        state = FetchState(s3, "bucket", "test").load()
+        with patch("http_fetch.get", return_value=_response(etag='"new"')):
+            result = state.fetch(URL)
+        assert not result.changed
+        assert result.response is not None
+        # The new ETag is kept so the next run can get a 304.
+        assert state.save()
+        assert state.entry(URL)["etag"] == '"new"'
+
+    def test_force_ignores_validators(self):
+        s3 = FakeS3()
+        s3.objects["scraper-state/test.json"] = json.dumps(
+            {URL: {"etag": '"v1"', "sha256": "x"}}
+        )
+        state = FetchState(s3, "bucket", "test").load()
+        with patch("http_fetch.get", return_value=_response()) as get:
+            result = state.fetch(URL, force=True)
+        assert result.changed
+        assert get.call_args.kwargs["headers"] is None
+
+    def test_http_errors_propagate(self):
+        state = FetchState(FakeS3(), "bucket", "test").load()
+        with (
+            patch("http_fetch.get", return_value=_response(status=500)),
+            pytest.raises(HTTPError),
+        ):
+            state.fetch(URL)
+
+    def test_non_string_headers_are_ignored(self):
+        state = FetchState(FakeS3(), "bucket", "test").load()
+        resp = _response()
+        resp.headers = MagicMock()
+        with patch("http_fetch.get", return_value=resp):
+            state.fetch(URL)
+        state.commit(URL)
+        assert state.entry(URL)["etag"] is None
+
+    def test_unreadable_state_object_is_empty(self):
+        s3 = FakeS3()
+        s3.objects["scraper-state/test.json"] = "not json"
+        assert FetchState(s3, "bucket", "test").load().entry(URL) == {}
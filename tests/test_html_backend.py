@@ -0,0 +1,166 @@
+"""Parity tests: every HTML parser backend yields identical scraper output."""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add scrapers to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
+
+import html_backend
+from challenge_scraper_core import (
+    parse_challenge_calendar_html,
+    parse_route_detail_page,
+)
+from guestworld_scraper_core import parse_calendar_html
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+CASES = [
+    (parse_calendar_html, "guestworld_calendar.html"),
+    (parse_challenge_calendar_html, "challenge_calendar.html"),
+    (parse_route_detail_page, "route_detail.html"),
+]
+
+
+def _parse_with(backend, parse, content):
+    with patch.object(html_backend, "BACKEND", backend):
+        return parse(content)
+
+
+@pytest.mark.parametrize("backend", html_backend.available_backends())
+@pytest.mark.parametrize("parse, fixture", CASES, ids=[c[1] for c in CASES])
+class TestBackendParity:
+    def test_bytes_match_reference(self, backend, parse, fixture):
+        content = _fixture(fixture)
+        expected = _parse_with("html.parser", parse, content)
+        assert expected  # the fixture exercises the parser
+        assert _parse_with(backend, parse, content) == expected
+
+    def test_text_matches_reference(self, backend, parse, fixture):
+        content = _fixture(fixture).decode("utf-8")
+        expected = _parse_with("html.parser", parse, content)
+        assert _parse_with(backend, parse, content) == expected
+
+
+class TestFixtureContents:
+    """Pin the reference output so parity cannot pass by all backends breaking."""
+
+    def test_guestworld_calendar(self):
+        days = parse_calendar_html(_fixture("guestworld_calendar.html"))
+        assert len(days) == 27  # the 14th has no worlds listed
+        assert days[0] == (1, ["Yorkshire", "London"])
+        assert 14 not in [d for d, _ in days]
+
+    def test_challenge_calendar(self):
+        days = dict(parse_challenge_calendar_html(_fixture("challenge_calendar.html")))
+        assert len(days) == 28
+        assert days[1]["climb"]["name"] == "Côte de Pike"
+        # Category on the event itself, a descendant, an ancestor, or only
+        # implied by the URL all classify the same way.
+        for day in (1, 2, 3, 4):
+            assert set(days[day]) == {"route", "climb"}
+        assert days[20]["route"]["name"] == "Road to Sky"
+
+    def test_route_detail(self):
+        assert parse_route_detail_page(_fixture("route_detail.html")) == {
+            "distance_km": 17.5,
+            "distance_mi": 10.9,
+            "elevation_m": 1109.0,
+            "elevation_ft": 3638.0,
+        }
+
+
+class TestSelectBackend:
+    def test_html_parser_is_always_available(self):
+        assert "html.parser" in html_backend.available_backends()
+
+    def test_env_override(self):
+        with patch.dict("os.environ", {"SCRAPER_HTML_PARSER": "html.parser"}):
+            assert html_backend.select_backend() == "html.parser"
+
+    def test_unavailable_backend_falls_back(self):
+        assert html_backend.select_backend("selectolax") == (
+            html_backend.available_backends()[0]
+        )
+
+
+class TestFindTableByClass:
+    def test_script_string_is_not_mistaken_for_the_table(self):
+        html = (
+            '<html><head><script>var t = "<table class=\\"calendar-table\\">";'
+            "</script></head><body>"
+            '<table class="spiffy calendar-table"><tr><td>real</td></tr></table>'
+            "</body></html>"
+        )
+        table = html_backend.find_table_by_class(html, "calendar-table")
+        assert table.get_text() == "real"
+
+    def test_commented_out_table_is_skipped(self):
+        def calendar(world):
+            return (
+                '<tr><td class="day-with-date"><span class="day-number">9</span>'
+                '<span class="spiffy-title">%s</span></td></tr>' % world
+            )
+
+        html = (
+            '<html><head><style>table.calendar-table { border: 0 }</style></head>'
+            '<body><!-- <table class="calendar-table">%s</table> -->'
+            '<table class="spiffy calendar-table">%s</table>'
+            "</body></html>"
+        ) % (calendar("Paris"), calendar("London"))
+        table = html_backend.find_table_by_class(html, "calendar-table")
+        assert "spiffy" in table["class"]
+        assert parse_calendar_html(html) == [(9, ["London"])]
+
+    def test_only_the_table_subtree_is_built(self):
+        html = (
+            "<html><body><nav><a>one</a><a>two</a></nav>"
+            '<table class="calendar-table"><tr><td>cell</td></tr></table>'
+            "<footer>bye</footer></body></html>"
+        )
+        table = html_backend.find_table_by_class(html, "calendar-table")
+        root = list(table.parents)[-1]
+        assert root.find("nav") is None
+        assert root.find("footer") is None
+
+    def test_nested_tables_are_kept_whole(self):
+        html = (
+            '<table class="calendar-table"><tr><td>'
+            "<table><tr><td>inner</td></tr></table>"
+            "</td><td>after</td></tr></table>"
+        )
+        table = html_backend.find_table_by_class(html, "calendar-table")
+        assert [td.get_text() for td in table.find_all("td", recursive=True)][-1] == (
+            "after"
+        )
+
+    def test_unquoted_class_falls_back_to_full_parse(self):
+        html = "<table class=calendar-table><tr><td>x</td></tr></table>"
+        table = html_backend.find_table_by_class(html, "calendar-table")
+        assert table is not None
+        assert table.get_text() == "x"
+
+    def test_class_must_match_a_whole_token(self):
+        html = '<table class="not-calendar-table-at-all"><tr><td>x</td></tr></table>'
+        assert html_backend.find_table_by_class(html, "calendar-table") is None
+
+    def test_missing_table_returns_none(self):
+        assert html_backend.find_table_by_class(b"<html></html>", "calendar-table") is None
+
+    def test_declared_encoding_is_honoured(self):
+        html = (
+            '<html><head><meta charset="windows-1252"></head><body>'
+            '<table class="calendar-table"><tr><td>C\xf4te</td></tr></table>'
+            "</body></html>"
+        ).encode("windows-1252")
+        table = html_backend.find_table_by_class(html, "calendar-table")
+        assert table.get_text() == "Côte"
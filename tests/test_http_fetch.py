@@ -0,0 +1,267 @@
+"""Tests for scrapers/http_fetch.py against a local HTTP server."""
+
+import gzip
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+# Add scrapers to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
+
+import http_fetch
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # path -> list of status codes to return, in order; last one repeats
+    script = {}
+    hits = {}
+    headers_seen = []
+    retry_after = {}  # path -> Retry-After value sent with 429/503
+    delay = {}  # path -> seconds to wait before answering
+    in_flight = [0, 0]  # [now, peak]
+    lock = threading.Lock()
+
+    def do_GET(self):
+        statuses = self.script.get(self.path, [200])
+        with self.lock:
+            count = self.hits.get(self.path, 0)
+            self.hits[self.path] = count + 1
+            self.in_flight[0] += 1
+            self.in_flight[1] = max(self.in_flight)
+        self.headers_seen.append(dict(self.headers))
+        status = statuses[min(count, len(statuses) - 1)]
+        time.sleep(self.delay.get(self.path, 0))
+        with self.lock:
+            self.in_flight[0] -= 1
+
+        body = b"<html>ok</html>"
+        self.send_response(status)
+        if status in (429, 503) and self.path in self.retry_after:
+            self.send_header("Retry-After", self.retry_after[self.path])
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.script = {}
+    _Handler.hits = {}
+    _Handler.headers_seen = []
+    _Handler.retry_after = {}
+    _Handler.delay = {}
+    _Handler.in_flight = [0, 0]
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    with patch.object(http_fetch, "RETRY_BACKOFF_FACTOR", 0):
+        http_fetch.reset_session()
+        yield "http://127.0.0.1:%d" % httpd.server_address[1]
+        http_fetch.reset_session()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestSharedSession:
+    def test_session_is_reused(self):
+        http_fetch.reset_session()
+        try:
+            assert http_fetch.get_session() is http_fetch.get_session()
+        finally:
+            http_fetch.reset_session()
+
+    def test_gzip_body_is_decoded(self, server):
+        resp = http_fetch.get(server + "/page")
+        assert resp.status_code == 200
+        assert resp.content == b"<html>ok</html>"
+        assert "gzip" in _Handler.headers_seen[0]["Accept-Encoding"]
+
+
+class TestRetries:
+    def test_5xx_is_retried(self, server):
+        _Handler.script["/flaky"] = [503, 502, 200]
+        resp = http_fetch.get(server + "/flaky")
+        assert resp.status_code == 200
+        assert _Handler.hits["/flaky"] == 3
+
+    def test_persistent_5xx_is_returned_to_caller(self, server):
+        _Handler.script["/down"] = [500]
+        resp = http_fetch.get(server + "/down")
+        assert resp.status_code == 500
+        assert _Handler.hits["/down"] == http_fetch.RETRY_TOTAL + 1
+
+    def test_4xx_is_not_retried(self, server):
+        _Handler.script["/missing"] = [404]
+        resp = http_fetch.get(server + "/missing")
+        assert resp.status_code == 404
+        assert _Handler.hits["/missing"] == 1
+
+
+class TestJitteredBackoff:
+    def test_backoff_is_bounded_by_exponential_delay(self):
+        retry = http_fetch._JitteredRetry(total=5, backoff_factor=1)
+        for _ in range(3):
+            retry = retry.increment(method="GET", url="/")
+        ceiling = http_fetch.Retry(total=5, backoff_factor=1)
+        for _ in range(3):
+            ceiling = ceiling.increment(method="GET", url="/")
+        for _ in range(20):
+            assert 0 <= retry.get_backoff_time() <= ceiling.get_backoff_time()
+
+    def test_no_backoff_before_first_retry(self):
+        assert http_fetch._JitteredRetry(total=3, backoff_factor=1).get_backoff_time() == 0
+
+
+class TestThrottling:
+    def test_429_is_retried_after_retry_after(self, server):
+        _Handler.script["/busy"] = [429, 200]
+        _Handler.retry_after["/busy"] = "1"
+        started = time.monotonic()
+        resp = http_fetch.get(server + "/busy")
+        assert resp.status_code == 200
+        assert _Handler.hits["/busy"] == 2
+        assert time.monotonic() - started >= 0.9
+
+    def test_long_retry_after_is_returned_to_caller(self, server):
+        _Handler.script["/closed"] = [503]
+        _Handler.retry_after["/closed"] = "3600"
+        resp = http_fetch.get(server + "/closed")
+        assert resp.status_code == 503
+        assert _Handler.hits["/closed"] == 1
+
+    def test_throttled_retry_goes_through_the_limiter(self, server):
+        _Handler.script["/busy"] = [503, 200]
+        _Handler.retry_after["/busy"] = "0"
+        assert http_fetch.get(server + "/busy").status_code == 200
+        # Halved by the 503, then one healthy step: urllib3 did not retry it.
+        limiter = http_fetch._limiter_for(server)
+        assert limiter.rate == http_fetch.RATE_INITIAL / 2 + http_fetch.RATE_STEP
+
+    def test_retry_after_past_the_timeout_is_returned(self, server):
+        _Handler.script["/later"] = [429]
+        _Handler.retry_after["/later"] = "5"
+        started = time.monotonic()
+        resp = http_fetch.get(server + "/later", timeout=1)
+        assert resp.status_code == 429
+        assert _Handler.hits["/later"] == 1
+        assert time.monotonic() - started < 1
+
+    def test_limiter_wait_counts_against_timeout(self, server):
+        limiter = http_fetch._limiter_for(server)
+        limiter.limit = 1.0
+        assert limiter.acquire(0)
+        started = time.monotonic()
+        with pytest.raises(requests.exceptions.Timeout):
+            http_fetch.get(server + "/page", timeout=0.3)
+        assert time.monotonic() - started < 1
+        assert "/page" not in _Handler.hits
+
+    def test_concurrent_requests_to_a_host_are_capped(self, server):
+        _Handler.delay["/slow"] = 0.1
+        threads = [
+            threading.Thread(target=http_fetch.get, args=(server + "/slow",))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+        assert _Handler.hits["/slow"] == 8
+        assert _Handler.in_flight[1] <= http_fetch.CONCURRENCY_INITIAL + 1
+
+    def test_persistent_429_is_returned_to_caller(self, server):
+        _Handler.script["/limited"] = [429]
+        resp = http_fetch.get(server + "/limited")
+        assert resp.status_code == 429
+        assert _Handler.hits["/limited"] == http_fetch.RETRY_TOTAL + 1
+
+    def test_retry_after_http_date(self):
+        resp = MagicMock()
+        resp.headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        assert http_fetch._retry_after_seconds(resp) == 0.0
+        resp.headers = {"Retry-After": "soon"}
+        assert http_fetch._retry_after_seconds(resp) is None
+        resp.headers = {}
+        assert http_fetch._retry_after_seconds(resp) is None
+
+
+class TestHostLimiter:
+    def test_in_flight_requests_are_capped(self):
+        limiter = http_fetch.HostLimiter()
+        for _ in range(http_fetch.CONCURRENCY_INITIAL):
+            assert limiter.acquire(0)
+        assert not limiter.acquire(0)
+        limiter.release(200, 0.1)
+        assert limiter.acquire(0)
+
+    def test_token_bucket_caps_the_burst(self):
+        limiter = http_fetch.HostLimiter()
+        limiter.limit = float(http_fetch.BURST + 5)
+        for _ in range(http_fetch.BURST):
+            assert limiter.acquire(0)
+        assert not limiter.acquire(0)
+        # Tokens refill at `rate` per second.
+        assert limiter.acquire(2 / limiter.rate)
+
+    def test_healthy_responses_ramp_up(self):
+        limiter = http_fetch.HostLimiter()
+        for _ in range(50):
+            assert limiter.acquire(1)
+            limiter.release(200, 0.05)
+        assert limiter.limit > http_fetch.CONCURRENCY_INITIAL + 2
+        assert limiter.rate > http_fetch.RATE_INITIAL
+
+    def test_slow_responses_do_not_ramp_up(self):
+        limiter = http_fetch.HostLimiter()
+        for _ in range(5):
+            assert limiter.acquire(1)
+            limiter.release(200, http_fetch.LATENCY_TARGET + 1)
+        assert limiter.limit < http_fetch.CONCURRENCY_INITIAL
+        assert limiter.rate == http_fetch.RATE_INITIAL
+
+    def test_fast_server_errors_are_not_healthy(self):
+        limiter = http_fetch.HostLimiter()
+        assert limiter.acquire(0)
+        limiter.release(502, 0.01)
+        assert limiter.limit < http_fetch.CONCURRENCY_INITIAL
+        assert limiter.rate == http_fetch.RATE_INITIAL
+
+    def test_throttling_halves_and_pauses(self):
+        limiter = http_fetch.HostLimiter()
+        assert limiter.acquire(0)
+        limiter.release(429, 0.05, retry_after=0.3)
+        assert limiter.rate == http_fetch.RATE_INITIAL / 2
+        assert limiter.limit == http_fetch.CONCURRENCY_INITIAL / 2
+        assert not limiter.acquire(0.1)
+        started = time.monotonic()
+        assert limiter.acquire(1)
+        assert time.monotonic() - started > 0.1
+
+    def test_waiters_wake_when_a_slot_frees(self):
+        limiter = http_fetch.HostLimiter()
+        limiter.limit = 1.0
+        assert limiter.acquire(0)
+        threading.Timer(0.1, limiter.release, args=(200, 0.05)).start()
+        assert limiter.acquire(2)
+
+    def test_limiters_are_per_host(self, server):
+        assert http_fetch._limiter_for(server + "/a") is http_fetch._limiter_for(
+            server + "/b"
+        )
+        assert http_fetch._limiter_for(server + "/a") is not http_fetch._limiter_for(
+            "https://example.com/a"
+        )
@@ -254,6 +254,20 @@ class TestWhenWorldIntentHandler:
         spoken = hi.response_builder.speak.call_args[0][0]
         assert "available now" in spoken
 
+    def test_matches_data_source_spelling(
+        self, mock_handler_input, set_lambda_globals, world_list
+    ):
+        # Calendar data spelled "NEWYORK" still matches the canonical slot value
+        world_list[12] = "NEWYORK and Richmond"
+        set_lambda_globals(day=12, lastDayOfMonth=31, worldList=world_list)
+        hi = mock_handler_input(intent_name="WhenWorldIntent", slot_value="New York")
+        handler = lambda_function.WhenWorldIntentHandler()
+
+        handler.handle(hi)
+
+        spoken = hi.response_builder.speak.call_args[0][0]
+        assert "available now" in spoken
+
     def test_slot_resolution_failure(
         self, mock_handler_input, set_lambda_globals, world_list
     ):
@@ -1709,6 +1723,32 @@ class TestWeeklyChallengeIntentHandler:
         assert "Legends and Lava" in spoken
         assert "500 XP" in spoken
 
+    def test_slot_raw_synonym_is_canonicalized(
+        self, mock_handler_input, set_lambda_globals, challenge_data
+    ):
+        """A raw synonym like 'weekly climb' maps to its canonical slot value."""
+        cd = copy.deepcopy(challenge_data)
+        set_lambda_globals(
+            day=3,
+            lastDayOfMonth=28,
+            challengeData=cd,
+            nowInEastern=datetime(2026, 2, 3, 12, 0, 0),
+        )
+        hi = mock_handler_input(
+            intent_name="WeeklyChallengeIntent", challenge_type="climb of the week"
+        )
+        slot = MagicMock()
+        slot.resolutions = None
+        slot.value = "Weekly  Climb"
+        hi.request_envelope.request.intent.slots["challengeType"] = slot
+        handler = lambda_function.WeeklyChallengeIntentHandler()
+
+        handler.handle(hi)
+
+        spoken = hi.response_builder.speak.call_args[0][0]
+        assert "Hardknott Pass" in spoken
+        assert "Legends and Lava" not in spoken
+
     def test_overview_includes_distance_and_elevation(
         self, mock_handler_input, set_lambda_globals, challenge_data
     ):
@@ -0,0 +1,57 @@
+"""Tests for scrapers/phase_timer.py."""
+
+import io
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add scrapers to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
+
+from phase_timer import METRIC_NAMESPACE, PhaseTimer
+
+
+class TestPhaseTimer:
+    def test_repeated_phases_accumulate(self):
+        timer = PhaseTimer("test")
+        timer.add("fetch", 0.25)
+        timer.add("fetch", 0.5)
+        timer.add("parse", 0.0004)
+        assert timer.as_dict() == {"fetch": 0.75, "parse": 0.0}
+
+    def test_phase_is_recorded_when_block_raises(self):
+        timer = PhaseTimer("test")
+        with (
+            patch("phase_timer.time.perf_counter", side_effect=[10.0, 12.5]),
+            pytest.raises(RuntimeError),
+        ):
+            with timer.phase("s3_publish"):
+                raise RuntimeError("boom")
+        assert timer.as_dict() == {"s3_publish": 2.5}
+
+    def test_emit_writes_one_emf_line(self):
+        timer = PhaseTimer("guestworld")
+        timer.add("ssm", 0.012)
+        timer.add("total", 1.5)
+        stream = io.StringIO()
+        with patch("phase_timer.time.time", return_value=1700000000.123):
+            timer.emit(stream=stream, Status="ok")
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 1
+        record = json.loads(lines[0])
+        assert record["_aws"]["Timestamp"] == 1700000000123
+        directive = record["_aws"]["CloudWatchMetrics"][0]
+        assert directive["Namespace"] == METRIC_NAMESPACE
+        assert directive["Dimensions"] == [["Pipeline"]]
+        assert directive["Metrics"] == [
+            {"Name": "ssm", "Unit": "Seconds"},
+            {"Name": "total", "Unit": "Seconds"},
+        ]
+        assert record["Pipeline"] == "guestworld"
+        assert record["Status"] == "ok"
+        assert record["ssm"] == 0.012
+        assert record["total"] == 1.5
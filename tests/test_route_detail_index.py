@@ -0,0 +1,84 @@
+"""Tests for scrapers/route_detail_index.py."""
+
+import io
+import json
+import os
+import sys
+
+# Add scrapers to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
+
+from route_detail_index import INDEX_KEY, RouteDetailIndex, normalize_name
+
+
+class FakeS3:
+    """Just enough of an S3 client for get_object/put_object round trips."""
+
+    def __init__(self):
+        self.objects = {}
+        self.puts = []
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise Exception("NoSuchKey")
+        return {"Body": io.BytesIO(self.objects[Key].encode("utf-8"))}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+        self.puts.append((Key, kwargs))
+
+
+DETAIL = {"distance_km": 17.5, "distance_mi": 10.9, "elevation_m": 338}
+URL = "/route/tick-tock/"
+
+
+class TestRouteDetailIndex:
+    def test_missing_object_is_empty_and_not_loaded(self):
+        index = RouteDetailIndex(FakeS3(), "bucket").load()
+        assert not index.loaded
+        assert len(index) == 0
+        assert index.lookup(URL, "Tick Tock") == (None, False)
+
+    def test_record_save_and_reload_by_url_and_name(self):
+        s3 = FakeS3()
+        index = RouteDetailIndex(s3, "bucket", clock=lambda: 1000).load()
+        index.record(URL, "Tick  Tock", DETAIL)
+        assert index.save()
+        assert s3.puts[0][0] == INDEX_KEY
+        assert "ACL" not in s3.puts[0][1]
+
+        reloaded = RouteDetailIndex(s3, "bucket", clock=lambda: 2000).load()
+        assert reloaded.loaded
+        assert reloaded.lookup(URL, "") == (DETAIL, True)
+        assert reloaded.lookup("/other/", "tick tock") == (DETAIL, True)
+        assert not reloaded.save()
+
+    def test_entries_past_ttl_are_stale(self):
+        now = [1000]
+        index = RouteDetailIndex(
+            FakeS3(), "bucket", ttl_seconds=60, clock=lambda: now[0]
+        )
+        index.record(URL, "Tick Tock", DETAIL)
+        now[0] += 59
+        assert index.lookup(URL, "Tick Tock")[1] is True
+        now[0] += 1
+        assert index.lookup(URL, "Tick Tock") == (DETAIL, False)
+
+    def test_seed_does_not_overwrite_recorded_entries(self):
+        index = RouteDetailIndex(FakeS3(), "bucket", clock=lambda: 0)
+        index.record(URL, "Tick Tock", DETAIL)
+        index.seed(
+            {"tick tock": {"distance_km": 1.0}, "hardknott": {"elevation_m": 5}}
+        )
+        assert index.lookup(URL, "")[0] == DETAIL
+        assert index.lookup(None, "Hardknott")[0] == {"elevation_m": 5}
+        assert len(index) == 2
+
+    def test_unknown_version_is_ignored(self):
+        s3 = FakeS3()
+        s3.objects[INDEX_KEY] = json.dumps({"version": 99, "by_name": {}, "by_url": {}})
+        assert not RouteDetailIndex(s3, "bucket").load().loaded
+
+    def test_normalize_name(self):
+        assert normalize_name("  Tick   TOCK ") == "tick tock"
+        assert normalize_name(None) == ""
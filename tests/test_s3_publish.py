@@ -0,0 +1,91 @@
+"""Tests for scrapers/s3_publish.py."""
+
+import os
+import sys
+import threading
+
+import pytest
+
+# Add scrapers to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
+
+from s3_publish import Write, publish
+
+
+class TestPublish:
+    def test_guard_reads_run_concurrently(self):
+        all_checking = threading.Barrier(3, timeout=5)
+
+        def check():
+            all_checking.wait()
+            return True
+
+        writes = [Write("a", check, lambda: None), Write("b", check, lambda: None)]
+        writes.append(Write("c", check, lambda: None, after="a"))
+        assert publish(writes)["wrote_keys"] == ["a", "b", "c"]
+
+    def test_pointer_is_written_after_its_archive(self):
+        order = []
+        archive_started = threading.Event()
+
+        def put_archive():
+            archive_started.set()
+            # Give the pointer every chance to overtake a missing dependency.
+            threading.Event().wait(0.05)
+            order.append("archive")
+
+        def check_pointer():
+            archive_started.wait(5)
+            return True
+
+        publish(
+            [
+                Write("archive", lambda: True, put_archive),
+                Write(
+                    "pointer", check_pointer, lambda: order.append("pointer"), "archive"
+                ),
+            ]
+        )
+        assert order == ["archive", "pointer"]
+
+    def test_failed_archive_blocks_pointer(self):
+        pointer_puts = []
+
+        def broken():
+            raise IOError("S3 unavailable")
+
+        result = publish(
+            [
+                Write("archive", lambda: True, broken),
+                Write("pointer", lambda: True, lambda: pointer_puts.append(1), "archive"),
+                Write("other", lambda: True, lambda: None),
+            ]
+        )
+        assert result == {
+            "wrote_keys": ["other"],
+            "skipped_keys": [],
+            "failed_keys": ["archive", "pointer"],
+        }
+        assert pointer_puts == []
+
+    def test_guard_refusal_is_skipped_and_does_not_block_dependents(self):
+        result = publish(
+            [
+                Write("archive", lambda: False, lambda: None),
+                Write("pointer", lambda: True, lambda: None, "archive"),
+            ]
+        )
+        assert result["skipped_keys"] == ["archive"]
+        assert result["wrote_keys"] == ["pointer"]
+
+    def test_dependency_must_come_first(self):
+        with pytest.raises(ValueError):
+            publish(
+                [
+                    Write("pointer", lambda: True, lambda: None, "archive"),
+                    Write("archive", lambda: True, lambda: None),
+                ]
+            )
+
+    def test_nothing_to_publish(self):
+        assert publish([]) == {"wrote_keys": [], "skipped_keys": [], "failed_keys": []}
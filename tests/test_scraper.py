@@ -1,7 +1,7 @@
 """Tests for guestworld_scraper_core and scrapers/getCalendar-writesToStdout.py.
 
 Pure-function tests for guestworld_scraper_core come first (fast, no mocking).
-CLI script tests use runpy.run_path() with patched boto3/requests.
+CLI script tests use runpy.run_path() with patched boto3/http_fetch.
 """
 
 import os
@@ -13,7 +13,12 @@ import pytest
 
 # Make guestworld_scraper_core importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
-from guestworld_scraper_core import parse_calendar_html, format_csv
+from guestworld_scraper_core import (
+    diff_calendars,
+    format_csv,
+    parse_calendar_html,
+    parse_csv,
+)
 
 
 def _build_calendar_html(world_map):
@@ -130,6 +135,57 @@ class TestFormatCsv:
         assert format_csv([]) == ""
 
 
+class TestParseCsv:
+    def test_round_trips_format_csv(self):
+        days = [(1, ["Yorkshire", "London"]), (2, ["Paris", "France"])]
+        assert parse_csv(format_csv(days)) == {
+            1: "Yorkshire and London",
+            2: "Paris and France",
+        }
+
+    def test_ignores_blank_and_malformed_lines(self):
+        assert parse_csv("Watopia,1\n\nno day here\nLondon,x\n") == {1: "Watopia"}
+
+    def test_empty_or_none(self):
+        assert parse_csv("") == {}
+        assert parse_csv(None) == {}
+
+
+class TestDiffCalendars:
+    def test_identical_calendars_are_unchanged(self):
+        csv = "Yorkshire and London,1\nParis and France,2\n"
+        diff = diff_calendars(csv, csv)
+        assert diff == {
+            "new_month": False,
+            "added_days": [],
+            "removed_days": [],
+            "changed_days": [],
+            "changed": False,
+        }
+
+    def test_reports_changed_rotation(self):
+        diff = diff_calendars(
+            "Yorkshire and London,1\nParis and France,2\n",
+            "Yorkshire and London,1\nRichmond and London,2\n",
+        )
+        assert diff["changed"] is True
+        assert diff["changed_days"] == [
+            {"day": 2, "before": "Paris and France", "after": "Richmond and London"}
+        ]
+
+    def test_reports_added_and_removed_days(self):
+        diff = diff_calendars("Watopia,1\nLondon,2\n", "Watopia,1\nParis,3\n")
+        assert diff["added_days"] == [3]
+        assert diff["removed_days"] == [2]
+        assert diff["changed"] is True
+
+    def test_no_previous_calendar_is_a_new_month(self):
+        diff = diff_calendars(None, "Watopia,1\n")
+        assert diff["new_month"] is True
+        assert diff["added_days"] == [1]
+        assert diff["changed"] is True
+
+
 # ---------------------------------------------------------------------------
 # CLI script tests (end-to-end via runpy)
 # ---------------------------------------------------------------------------
@@ -152,7 +208,7 @@ class TestScraperValidHTML:
         mock_response.content = html_content.encode("utf-8")
 
         with patch("boto3.client", return_value=mock_ssm), \
-             patch("requests.get", return_value=mock_response):
+             patch("http_fetch.get", return_value=mock_response):
             captured = StringIO()
             old_stdout = sys.stdout
             sys.stdout = captured
@@ -200,7 +256,7 @@ class TestScraperHTTPFailure:
         }
 
         with patch("boto3.client", return_value=mock_ssm), \
-             patch("requests.get", side_effect=ConnectionError("refused")), \
+             patch("http_fetch.get", side_effect=ConnectionError("refused")), \
              pytest.raises(ConnectionError):
             import runpy
             runpy.run_path(
@@ -228,7 +284,7 @@ class TestScraperEmptyCalendar:
         mock_response.content = html_content.encode("utf-8")
 
         with patch("boto3.client", return_value=mock_ssm), \
-             patch("requests.get", return_value=mock_response):
+             patch("http_fetch.get", return_value=mock_response):
             captured = StringIO()
             old_stdout = sys.stdout
             sys.stdout = captured
@@ -274,7 +330,7 @@ class TestScraperWeekendDayNumber:
         mock_response.content = html_content.encode("utf-8")
 
         with patch("boto3.client", return_value=mock_ssm), \
-             patch("requests.get", return_value=mock_response):
+             patch("http_fetch.get", return_value=mock_response):
             captured = StringIO()
             old_stdout = sys.stdout
             sys.stdout = captured
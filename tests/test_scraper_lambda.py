@@ -1,7 +1,10 @@
 """Tests for scrapers/guestworld_scraper_handler.py."""
 
+import hashlib
+import json
 import os
 import sys
+import threading
 from datetime import datetime
 from unittest.mock import MagicMock, patch, call
 
@@ -10,7 +13,7 @@ import pytest
 # Add scrapers to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
 
-from guestworld_scraper_handler import lambda_handler
+from guestworld_scraper_handler import lambda_handler, _safe_write_calendar_csv
 
 
 def _build_calendar_html(world_map):
@@ -36,6 +39,25 @@ def _build_calendar_html(world_map):
     )
 
 
+def _data_puts(mock_s3):
+    """put_object calls for calendar CSVs, ignoring fetch state and the change log."""
+    return [
+        c
+        for c in mock_s3.put_object.call_args_list
+        if not c.kwargs["Key"].startswith("scraper-state/")
+        and c.kwargs["Key"] != "GuestWorldsChanges.json"
+    ]
+
+
+def _metadata(csv_content, days, month):
+    """Object metadata the handler stores alongside each calendar CSV."""
+    return {
+        "sha256": hashlib.sha256(csv_content.encode("utf-8")).hexdigest(),
+        "days": str(days),
+        "month": month,
+    }
+
+
 class TestScraperLambdaHappyPath:
     def test_scrapes_and_writes_to_s3(self):
         """Lambda writes current files and next-month archive when available."""
@@ -80,7 +102,7 @@ class TestScraperLambdaHappyPath:
                 "guestworld_scraper_handler.boto3.client", side_effect=mock_boto3_client
             ),
             patch(
-                "guestworld_scraper_handler.requests.get", side_effect=mock_requests_get
+                "http_fetch.get", side_effect=mock_requests_get
             ),
             patch("guestworld_scraper_handler.datetime") as mock_dt,
         ):
@@ -97,29 +119,42 @@ class TestScraperLambdaHappyPath:
         assert result["next_archive_key"] == "GuestWorlds202602.csv"
 
         # Verify three S3 put_object calls (current primary, current archive, next archive)
-        put_calls = mock_s3.put_object.call_args_list
+        put_calls = _data_puts(mock_s3)
         assert len(put_calls) == 3
 
         expected_current_csv = "Yorkshire and London,1\nParis and France,2\n"
         expected_next_csv = "Scotland and New York,1\n"
-        assert put_calls[0] == call(
+        puts_by_key = {c.kwargs["Key"]: c for c in put_calls}
+        assert puts_by_key["GuestWorlds.csv"] == call(
             Bucket="guestworldskill",
             Key="GuestWorlds.csv",
             Body=expected_current_csv,
             ACL="public-read",
+            Metadata=_metadata(expected_current_csv, 2, "202601"),
         )
-        assert put_calls[1] == call(
+        assert puts_by_key["GuestWorlds202601.csv"] == call(
             Bucket="guestworldskill",
             Key="GuestWorlds202601.csv",
             Body=expected_current_csv,
             ACL="public-read",
+            Metadata=_metadata(expected_current_csv, 2, "202601"),
         )
-        assert put_calls[2] == call(
+        assert puts_by_key["GuestWorlds202602.csv"] == call(
             Bucket="guestworldskill",
             Key="GuestWorlds202602.csv",
             Body=expected_next_csv,
             ACL="public-read",
+            Metadata=_metadata(expected_next_csv, 1, "202602"),
         )
+        # The current pointer is only replaced after its archive.
+        keys = [c.kwargs["Key"] for c in put_calls]
+        assert keys.index("GuestWorlds202601.csv") < keys.index("GuestWorlds.csv")
+        assert result["wrote_keys"] == [
+            "GuestWorlds202601.csv",
+            "GuestWorlds.csv",
+            "GuestWorlds202602.csv",
+        ]
+        assert result["skipped_keys"] == []
 
 
 class TestScraperLambdaNextMonthUnavailable:
@@ -161,7 +196,7 @@ class TestScraperLambdaNextMonthUnavailable:
                 "guestworld_scraper_handler.boto3.client", side_effect=mock_boto3_client
             ),
             patch(
-                "guestworld_scraper_handler.requests.get", side_effect=mock_requests_get
+                "http_fetch.get", side_effect=mock_requests_get
             ),
             patch("guestworld_scraper_handler.datetime") as mock_dt,
         ):
@@ -173,7 +208,7 @@ class TestScraperLambdaNextMonthUnavailable:
         assert result["statusCode"] == 200
         assert result["next_month_available"] is False
         assert result["next_archive_key"] is None
-        assert len(mock_s3.put_object.call_args_list) == 2
+        assert len(_data_puts(mock_s3)) == 2
 
 
 class TestScraperLambdaNextMonthFetchFailure:
@@ -208,7 +243,7 @@ class TestScraperLambdaNextMonthFetchFailure:
                 "guestworld_scraper_handler.boto3.client", side_effect=mock_boto3_client
             ),
             patch(
-                "guestworld_scraper_handler.requests.get", side_effect=mock_requests_get
+                "http_fetch.get", side_effect=mock_requests_get
             ),
             patch("guestworld_scraper_handler.datetime") as mock_dt,
         ):
@@ -221,7 +256,7 @@ class TestScraperLambdaNextMonthFetchFailure:
         assert result["archive_key"] == "GuestWorlds202601.csv"
         assert result["next_month_available"] is False
         assert result["next_archive_key"] is None
-        assert len(mock_s3.put_object.call_args_list) == 2
+        assert len(_data_puts(mock_s3)) == 2
 
 
 class TestScraperLambdaEmptyCalendar:
@@ -246,7 +281,7 @@ class TestScraperLambdaEmptyCalendar:
         with (
             patch("guestworld_scraper_handler.boto3.client", return_value=mock_ssm),
             patch(
-                "guestworld_scraper_handler.requests.get", return_value=mock_response
+                "http_fetch.get", return_value=mock_response
             ),
             pytest.raises(ValueError, match="No calendar data found"),
         ):
@@ -269,7 +304,7 @@ class TestScraperLambdaHTTPError:
         with (
             patch("guestworld_scraper_handler.boto3.client", return_value=mock_ssm),
             patch(
-                "guestworld_scraper_handler.requests.get", return_value=mock_response
+                "http_fetch.get", return_value=mock_response
             ),
             pytest.raises(HTTPError),
         ):
@@ -319,7 +354,7 @@ class TestScraperLambdaDecemberArchive:
                 "guestworld_scraper_handler.boto3.client", side_effect=mock_boto3_client
             ),
             patch(
-                "guestworld_scraper_handler.requests.get", side_effect=mock_requests_get
+                "http_fetch.get", side_effect=mock_requests_get
             ),
             patch("guestworld_scraper_handler.datetime") as mock_dt,
         ):
@@ -330,3 +365,499 @@ class TestScraperLambdaDecemberArchive:
 
         assert result["archive_key"] == "GuestWorlds202512.csv"
         assert result["next_month_available"] is False
+
+
+class TestScraperLambdaConcurrentFetch:
+    def test_current_and_next_month_fetched_concurrently(self):
+        """Both calendar requests are in flight at the same time."""
+        html = _build_calendar_html([(1, ["Yorkshire", "London"])])
+        both_in_flight = threading.Barrier(2, timeout=5)
+
+        mock_ssm = MagicMock()
+        mock_ssm.get_parameter.return_value = {
+            "Parameter": {"Value": "https://example.com/schedule"}
+        }
+        mock_s3 = MagicMock()
+
+        def mock_requests_get(url, **kwargs):
+            # Serial fetching would leave one party waiting until timeout.
+            both_in_flight.wait()
+            resp = MagicMock()
+            resp.content = html.encode("utf-8")
+            return resp
+
+        with (
+            patch(
+                "guestworld_scraper_handler.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ),
+            patch(
+                "http_fetch.get", side_effect=mock_requests_get
+            ),
+            patch("guestworld_scraper_handler.datetime") as mock_dt,
+        ):
+            mock_dt.utcnow.return_value = datetime(2026, 1, 15)
+            result = lambda_handler({}, None)
+
+        assert result["next_month_available"] is True
+        assert len(_data_puts(mock_s3)) == 3
+
+    def test_fetch_state_loads_while_ssm_answers(self):
+        """The stored validators are read during the SSM lookup, not after."""
+        html = _build_calendar_html([(1, ["Yorkshire", "London"])])
+        both_in_flight = threading.Barrier(2, timeout=5)
+
+        mock_ssm = MagicMock()
+
+        def get_parameters_by_path(**kwargs):
+            both_in_flight.wait()
+            return {
+                "Parameters": [
+                    {
+                        "Name": "/guestworld/scraper-url",
+                        "Value": "https://example.com/schedule",
+                    }
+                ]
+            }
+
+        mock_ssm.get_parameters_by_path.side_effect = get_parameters_by_path
+        mock_s3 = MagicMock()
+
+        def get_object(Bucket, Key):
+            if Key == "scraper-state/guestworld.json":
+                both_in_flight.wait()
+            raise Exception("NoSuchKey")
+
+        mock_s3.get_object.side_effect = get_object
+
+        def mock_requests_get(url, **kwargs):
+            resp = MagicMock()
+            resp.content = html.encode("utf-8")
+            return resp
+
+        with (
+            patch(
+                "guestworld_scraper_handler.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ),
+            patch("http_fetch.get", side_effect=mock_requests_get),
+            patch("guestworld_scraper_handler.datetime") as mock_dt,
+        ):
+            mock_dt.utcnow.return_value = datetime(2026, 1, 15)
+            result = lambda_handler({}, None)
+
+        assert result["unchanged"] is False
+        mock_ssm.get_parameter.assert_not_called()
+
+
+class TestScraperLambdaUnchanged:
+    def _run(self, mock_s3, html, event=None):
+        mock_ssm = MagicMock()
+        mock_ssm.get_parameter.return_value = {
+            "Parameter": {"Value": "https://example.com/schedule"}
+        }
+
+        def mock_requests_get(url, **kwargs):
+            resp = MagicMock()
+            resp.status_code = 200
+            resp.headers = {}
+            resp.content = html.encode("utf-8")
+            return resp
+
+        with (
+            patch(
+                "guestworld_scraper_handler.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ),
+            patch("http_fetch.get", side_effect=mock_requests_get),
+            patch("guestworld_scraper_handler.datetime") as mock_dt,
+        ):
+            mock_dt.utcnow.return_value = datetime(2026, 1, 15)
+            return lambda_handler(event or {}, None)
+
+    def _stateful_s3(self):
+        objects = {}
+        mock_s3 = MagicMock()
+
+        def put_object(Bucket, Key, Body, **kwargs):
+            objects[Key] = Body
+
+        def get_object(Bucket, Key):
+            if Key not in objects:
+                raise Exception("NoSuchKey")
+            body = MagicMock()
+            body.read.return_value = objects[Key].encode("utf-8")
+            return {"Body": body}
+
+        mock_s3.put_object.side_effect = put_object
+        mock_s3.get_object.side_effect = get_object
+        return mock_s3
+
+    def test_second_run_with_same_pages_skips_writes(self):
+        html = _build_calendar_html([(1, ["Yorkshire", "London"])])
+        mock_s3 = self._stateful_s3()
+
+        first = self._run(mock_s3, html)
+        assert first["unchanged"] is False
+        assert len(_data_puts(mock_s3)) == 3
+
+        mock_s3.put_object.reset_mock()
+        second = self._run(mock_s3, html)
+        assert second["unchanged"] is True
+        assert second["days_scraped"] == 1
+        assert second["next_month_available"] is True
+        assert mock_s3.put_object.call_count == 0
+
+    def test_force_rewrites_unchanged_pages(self):
+        html = _build_calendar_html([(1, ["Yorkshire", "London"])])
+        mock_s3 = self._stateful_s3()
+        self._run(mock_s3, html)
+
+        mock_s3.put_object.reset_mock()
+        result = self._run(mock_s3, html, event={"force": True})
+        assert result["unchanged"] is False
+        assert len(_data_puts(mock_s3)) == 3
+
+
+class TestScraperLambdaChangeLog:
+    def _run(self, mock_s3, html):
+        return TestScraperLambdaUnchanged()._run(mock_s3, html, event={"force": True})
+
+    def _change_log(self, mock_s3):
+        puts = [
+            c
+            for c in mock_s3.put_object.call_args_list
+            if c.kwargs["Key"] == "GuestWorldsChanges.json"
+        ]
+        assert len(puts) <= 1
+        return json.loads(puts[0].kwargs["Body"]) if puts else None
+
+    def test_first_run_reports_new_months(self):
+        html = _build_calendar_html([(1, ["Yorkshire", "London"])])
+        mock_s3 = TestScraperLambdaUnchanged()._stateful_s3()
+
+        result = self._run(mock_s3, html)
+
+        assert sorted(result["changes"]) == ["2026-01", "2026-02"]
+        assert result["changes"]["2026-01"]["new_month"] is True
+        assert result["change_log_key"] == "GuestWorldsChanges.json"
+        log = self._change_log(mock_s3)
+        assert log["generated_at"] == "2026-01-15T00:00:00Z"
+        assert log["months"] == result["changes"]
+
+    def test_changed_rotation_is_reported_per_day(self):
+        mock_s3 = TestScraperLambdaUnchanged()._stateful_s3()
+        self._run(mock_s3, _build_calendar_html([(1, ["Yorkshire", "London"])]))
+
+        mock_s3.put_object.reset_mock()
+        result = self._run(mock_s3, _build_calendar_html([(1, ["Paris", "London"])]))
+
+        assert result["changes"]["2026-01"]["changed_days"] == [
+            {"day": 1, "before": "Yorkshire and London", "after": "Paris and London"}
+        ]
+        assert result["changes"]["2026-01"]["new_month"] is False
+        # The change log is published after the calendars it describes.
+        keys = [c.kwargs["Key"] for c in mock_s3.put_object.call_args_list]
+        assert keys.index("GuestWorldsChanges.json") > keys.index("GuestWorlds.csv")
+
+    def test_guard_refused_months_are_not_reported(self):
+        objects = {}
+        mock_s3 = TestScraperLambdaUnchanged()._stateful_s3()
+        put_object = mock_s3.put_object.side_effect
+
+        def put_with_metadata(Bucket, Key, Body, **kwargs):
+            objects[Key] = kwargs.get("Metadata")
+            put_object(Bucket=Bucket, Key=Key, Body=Body, **kwargs)
+
+        def head_object(Bucket, Key):
+            if Key not in objects:
+                raise Exception("NoSuchKey")
+            return {"Metadata": objects[Key]}
+
+        mock_s3.put_object.side_effect = put_with_metadata
+        mock_s3.head_object.side_effect = head_object
+        full = [(1, ["Watopia"]), (2, ["London"]), (3, ["Paris"])]
+        self._run(mock_s3, _build_calendar_html(full))
+
+        mock_s3.put_object.reset_mock()
+        # A truncated scrape: every guard refuses fewer days for the month.
+        result = self._run(mock_s3, _build_calendar_html(full[:1]))
+
+        assert result["wrote_keys"] == []
+        assert result["changes"] == {}
+        assert result["change_log_key"] is None
+        assert self._change_log(mock_s3) is None
+
+    def test_no_change_log_when_nothing_changed(self):
+        html = _build_calendar_html([(1, ["Yorkshire", "London"])])
+        mock_s3 = TestScraperLambdaUnchanged()._stateful_s3()
+        self._run(mock_s3, html)
+
+        mock_s3.put_object.reset_mock()
+        result = self._run(mock_s3, html)
+
+        assert result["changes"] == {}
+        assert result["change_log_key"] is None
+        assert self._change_log(mock_s3) is None
+
+
+class TestScraperLambdaPublishFailure:
+    def test_failed_archive_write_keeps_pointer_and_state(self):
+        """A failed archive put leaves GuestWorlds.csv and the fetch state alone."""
+        html = _build_calendar_html([(1, ["Yorkshire", "London"])])
+        mock_ssm = MagicMock()
+        mock_ssm.get_parameter.return_value = {
+            "Parameter": {"Value": "https://example.com/schedule"}
+        }
+        mock_s3 = MagicMock()
+        mock_s3.get_object.side_effect = Exception("NoSuchKey")
+        mock_s3.head_object.side_effect = Exception("NoSuchKey")
+
+        def mock_put_object(**kwargs):
+            if kwargs["Key"] == "GuestWorlds202601.csv":
+                raise IOError("S3 unavailable")
+
+        mock_s3.put_object.side_effect = mock_put_object
+        mock_response = MagicMock()
+        mock_response.content = html.encode("utf-8")
+
+        with (
+            patch(
+                "guestworld_scraper_handler.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ),
+            patch("http_fetch.get", return_value=mock_response),
+            patch("guestworld_scraper_handler.datetime") as mock_dt,
+            pytest.raises(RuntimeError, match="GuestWorlds202601.csv"),
+        ):
+            mock_dt.utcnow.return_value = datetime(2026, 1, 15)
+            lambda_handler({}, None)
+
+        keys = [c.kwargs["Key"] for c in mock_s3.put_object.call_args_list]
+        assert "GuestWorlds.csv" not in keys
+        assert not any(k.startswith("scraper-state/") for k in keys)
+
+
+class TestSafeWriteCalendarCsv:
+    CSV = "Yorkshire and London,1\nParis and France,2\n"
+
+    def _s3_with(self, metadata):
+        mock_s3 = MagicMock()
+        if metadata is None:
+            mock_s3.head_object.side_effect = Exception("404")
+        else:
+            mock_s3.head_object.return_value = {"Metadata": metadata}
+        return mock_s3
+
+    def test_writes_when_object_is_missing(self):
+        mock_s3 = self._s3_with(None)
+        assert _safe_write_calendar_csv(mock_s3, "GuestWorlds.csv", self.CSV, 2, "202601")
+        assert mock_s3.put_object.call_args.kwargs["Metadata"] == _metadata(
+            self.CSV, 2, "202601"
+        )
+
+    def test_identical_content_is_skipped(self):
+        mock_s3 = self._s3_with(_metadata(self.CSV, 2, "202601"))
+        assert not _safe_write_calendar_csv(
+            mock_s3, "GuestWorlds.csv", self.CSV, 2, "202601"
+        )
+        mock_s3.put_object.assert_not_called()
+
+    def test_fewer_days_in_same_month_is_refused(self):
+        mock_s3 = self._s3_with({"sha256": "old", "days": "31", "month": "202601"})
+        assert not _safe_write_calendar_csv(
+            mock_s3, "GuestWorlds.csv", self.CSV, 2, "202601"
+        )
+        mock_s3.put_object.assert_not_called()
+
+    def test_new_month_with_fewer_days_is_written(self):
+        """February replacing January in GuestWorlds.csv is not a regression."""
+        mock_s3 = self._s3_with({"sha256": "old", "days": "31", "month": "202601"})
+        assert _safe_write_calendar_csv(mock_s3, "GuestWorlds.csv", self.CSV, 2, "202602")
+
+    def test_objects_without_metadata_are_overwritten(self):
+        mock_s3 = self._s3_with({})
+        assert _safe_write_calendar_csv(mock_s3, "GuestWorlds.csv", self.CSV, 2, "202601")
+
+
+class TestScraperLambdaBackfill:
+    BASE = "https://example.com/schedule"
+
+    def _run(self, event, responder):
+        mock_ssm = MagicMock()
+        mock_ssm.get_parameter.return_value = {"Parameter": {"Value": self.BASE}}
+        mock_s3 = MagicMock()
+        mock_s3.head_object.side_effect = Exception("NoSuchKey")
+        sleeps = []
+
+        with (
+            patch(
+                "guestworld_scraper_handler.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ),
+            patch("http_fetch.get", side_effect=responder),
+            patch("guestworld_scraper_handler.time.sleep", side_effect=sleeps.append),
+        ):
+            result = lambda_handler(event, None)
+        return result, mock_s3, sleeps
+
+    def test_archives_every_month_in_range(self):
+        fetched = []
+
+        def responder(url, **kwargs):
+            fetched.append(url)
+            resp = MagicMock()
+            if "month=feb" in url:
+                resp.content = b"<html><body>No calendar</body></html>"
+            else:
+                resp.content = _build_calendar_html(
+                    [(1, ["Watopia"]), (2, ["London"])]
+                ).encode("utf-8")
+            return resp
+
+        result, mock_s3, sleeps = self._run(
+            {"backfill": {"from": "2024-11", "to": "2025-02"}}, responder
+        )
+
+        assert result["backfill"] is True
+        assert [(o["month"], o["status"]) for o in result["months"]] == [
+            ("2024-11", "written"),
+            ("2024-12", "written"),
+            ("2025-01", "written"),
+            ("2025-02", "empty"),
+        ]
+        assert sorted(fetched) == sorted(
+            [
+                self.BASE + "?month=nov&yr=2024",
+                self.BASE + "?month=dec&yr=2024",
+                self.BASE + "?month=jan&yr=2025",
+                self.BASE + "?month=feb&yr=2025",
+            ]
+        )
+        keys = [c.kwargs["Key"] for c in _data_puts(mock_s3)]
+        assert sorted(keys) == [
+            "GuestWorlds202411.csv",
+            "GuestWorlds202412.csv",
+            "GuestWorlds202501.csv",
+        ]
+        assert "GuestWorlds.csv" not in keys
+        # Request starts are spaced by the politeness delay.
+        assert sum(sleeps) >= 3 * 1.0 - 0.1
+
+    def test_failed_month_is_reported_without_stopping_others(self):
+        def responder(url, **kwargs):
+            if "month=jan" in url:
+                raise ConnectionError("refused")
+            resp = MagicMock()
+            resp.content = _build_calendar_html([(1, ["Watopia"])]).encode("utf-8")
+            return resp
+
+        result, _, _ = self._run(
+            {"backfill": {"from": "2024-12", "to": "2025-01"}}, responder
+        )
+
+        assert result["failed_months"] == ["2025-01"]
+        assert result["wrote_keys"] == ["GuestWorlds202412.csv"]
+        assert result["months"][1]["error"] == "ConnectionError: refused"
+
+    def test_concurrency_is_capped(self):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def responder(url, **kwargs):
+            with lock:
+                in_flight.append(url)
+                peak.append(len(in_flight))
+            # time.sleep is patched for the run, so block on an Event instead.
+            threading.Event().wait(0.02)
+            with lock:
+                in_flight.remove(url)
+            resp = MagicMock()
+            resp.content = _build_calendar_html([(1, ["Watopia"])]).encode("utf-8")
+            return resp
+
+        result, _, _ = self._run(
+            {"backfill": {"from": "2024-01", "to": "2024-12", "max_workers": 50}},
+            responder,
+        )
+
+        assert len(result["months"]) == 12
+        assert max(peak) <= 4
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"from": "2025-13"},
+            {"from": "2025-06", "to": "2025-01"},
+            {"from": "2020-01", "to": "2025-01"},
+        ],
+    )
+    def test_invalid_ranges_are_rejected(self, options):
+        with pytest.raises(ValueError):
+            self._run({"backfill": options}, lambda url, **kw: None)
+
+
+class TestScraperLambdaTimings:
+    def test_phases_are_returned_and_emitted(self, capsys):
+        html = _build_calendar_html([(1, ["Yorkshire", "London"])])
+        mock_ssm = MagicMock()
+        mock_ssm.get_parameter.return_value = {
+            "Parameter": {"Value": "https://example.com/schedule"}
+        }
+        mock_s3 = MagicMock()
+        mock_s3.get_object.side_effect = Exception("NoSuchKey")
+        mock_s3.head_object.side_effect = Exception("NoSuchKey")
+        mock_response = MagicMock()
+        mock_response.content = html.encode("utf-8")
+
+        with (
+            patch(
+                "guestworld_scraper_handler.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ),
+            patch("http_fetch.get", return_value=mock_response),
+            patch("guestworld_scraper_handler.datetime") as mock_dt,
+        ):
+            mock_dt.utcnow.return_value = datetime(2026, 1, 15)
+            result = lambda_handler({}, None)
+
+        assert set(result["timings"]) == {
+            "total",
+            "ssm",
+            "state_load",
+            "fetch.current",
+            "fetch.next",
+            "parse.current",
+            "parse.next",
+            "diff",
+            "s3_publish",
+            "manifest",
+            "state_save",
+        }
+        emf = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert len(emf) == 1
+        assert emf[0]["Pipeline"] == "guestworld"
+        assert emf[0]["Status"] == "ok"
+        assert emf[0]["total"] == result["timings"]["total"]
+
+    def test_failed_run_still_emits_timings(self, capsys):
+        mock_ssm = MagicMock()
+        mock_ssm.get_parameter.return_value = {
+            "Parameter": {"Value": "https://example.com/schedule"}
+        }
+        mock_s3 = MagicMock()
+        mock_s3.get_object.side_effect = Exception("NoSuchKey")
+        with (
+            patch(
+                "guestworld_scraper_handler.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ),
+            patch("http_fetch.get", side_effect=ConnectionError("refused")),
+            pytest.raises(ConnectionError),
+        ):
+            lambda_handler({}, None)
+
+        emf = json.loads(capsys.readouterr().out.splitlines()[-1])
+        assert emf["Status"] == "error"
+        assert "fetch.current" in emf
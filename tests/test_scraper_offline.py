@@ -0,0 +1,159 @@
+"""Offline end-to-end tests: scraper pipelines against the local fixture server."""
+
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+# Add scrapers to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
+
+import challenge_scraper_handler
+import dataset_manifest
+import guestworld_scraper_handler
+import http_fetch
+from tests.fixture_server import FixtureServer, load_recorded_pages
+
+
+class FakeS3:
+    """In-memory bucket supporting the calls the scrapers make."""
+
+    def __init__(self):
+        self.objects = {}
+        self.puts = []
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise Exception("NoSuchKey")
+        obj = self.objects[Key]
+        return {"Body": io.BytesIO(obj["Body"]), "ETag": obj["ETag"]}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise Exception("NoSuchKey")
+        obj = self.objects[Key]
+        return {"Metadata": obj.get("Metadata", {}), "ETag": obj["ETag"]}
+
+    def put_object(self, Bucket, Key, Body, IfMatch=None, IfNoneMatch=None, **kwargs):
+        current = self.objects.get(Key)
+        if (IfMatch and (current or {}).get("ETag") != IfMatch) or (
+            IfNoneMatch == "*" and current is not None
+        ):
+            raise ClientError(
+                {"Error": {"Code": "PreconditionFailed", "Message": Key}}, "PutObject"
+            )
+        if isinstance(Body, str):
+            Body = Body.encode("utf-8")
+        etag = '"%s"' % hashlib.md5(Body).hexdigest()
+        self.objects[Key] = dict(kwargs, Body=Body, ETag=etag)
+        self.puts.append(Key)
+        return {"ETag": etag}
+
+    def manifest(self):
+        return json.loads(self.objects[dataset_manifest.MANIFEST_KEY]["Body"])
+
+
+@pytest.fixture
+def server():
+    with (
+        FixtureServer() as server,
+        patch.object(http_fetch, "RETRY_BACKOFF_FACTOR", 0),
+        patch.dict(
+            os.environ,
+            {
+                "GUESTWORLD_SCRAPER_URL": server.url + "/schedule",
+                "GUESTWORLD_CHALLENGES_URL": server.url + "/challenges",
+            },
+        ),
+    ):
+        load_recorded_pages(server)
+        http_fetch.reset_session()
+        yield server
+        http_fetch.reset_session()
+
+
+class TestGuestWorldOffline:
+    def test_scrapes_then_revalidates_with_etags(self, server):
+        s3, ssm = FakeS3(), MagicMock()
+
+        first = guestworld_scraper_handler.scrape({}, s3, ssm)
+        assert first["days_scraped"] == 27
+        assert "GuestWorlds.csv" in first["wrote_keys"]
+        assert ssm.method_calls == []  # URL came from the environment
+
+        second = guestworld_scraper_handler.scrape({}, s3, ssm)
+        assert second["unchanged"] is True
+        assert second["days_scraped"] == 27
+        conditional = [h for _, _, h in server.requests[-2:]]
+        assert all("If-None-Match" in h for h in conditional)
+
+    def test_manifest_describes_published_objects(self, server):
+        s3 = FakeS3()
+        guestworld_scraper_handler.scrape({}, s3, MagicMock())
+        challenge_scraper_handler.scrape({}, s3, MagicMock())
+
+        objects = s3.manifest()["objects"]
+        assert "GuestWorlds.csv" in objects
+        assert "WeeklyChallenges.json" in objects
+        for key, entry in objects.items():
+            assert entry["etag"] == s3.objects[key]["ETag"]
+            body = s3.objects[key]["Body"]
+            assert entry["sha256"] == hashlib.sha256(body).hexdigest()
+
+    def test_transient_errors_are_retried(self, server):
+        server.configure("/schedule", fail_first=2)
+        result = guestworld_scraper_handler.scrape({}, FakeS3(), MagicMock())
+        assert result["days_scraped"] == 27
+        assert server.hits("/schedule") >= 3
+
+    def test_slow_drip_response_is_read_in_full(self, server):
+        server.configure("/schedule", drip_bytes=8192, drip_interval=0.01)
+        result = guestworld_scraper_handler.scrape({}, FakeS3(), MagicMock())
+        assert result["days_scraped"] == 27
+
+    def test_backfill_runs_against_month_variants(self, server):
+        with patch.object(guestworld_scraper_handler, "_BACKFILL_DELAY_SECONDS", 0):
+            result = guestworld_scraper_handler.scrape(
+                {"backfill": {"from": "2025-01", "to": "2025-03"}},
+                FakeS3(),
+                MagicMock(),
+            )
+        assert [o["status"] for o in result["months"]] == ["written"] * 3
+        queries = sorted(q for path, q, _ in server.requests if path == "/schedule")
+        assert queries == [
+            "month=feb&yr=2025",
+            "month=jan&yr=2025",
+            "month=mar&yr=2025",
+        ]
+
+
+class TestChallengesOffline:
+    def test_detail_pages_are_fetched_concurrently(self, server):
+        server.configure("/route/", latency=0.2)
+        server.configure("/portal/", latency=0.2)
+
+        started = time.monotonic()
+        result = challenge_scraper_handler.scrape({}, FakeS3(), MagicMock())
+        elapsed = time.monotonic() - started
+
+        assert result["detail_fetch"]["fetched"] == 8
+        assert server.peak_in_flight > 1
+        assert elapsed < 8 * 0.2
+
+    def test_slow_detail_pages_hit_the_deadline(self, server):
+        server.configure("/route/", latency=1.0)
+        server.configure("/portal/", latency=1.0)
+        started = time.monotonic()
+        with patch.object(challenge_scraper_handler, "_DETAIL_DEADLINE_SECONDS", 0.3):
+            result = challenge_scraper_handler.scrape({}, FakeS3(), MagicMock())
+
+        assert time.monotonic() - started < 1.0
+        assert result["detail_fetch"]["timed_out"] == 8
+        # Calendar data is still published without the details.
+        assert "WeeklyChallenges.json" in result["wrote_keys"]
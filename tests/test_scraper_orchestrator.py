@@ -0,0 +1,121 @@
+"""Tests for scrapers/scraper_orchestrator.py."""
+
+import os
+import sys
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+# Add scrapers to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
+
+import scraper_orchestrator
+from scraper_orchestrator import lambda_handler
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+class TestOrchestrator:
+    def test_pipelines_run_concurrently_on_shared_clients(self):
+        both_running = threading.Barrier(2, timeout=5)
+        seen = []
+
+        def pipeline(event, s3, ssm):
+            seen.append((s3, ssm))
+            both_running.wait()
+            return {"statusCode": 200}
+
+        mock_s3, mock_ssm = MagicMock(), MagicMock()
+        with (
+            patch.object(
+                scraper_orchestrator, "PIPELINES", (("a", pipeline), ("b", pipeline))
+            ),
+            patch(
+                "scraper_orchestrator.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ) as client,
+        ):
+            result = lambda_handler({}, None)
+
+        assert result["statusCode"] == 200
+        assert result["failed"] == []
+        assert set(result["pipelines"]) == {"a", "b"}
+        assert seen == [(mock_s3, mock_ssm), (mock_s3, mock_ssm)]
+        assert client.call_count == 2
+
+    def test_failing_pipeline_does_not_stop_the_other(self):
+        def broken(event, s3, ssm):
+            raise ValueError("No calendar data found")
+
+        def healthy(event, s3, ssm):
+            return {"statusCode": 200, "wrote_keys": ["GuestWorlds.csv"]}
+
+        with (
+            patch.object(
+                scraper_orchestrator,
+                "PIPELINES",
+                (("guestworld", healthy), ("challenges", broken)),
+            ),
+            patch("scraper_orchestrator.boto3.client"),
+        ):
+            result = lambda_handler({}, None)
+
+        assert result["statusCode"] == 500
+        assert result["failed"] == ["challenges"]
+        assert result["pipelines"]["guestworld"]["wrote_keys"] == ["GuestWorlds.csv"]
+        assert result["pipelines"]["challenges"]["error"] == (
+            "ValueError: No calendar data found"
+        )
+        assert "elapsed_seconds" in result["pipelines"]["challenges"]
+
+    def test_runs_both_real_pipelines(self):
+        urls = {
+            "/guestworld/scraper-url": "https://example.com/schedule",
+            "/guestworld/challenges-url": "https://example.com/challenges",
+        }
+        mock_ssm = MagicMock()
+        mock_ssm.get_parameters_by_path.return_value = {
+            "Parameters": [{"Name": k, "Value": v} for k, v in urls.items()]
+        }
+        mock_s3 = MagicMock()
+        mock_s3.get_object.side_effect = Exception("NoSuchKey")
+        mock_s3.head_object.side_effect = Exception("NoSuchKey")
+
+        def mock_get(url, **kwargs):
+            resp = MagicMock()
+            resp.status_code = 200
+            resp.headers = {}
+            if url.startswith(urls["/guestworld/scraper-url"]):
+                resp.content = _fixture("guestworld_calendar.html")
+            elif url.startswith(urls["/guestworld/challenges-url"]):
+                resp.content = _fixture("challenge_calendar.html")
+            else:
+                resp.content = _fixture("route_detail.html")
+            return resp
+
+        with (
+            patch(
+                "scraper_orchestrator.boto3.client",
+                side_effect=lambda service, **kw: mock_ssm if service == "ssm" else mock_s3,
+            ),
+            patch("http_fetch.get", side_effect=mock_get),
+            patch("guestworld_scraper_handler.datetime") as gw_dt,
+            patch("challenge_scraper_handler.datetime") as ch_dt,
+        ):
+            gw_dt.utcnow.return_value = datetime(2026, 2, 10)
+            ch_dt.utcnow.return_value = datetime(2026, 2, 10)
+            result = lambda_handler({}, None)
+
+        assert result["statusCode"] == 200, result
+        assert result["pipelines"]["guestworld"]["days_scraped"] == 27
+        assert result["pipelines"]["challenges"]["months"] == ["2026-02", "2026-03"]
+        # Both pipelines were served by one batched parameter load.
+        mock_ssm.get_parameters_by_path.assert_called_once()
+        mock_ssm.get_parameter.assert_not_called()
+        written = {c.kwargs["Key"] for c in mock_s3.put_object.call_args_list}
+        assert {"GuestWorlds.csv", "WeeklyChallenges.json"} <= written
@@ -0,0 +1,93 @@
+"""Tests for scrapers/ssm_params.py."""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+# Add scrapers to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scrapers"))
+
+import ssm_params
+
+
+def _ssm(pages):
+    ssm = MagicMock()
+    ssm.get_parameters_by_path.side_effect = pages
+    ssm.get_parameter.side_effect = lambda Name: {
+        "Parameter": {"Value": "single:%s" % Name}
+    }
+    return ssm
+
+
+PAGES = [
+    {
+        "Parameters": [
+            {"Name": "/guestworld/scraper-url", "Value": "https://a"},
+        ],
+        "NextToken": "t1",
+    },
+    {"Parameters": [{"Name": "/guestworld/challenges-url", "Value": "https://b"}]},
+]
+
+
+class TestGetParameter:
+    def test_batch_load_serves_all_parameters(self):
+        ssm = _ssm(list(PAGES))
+        assert ssm_params.get_parameter(ssm, "/guestworld/scraper-url") == "https://a"
+        assert ssm_params.get_parameter(ssm, "/guestworld/challenges-url") == "https://b"
+        assert ssm.get_parameters_by_path.call_count == 2
+        assert ssm.get_parameters_by_path.call_args.kwargs["NextToken"] == "t1"
+        ssm.get_parameter.assert_not_called()
+
+    def test_warm_calls_use_cache_until_ttl(self):
+        ssm = _ssm([PAGES[1], PAGES[1]])
+        with patch("ssm_params.time.monotonic", return_value=1000):
+            ssm_params.get_parameter(ssm, "/guestworld/challenges-url")
+            ssm_params.get_parameter(ssm, "/guestworld/challenges-url")
+        assert ssm.get_parameters_by_path.call_count == 1
+
+        expired = 1000 + ssm_params.CACHE_TTL_SECONDS
+        with patch("ssm_params.time.monotonic", return_value=expired):
+            ssm_params.get_parameter(ssm, "/guestworld/challenges-url")
+        assert ssm.get_parameters_by_path.call_count == 2
+
+    def test_missing_from_batch_falls_back_to_get_parameter(self):
+        ssm = _ssm([PAGES[1]])
+        value = ssm_params.get_parameter(ssm, "/guestworld/other")
+        assert value == "single:/guestworld/other"
+        ssm_params.get_parameter(ssm, "/guestworld/other")
+        assert ssm.get_parameter.call_count == 1
+
+    def test_batch_failure_falls_back_to_get_parameter(self):
+        error = ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "no"}},
+            "GetParametersByPath",
+        )
+        ssm = _ssm(error)
+        value = ssm_params.get_parameter(ssm, "/guestworld/scraper-url")
+        assert value == "single:/guestworld/scraper-url"
+
+    def test_get_parameter_errors_propagate(self):
+        ssm = MagicMock()
+        ssm.get_parameter.side_effect = ClientError(
+            {"Error": {"Code": "ParameterNotFound", "Message": "not found"}},
+            "GetParameter",
+        )
+        with pytest.raises(ClientError):
+            ssm_params.get_parameter(ssm, "/guestworld/scraper-url")
+
+    def test_environment_override_skips_ssm(self):
+        ssm = MagicMock()
+        with patch.dict(os.environ, {"GUESTWORLD_SCRAPER_URL": "http://localhost"}):
+            value = ssm_params.get_parameter(ssm, "/guestworld/scraper-url")
+        assert value == "http://localhost"
+        assert ssm.method_calls == []
+
+    def test_env_var_name(self):
+        assert (
+            ssm_params.env_var_name("/guestworld/challenges-url")
+            == "GUESTWORLD_CHALLENGES_URL"
+        )
@@ -0,0 +1,76 @@
+"""Tests for the synthetic page generator and benchmark harness in benchmarks/."""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add scrapers and benchmarks to path
+_ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+sys.path.insert(0, os.path.join(_ROOT, "scrapers"))
+sys.path.insert(0, os.path.join(_ROOT, "benchmarks"))
+
+import bench_synthetic
+import synthetic_pages
+from challenge_scraper_core import (
+    parse_challenge_calendar_html,
+    parse_route_detail_page,
+)
+from guestworld_scraper_core import parse_calendar_html
+
+KNOBS = [
+    {"chrome_kb": 5, "events_per_day": 1, "nesting": 0},
+    {"chrome_kb": 20, "events_per_day": 7, "nesting": 10},
+]
+
+
+class TestSyntheticPages:
+    @pytest.mark.parametrize("knobs", KNOBS)
+    def test_guestworld_calendar_parses_to_expected(self, knobs):
+        page, expected = synthetic_pages.guestworld_calendar(**knobs)
+        assert len(expected) == 28
+        assert parse_calendar_html(page.encode("utf-8")) == expected
+
+    @pytest.mark.parametrize("knobs", KNOBS)
+    def test_challenge_calendar_parses_to_expected(self, knobs):
+        page, expected = synthetic_pages.challenge_calendar(**knobs)
+        assert parse_challenge_calendar_html(page.encode("utf-8")) == expected
+
+    def test_nesting_past_the_recursion_limit_parses(self):
+        page, expected = synthetic_pages.challenge_calendar(
+            events_per_day=1, nesting=sys.getrecursionlimit() + 200
+        )
+        assert parse_challenge_calendar_html(page.encode("utf-8")) == expected
+
+    def test_route_detail_parses_to_expected(self):
+        page, expected = synthetic_pages.route_detail(chrome_kb=20, seed=3)
+        assert parse_route_detail_page(page.encode("utf-8")) == expected
+
+    def test_chrome_size_follows_knob(self):
+        small, _ = synthetic_pages.guestworld_calendar(chrome_kb=10)
+        large, _ = synthetic_pages.guestworld_calendar(chrome_kb=200)
+        assert len(large) - len(small) > 150 * 1024
+
+    def test_output_is_deterministic_per_seed(self):
+        assert synthetic_pages.challenge_calendar(seed=7) == (
+            synthetic_pages.challenge_calendar(seed=7)
+        )
+        assert synthetic_pages.challenge_calendar(seed=7) != (
+            synthetic_pages.challenge_calendar(seed=8)
+        )
+
+
+class TestBenchSynthetic:
+    def test_json_report_covers_every_parser(self, capsys):
+        argv = ["--profile", "small", "--repeat", "1", "--json"]
+        assert bench_synthetic.main(argv) == 0
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [r["parser"] for r in records] == [
+            "parse_calendar_html",
+            "parse_challenge_calendar_html",
+            "parse_route_detail_page",
+        ]
+        for record in records:
+            assert record["median_ms"] > 0
+            assert record["peak_kb"] > 0